@@ -10,6 +10,7 @@ sys.path.insert(0, backend_path)
 # Backend modüllerini import et
 from app.core.config import settings
 from app.routers.main import router
+from app.routers.responses import CompressionMiddleware
 
 app = FastAPI(
     title="AI Ruleset Generator",
@@ -26,6 +27,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Büyük JSON yanıtlarını gzip/brotli ile sıkıştır (SSE/NDJSON akışları hariç)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Router'ları dahil et
 app.include_router(router)
 
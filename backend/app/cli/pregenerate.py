@@ -0,0 +1,267 @@
+"""
+Popüler yığın kombinasyonlarını önceden üretip sunulabilir ruleset paketine yaz
+
+Kombinasyonlar ya bir kullanım kaydından (ProjectInfo JSONL istek kaydı veya ruleset
+deposu .db; depo birebir cache isabetlerini tutmaz) en sık görülenler
+olarak, ya da /project-types ve /frameworks seçeneklerinin ağırlıklı çapraz çarpımından
+seçilir. Üretim AIService üzerinden sınırlı eşzamanlılıkla yapılır;
+biten her ruleset checkpoint dosyasına eklenir, yarıda kalan çalışma kaldığı yerden devam eder.
+
+Kullanım (backend klasöründen):
+    python -m app.cli.pregenerate --top 200
+    python -m app.cli.pregenerate --from-log rulesets.db --top 500 --concurrency 8
+    python -m app.cli.pregenerate --weights weights.json --dry-run
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+from app.core.config import settings
+from app.models.schemas import ProjectInfo, CacheMode
+from app.services.ai_service import ai_service
+from app.services.http_client import close_http_clients
+from app.services.prompt_service import PROMPT_TEMPLATE_VERSION
+from app.services.ruleset_bundle import bundle_key, write_bundle
+from app.services.ruleset_service import ruleset_service
+from app.services.scheduler import Priority, priority_scope
+
+# Serbest metin alanları birebir eşleşmeyi imkansız kıldığı için kombinasyona dahil edilmez
+FREE_TEXT_FIELDS = ("notes", "additional_requirements")
+
+# Kategori başına çapraz çarpıma giren alanlar ve katalogdaki seçenekleri
+CATALOG_FIELDS: Dict[str, Dict[str, List[str]]] = {
+    "frontend": {
+        "project_type": PROJECT_TYPES,
+        "frontend_framework": FRAMEWORKS["frontend"],
+    },
+    "backend": {
+        "project_type": PROJECT_TYPES,
+        "backend_framework": FRAMEWORKS["backend"],
+        "database_type": FRAMEWORKS["database"],
+    },
+    "fullstack": {
+        "project_type": PROJECT_TYPES,
+        "frontend_framework": FRAMEWORKS["frontend"],
+        "backend_framework": FRAMEWORKS["backend"],
+        "database_type": FRAMEWORKS["database"],
+    },
+}
+
+
+def stack_info(data: Dict[str, Any]) -> ProjectInfo:
+    """ProjectInfo'nun sadece yığın alanları (serbest metin alanları boş)"""
+    info = ProjectInfo(**data)
+    return info.model_copy(update={"notes": None, "additional_requirements": []})
+
+
+def _describe(info: ProjectInfo) -> str:
+    values = [info.project_category, info.project_type]
+    values += [value for value in (info.frontend_framework, info.backend_framework, info.database_type) if value]
+    return " / ".join(values)
+
+
+def _read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Ruleset deposundaki (.db) veya JSONL dosyasındaki ProjectInfo sözlükleri"""
+    if path.endswith(".db"):
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            for (project_info,) in connection.execute("SELECT project_info FROM rulesets"):
+                yield json.loads(project_info)
+        finally:
+            connection.close()
+        return
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                data = json.loads(line)
+                yield data.get("project_info", data)
+
+
+def combinations_from_log(path: str, top: int) -> List[Tuple[ProjectInfo, float]]:
+    """Kullanım kaydında en sık görülen yığın kombinasyonları (ağırlık: görülme sayısı)"""
+    counts: Counter = Counter()
+    infos: Dict[bytes, ProjectInfo] = {}
+    for data in _read_log(path):
+        try:
+            info = stack_info(data)
+        except (ValidationError, TypeError):
+            continue
+        key = bundle_key(info)
+        infos.setdefault(key, info)
+        counts[key] += 1
+    return [(infos[key], float(count)) for key, count in counts.most_common(top)]
+
+
+def _field_weights(options: List[str], overrides: Optional[Dict[str, float]]) -> List[Tuple[str, float]]:
+    """Seçenek ağırlıkları: verilmişse dosyadakiler, yoksa katalog sırasına göre Zipf (1/sıra)"""
+    if overrides is not None:
+        return [(value, float(weight)) for value, weight in overrides.items() if weight > 0]
+    return [(value, 1.0 / rank) for rank, value in enumerate((o for o in options if o != "Other"), start=1)]
+
+
+def combinations_from_catalog(top: int, weights: Optional[Dict[str, Any]] = None) -> List[Tuple[ProjectInfo, float]]:
+    """Katalog seçeneklerinin ağırlıklı çapraz çarpımından en olası kombinasyonlar
+
+    weights: {"project_category": {"backend": 2, ...}, "backend_framework": {...}, ...};
+    bir alan verilmişse sadece listelenen değerler kullanılır.
+    """
+    weights = weights or {}
+    category_weights = weights.get("project_category") or {category: 1.0 for category in CATALOG_FIELDS}
+
+    def candidates() -> Iterator[Tuple[float, Dict[str, Any]]]:
+        for category, category_weight in category_weights.items():
+            fields = CATALOG_FIELDS.get(category)
+            if fields is None or category_weight <= 0:
+                continue
+            names = list(fields)
+            choices = [_field_weights(fields[name], weights.get(name)) for name in names]
+            for combination in itertools.product(*choices):
+                weight = float(category_weight)
+                for _, value_weight in combination:
+                    weight *= value_weight
+                yield weight, {"project_category": category, **{
+                    name: value for name, (value, _) in zip(names, combination)
+                }}
+
+    # Eşit ağırlıklarda katalog sırası korunur (nlargest kararlıdır)
+    best = heapq.nlargest(top, candidates(), key=lambda candidate: candidate[0])
+    return [(stack_info(data), weight) for weight, data in best]
+
+
+class Checkpoint:
+    """Biten üretimlerin JSONL kaydı; her satır yazıldığı anda diske gider"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Kesilen son satır: o kombinasyon yeniden üretilir
+                    continue
+                if record.get("template") == PROMPT_TEMPLATE_VERSION:
+                    self.records[record["key"]] = record
+        return len(self.records)
+
+    def append(self, key: str, info: ProjectInfo, markdown: str, ai_provider: str):
+        record = {
+            "key": key,
+            "template": PROMPT_TEMPLATE_VERSION,
+            "project_info": info.model_dump(),
+            "markdown": markdown,
+            "ai_provider": ai_provider,
+        }
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self.records[key] = record
+
+
+async def pregenerate(
+    combinations: List[Tuple[ProjectInfo, float]],
+    checkpoint: Checkpoint,
+    concurrency: int
+) -> int:
+    """Checkpoint'te olmayan kombinasyonları üret; başarısız olanların sayısı"""
+    pending = [(info, bundle_key(info).hex()) for info, _ in combinations]
+    pending = [(info, key) for info, key in pending if key not in checkpoint.records]
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+    done = 0
+
+    async def generate_one(info: ProjectInfo, key: str):
+        nonlocal failures, done
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                with priority_scope(Priority.BACKGROUND):
+                    result = await ruleset_service.generate(info, cache_mode=CacheMode.BYPASS)
+            except Exception as e:
+                failures += 1
+                status = f"HATA {e}"
+            else:
+                checkpoint.append(key, info, result.markdown, result.ai_provider)
+                status = "ok"
+            done += 1
+            print(f"[{done}/{len(pending)}] {status} {_describe(info)} ({time.perf_counter() - started:.1f}s)")
+
+    await asyncio.gather(*(generate_one(info, key) for info, key in pending))
+    return failures
+
+
+async def main(args: argparse.Namespace) -> int:
+    if args.from_log:
+        combinations = combinations_from_log(args.from_log, args.top)
+        source = f"log:{os.path.basename(args.from_log)}"
+    else:
+        weights = None
+        if args.weights:
+            with open(args.weights, encoding="utf-8") as file:
+                weights = json.load(file)
+        combinations = combinations_from_catalog(args.top, weights)
+        source = "catalog"
+
+    if args.dry_run:
+        for info, weight in combinations:
+            print(f"{weight:>12.4f}  {_describe(info)}")
+        print(f"\n{len(combinations)} kombinasyon ({source})")
+        return 0
+
+    if args.rpm is not None:
+        # Tek hız limiti upstream zamanlayıcıda: provider ilk kullanımda bu bütçeyle oluşur
+        settings.PROVIDER_RPM = args.rpm
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint.jsonl")
+    resumed = checkpoint.load()
+    print(
+        f"{len(combinations)} kombinasyon ({source}), checkpoint'te {resumed} kayıt; "
+        f"provider {ai_service.provider_name}/{ai_service.model_name}, eşzamanlılık {args.concurrency}"
+    )
+    try:
+        failures = await pregenerate(combinations, checkpoint, args.concurrency)
+    finally:
+        await close_http_clients()
+
+    records = []
+    for info, _ in combinations:
+        record = checkpoint.records.get(bundle_key(info).hex())
+        if record is not None:
+            records.append((info, record["markdown"], record["ai_provider"]))
+    count = write_bundle(args.output, records, {
+        "source": source,
+        "ai_provider": ai_service.provider_name,
+        "model": ai_service.model_name,
+    })
+    print(f"\n{args.output}: {count} ruleset, {os.path.getsize(args.output) / 1024:.1f} KiB")
+    if failures:
+        print(f"{failures} kombinasyon üretilemedi; komutu tekrar çalıştırmak sadece eksikleri üretir")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Popüler yığın kombinasyonları için ruleset paketi üret")
+    parser.add_argument("--top", type=int, default=200, help="üretilecek kombinasyon sayısı")
+    parser.add_argument("--from-log", help="kullanım kaydı: ruleset deposu (.db) veya ProjectInfo JSONL")
+    parser.add_argument("--weights", help="çapraz çarpım için alan/değer ağırlıkları (JSON)")
+    parser.add_argument("--output", default=settings.RULESET_BUNDLE_PATH or "rulesets.bundle")
+    parser.add_argument("--checkpoint", help="varsayılan: <output>.checkpoint.jsonl")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_DEFAULT_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, help="bu çalışma için PROVIDER_RPM (varsayılan: ayardaki değer)")
+    parser.add_argument("--dry-run", action="store_true", help="sadece seçilen kombinasyonları listele")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,41 @@
+"""
+Arayüzde sunulan proje türü ve framework seçenekleri
+"""
+
+PROJECT_TYPES = [
+    "Web Application",
+    "Mobile Application", 
+    "Desktop Application",
+    "API/Microservice",
+    "Library/Package",
+    "CLI Tool",
+    "E-commerce Platform",
+    "Content Management System",
+    "Dashboard/Admin Panel",
+    "Real-time Application",
+    "Machine Learning Project",
+    "Blockchain Application",
+    "IoT Application",
+    "Game Development",
+    "Other"
+]
+
+FRAMEWORKS = {
+    "frontend": [
+        "React", "Vue.js", "Angular", "Svelte", "Next.js", "Nuxt.js", 
+        "Vanilla JavaScript", "jQuery", "Alpine.js", "Lit", "Other"
+    ],
+    "backend": [
+        "Node.js/Express", "Node.js/Fastify", "Python/Django", "Python/FastAPI", 
+        "Python/Flask", "Java/Spring", "C#/.NET", "PHP/Laravel", "PHP/Symfony", 
+        "Ruby on Rails", "Go/Gin", "Go/Echo", "Rust/Actix", "Other"
+    ],
+    "mobile": [
+        "React Native", "Flutter", "Swift/iOS", "Kotlin/Android", 
+        "Xamarin", "Ionic", "Cordova/PhoneGap", "Other"
+    ],
+    "database": [
+        "PostgreSQL", "MySQL", "MongoDB", "SQLite", "Redis", 
+        "Cassandra", "DynamoDB", "Firebase", "Supabase", "Other"
+    ]
+}
@@ -2,6 +2,7 @@
 Uygulama yapılandırma ayarları
 """
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
@@ -27,8 +28,88 @@ class Settings:
         "http://localhost:8001"
     ]
     
+    # Yanıt Sıkıştırma ve HTTP Cache Ayarları
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bayt
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "5"))
+    STATIC_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("STATIC_CACHE_MAX_AGE_SECONDS", "3600"))
+    
     # AI Provider Ayarları
     AI_PROVIDER: str = os.getenv("AI_PROVIDER", "gemini")
+    # Virgülle ayrılmış liste verilirse (ör. "gemini,openai") provider havuzu kullanılır
+    AI_PROVIDERS: str = os.getenv("AI_PROVIDERS", "")
+    PROVIDER_HEDGING_ENABLED: bool = os.getenv("PROVIDER_HEDGING_ENABLED", "false").lower() == "true"
+    PROVIDER_HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("PROVIDER_HEDGE_MIN_DELAY_SECONDS", "5"))
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_COOLDOWN_SECONDS", "30"))
+    # Provider oluşturma başarısız olursa bu süre boyunca tekrar denenmez
+    PROVIDER_INIT_RETRY_SECONDS: float = float(os.getenv("PROVIDER_INIT_RETRY_SECONDS", "30"))
+    PROVIDER_THREADPOOL_SIZE: int = int(os.getenv("PROVIDER_THREADPOOL_SIZE", "8"))
+    PROVIDER_TIMEOUT_SECONDS: float = float(os.getenv("PROVIDER_TIMEOUT_SECONDS", "120"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    # "monolithic": tek completion, "sectioned": bölümler ayrı ve eşzamanlı üretilir
+    GENERATION_MODE: str = os.getenv("GENERATION_MODE", "monolithic")
+    SECTION_CONCURRENCY: int = int(os.getenv("SECTION_CONCURRENCY", "6"))
+    COALESCE_REQUESTS: bool = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+    
+    # Kabul Kontrolü Ayarları (/generate-ruleset uçları)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_INITIAL_LIMIT: int = int(os.getenv("ADMISSION_INITIAL_LIMIT", "32"))
+    ADMISSION_MIN_LIMIT: int = int(os.getenv("ADMISSION_MIN_LIMIT", "4"))
+    ADMISSION_MAX_LIMIT: int = int(os.getenv("ADMISSION_MAX_LIMIT", "256"))
+    ADMISSION_ADAPTIVE: bool = os.getenv("ADMISSION_ADAPTIVE", "true").lower() == "true"
+    ADMISSION_LATENCY_TOLERANCE: float = float(os.getenv("ADMISSION_LATENCY_TOLERANCE", "2.0"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+    ADMISSION_CLIENT_SHARE: float = float(os.getenv("ADMISSION_CLIENT_SHARE", "0.5"))
+    ADMISSION_CLIENT_HEADER: str = os.getenv("ADMISSION_CLIENT_HEADER", "X-API-Key")
+    
+    # Upstream Zamanlayıcı Ayarları (provider başına; 0: limitsiz)
+    PROVIDER_RPM: int = int(os.getenv("PROVIDER_RPM", "0"))
+    PROVIDER_TPM: int = int(os.getenv("PROVIDER_TPM", "0"))
+    SCHEDULER_MAX_QUEUE: int = int(os.getenv("SCHEDULER_MAX_QUEUE", "1000"))
+    SCHEDULER_COMPLETION_TOKENS_ESTIMATE: int = int(os.getenv("SCHEDULER_COMPLETION_TOKENS_ESTIMATE", "1500"))
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "3"))
+    RATE_LIMIT_BACKOFF_BASE_SECONDS: float = float(os.getenv("RATE_LIMIT_BACKOFF_BASE_SECONDS", "1"))
+    RATE_LIMIT_BACKOFF_MAX_SECONDS: float = float(os.getenv("RATE_LIMIT_BACKOFF_MAX_SECONDS", "60"))
+    
+    # Çıktı Token Bütçesi (kategori/proje tipi/provider başına öğrenilen max_tokens)
+    TOKEN_BUDGET_ENABLED: bool = os.getenv("TOKEN_BUDGET_ENABLED", "true").lower() == "true"
+    TOKEN_BUDGET_DEFAULT_MAX_TOKENS: int = int(os.getenv("TOKEN_BUDGET_DEFAULT_MAX_TOKENS", "4000"))
+    TOKEN_BUDGET_PERCENTILE: float = float(os.getenv("TOKEN_BUDGET_PERCENTILE", "95"))
+    TOKEN_BUDGET_MARGIN: float = float(os.getenv("TOKEN_BUDGET_MARGIN", "0.15"))
+    TOKEN_BUDGET_MIN_SAMPLES: int = int(os.getenv("TOKEN_BUDGET_MIN_SAMPLES", "20"))
+    TOKEN_BUDGET_WINDOW: int = int(os.getenv("TOKEN_BUDGET_WINDOW", "200"))
+    TOKEN_BUDGET_MIN_TOKENS: int = int(os.getenv("TOKEN_BUDGET_MIN_TOKENS", "256"))
+    TOKEN_BUDGET_MAX_CONTINUATIONS: int = int(os.getenv("TOKEN_BUDGET_MAX_CONTINUATIONS", "2"))
+    
+    # Toplu Üretim Ayarları
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+    BATCH_DEFAULT_CONCURRENCY: int = int(os.getenv("BATCH_DEFAULT_CONCURRENCY", "4"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+    
+    # Serverless ortam (Vercel, AWS Lambda): süreç yanıttan sonra dondurulur, örnekler bellek paylaşmaz
+    SERVERLESS: bool = os.getenv(
+        "SERVERLESS", "true" if os.getenv("VERCEL") or os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "false"
+    ).lower() == "true"
+    
+    # İş Kuyruğu Ayarları
+    # Worker'lar süreç içi asyncio görevleridir: serverless'ta her depo için reddedilir (/jobs 503 döner).
+    # "memory" deposu tek süreçliktir; birden fazla süreç ortak bir "sqlite" dosyası paylaşabilir,
+    # işi sahiplenen süreç kirasını JOB_LEASE_SECONDS içinde yeniler, yenilenmeyen iş başka sürece geçer
+    JOB_STORE: str = os.getenv("JOB_STORE", "memory")  # "memory" veya "sqlite"
+    JOB_SQLITE_PATH: str = os.getenv("JOB_SQLITE_PATH", "jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_MAX_QUEUE: int = int(os.getenv("JOB_MAX_QUEUE", "1000"))
+    JOB_RETENTION_SECONDS: int = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+    JOB_PROGRESS_INTERVAL_SECONDS: float = float(os.getenv("JOB_PROGRESS_INTERVAL_SECONDS", "0.5"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+    
+    # Health Check Ayarları
+    HEALTH_CACHE_TTL_SECONDS: float = float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "30"))
+    HEALTH_REFRESH_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_REFRESH_INTERVAL_SECONDS", "15"))
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5"))
     
     # Gemini AI Ayarları
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY", "")
@@ -41,10 +122,56 @@ class Settings:
     # Ollama Ayarları
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.2")
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_NUM_CTX: int = int(os.getenv("OLLAMA_NUM_CTX", "8192"))
+    OLLAMA_NUM_PREDICT: int = int(os.getenv("OLLAMA_NUM_PREDICT", "4096"))
+    
+    # Fake Provider Ayarları (AI_PROVIDER=fake; yük testi ve yerel geliştirme için)
+    # Dağılımlar: fixed, uniform (ortalama ± sapma), normal, lognormal, exponential
+    FAKE_LATENCY_DISTRIBUTION: str = os.getenv("FAKE_LATENCY_DISTRIBUTION", "lognormal")
+    FAKE_LATENCY_MEAN_SECONDS: float = float(os.getenv("FAKE_LATENCY_MEAN_SECONDS", "0.5"))
+    FAKE_LATENCY_STDDEV_SECONDS: float = float(os.getenv("FAKE_LATENCY_STDDEV_SECONDS", "0.2"))
+    FAKE_TOKENS_PER_SECOND: float = float(os.getenv("FAKE_TOKENS_PER_SECOND", "400"))  # 0: anında
+    FAKE_OUTPUT_TOKENS: int = int(os.getenv("FAKE_OUTPUT_TOKENS", "800"))
+    FAKE_CHUNK_TOKENS: int = int(os.getenv("FAKE_CHUNK_TOKENS", "16"))
+    FAKE_ERROR_RATE: float = float(os.getenv("FAKE_ERROR_RATE", "0"))
+    FAKE_ERROR_STATUS: int = int(os.getenv("FAKE_ERROR_STATUS", "503"))
+    FAKE_SEED: Optional[int] = int(os.getenv("FAKE_SEED")) if os.getenv("FAKE_SEED") else None
     
     # Hugging Face Ayarları
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
     HUGGINGFACE_MODEL: str = os.getenv("HUGGINGFACE_MODEL", "microsoft/DialoGPT-medium")
+    # Self-hosted text-generation-inference uyumlu endpoint
+    HUGGINGFACE_BASE_URL: str = os.getenv("HUGGINGFACE_BASE_URL", "http://localhost:8080")
+    HUGGINGFACE_MAX_NEW_TOKENS: int = int(os.getenv("HUGGINGFACE_MAX_NEW_TOKENS", "4096"))
+    # Eşzamanlı generate çağrıları en fazla bu kadar bekletilip tek istekte gönderilir (1: kapalı)
+    HUGGINGFACE_BATCH_MAX_SIZE: int = int(os.getenv("HUGGINGFACE_BATCH_MAX_SIZE", "8"))
+    HUGGINGFACE_BATCH_MAX_WAIT_MS: float = float(os.getenv("HUGGINGFACE_BATCH_MAX_WAIT_MS", "10"))
+    HUGGINGFACE_BATCH_PATH: str = os.getenv("HUGGINGFACE_BATCH_PATH", "/")
+    
+    # Ruleset Cache Ayarları
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "86400"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_SQLITE_PATH: str = os.getenv("CACHE_SQLITE_PATH", "")
+    # Sadece serbest metin alanlarında farklı istekler için benzerlik indeksi
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "100000"))
+    # Bölüm bazlı güncelleme için id ile saklanan son ruleset'ler
+    RULESET_STORE_MAX_ENTRIES: int = int(os.getenv("RULESET_STORE_MAX_ENTRIES", "1000"))
+    
+    # Kalıcı Ruleset Deposu (arama ve geçmiş; boş: kapalı). Yazılabilir bir dosya yolu gerekir,
+    # serverless (salt okunur dosya sistemi) ortamlarda boş bırakın
+    RULESET_DB_PATH: str = os.getenv("RULESET_DB_PATH", "")
+    RULESET_WRITE_BATCH_SIZE: int = int(os.getenv("RULESET_WRITE_BATCH_SIZE", "200"))
+    RULESET_WRITE_INTERVAL_SECONDS: float = float(os.getenv("RULESET_WRITE_INTERVAL_SECONDS", "0.5"))
+    RULESET_WRITE_MAX_PENDING: int = int(os.getenv("RULESET_WRITE_MAX_PENDING", "10000"))
+    RULESET_SEARCH_MAX_LIMIT: int = int(os.getenv("RULESET_SEARCH_MAX_LIMIT", "100"))
+
+    # Önceden üretilmiş ruleset paketi (python -m app.cli.pregenerate; dosya yoksa kapalı)
+    RULESET_BUNDLE_PATH: str = os.getenv("RULESET_BUNDLE_PATH", "rulesets.bundle")
 
 # Global settings instance
 settings = Settings()
@@ -1,9 +1,21 @@
 """
 Pydantic model tanımları
 """
+from enum import Enum
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
+class CacheMode(str, Enum):
+    """Ruleset cache kullanım modu"""
+    DEFAULT = "default"  # Önce cache, yoksa üret ve kaydet
+    BYPASS = "bypass"    # Cache'i tamamen atla
+    REFRESH = "refresh"  # Cache'i okuma, yeniden üret ve kaydet
+
+class GenerationMode(str, Enum):
+    """Ruleset üretim modu"""
+    MONOLITHIC = "monolithic"  # Tek prompt, tek completion
+    SECTIONED = "sectioned"    # Her bölüm ayrı prompt, eşzamanlı
+
 class ProjectInfo(BaseModel):
     """Proje bilgileri modeli"""
     
@@ -35,17 +47,45 @@ class ProjectInfo(BaseModel):
     additional_requirements: Optional[List[str]] = []
     notes: Optional[str] = None
 
+class BatchRulesetRequest(BaseModel):
+    """Toplu ruleset isteği modeli"""
+    items: List[ProjectInfo]
+    concurrency: Optional[int] = None
+
+class RulesetDiffRequest(BaseModel):
+    """Önceki bir ruleset'i değişen alanlara göre güncelleme isteği"""
+    previous_ruleset_id: str
+    project_info: ProjectInfo
+
 class RulesetResponse(BaseModel):
     """Ruleset yanıt modeli"""
     markdown: str
     json_data: Dict[str, Any]
 
+class JobSubmitResponse(BaseModel):
+    """İş oluşturma yanıt modeli"""
+    job_id: str
+    status: str
+    status_url: str
+
+class JobStatusResponse(BaseModel):
+    """İş durumu yanıt modeli"""
+    job_id: str
+    status: str  # "queued", "running", "completed", "failed"
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    partial_markdown: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
 class HealthResponse(BaseModel):
     """Sağlık kontrolü yanıt modeli"""
     status: str
     ai_provider: str
     ai_available: bool
     message: Optional[str] = None
+    checked_at: Optional[str] = None
 
 class ProjectTypesResponse(BaseModel):
     """Proje türleri yanıt modeli"""
@@ -0,0 +1,65 @@
+"""
+Route bazında süre ölçümü ve Server-Timing başlığı
+"""
+import asyncio
+import functools
+import time
+from typing import Callable
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from app.services.metrics import HTTP_REQUEST_DURATION, start_request_timings, current_timings, record_stage
+
+
+class TimedRoute(APIRoute):
+    """Doğrulama, handler ve serileştirme sürelerini ölçen route"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = self._wrap_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _wrap_endpoint(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            timings = current_timings()
+            if timings is not None:
+                timings.handler_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if timings is not None:
+                    timings.handler_finished = time.perf_counter()
+
+        return timed_endpoint
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            timings = start_request_timings()
+            status_code = 500
+            try:
+                response = await handler(request)
+                status_code = response.status_code
+            except HTTPException as e:
+                status_code = e.status_code
+                raise
+            except RequestValidationError:
+                status_code = 422
+                raise
+            finally:
+                finished = time.perf_counter()
+                # Body okuma + pydantic doğrulaması handler'dan önce, serileştirme sonra
+                if timings.handler_started is not None:
+                    record_stage("validate", timings.handler_started - timings.started)
+                if timings.handler_finished is not None:
+                    record_stage("serialize", finished - timings.handler_finished)
+                HTTP_REQUEST_DURATION.observe(finished - timings.started, request.method, route_path, str(status_code))
+
+            response.headers["Server-Timing"] = timings.server_timing(finished - timings.started)
+            return response
+
+        return timed_handler
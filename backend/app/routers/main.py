@@ -1,20 +1,72 @@
 """
 Ana API endpoint'leri
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from starlette.background import BackgroundTask
 from app.models.schemas import (
     ProjectInfo, 
     RulesetResponse, 
     HealthResponse,
     ProjectTypesResponse,
-    FrameworksResponse
+    FrameworksResponse,
+    BatchRulesetRequest,
+    RulesetDiffRequest,
+    JobSubmitResponse,
+    JobStatusResponse,
+    CacheMode,
+    GenerationMode
 )
+from app.services.admission import admission_controller, client_identity, AdmissionRejected, AdmissionTicket
+from app.services.ai_provider import ProviderError
 from app.services.ai_service import ai_service
-from app.services.prompt_service import PromptService
-import json
+from app.services.batch_service import batch_service
+from app.services.cache_service import ruleset_cache
+from app.services.health_service import health_service
+from app.services.http_client import close_http_clients
+from app.services.export_service import EXPORT_FORMATS, render_exports, zip_exports
+from app.services.job_service import job_service, JobQueueUnavailable
+from app.services.metrics import registry, stage
+from app.services.ruleset_bundle import ruleset_bundle
+from app.services.ruleset_repository import ruleset_repository
+from app.services.semantic_cache import semantic_index
+from app.routers.instrumentation import TimedRoute
+from app.routers.responses import PrecomputedResponse
+from app.services.ruleset_service import ruleset_service, GenerationResult
+from app.services.stream_metrics import stream_metrics
+from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+from app.core.config import settings
 from datetime import datetime
+from typing import Optional
+import asyncio
+import json
+import math
+import time
+
+router = APIRouter(route_class=TimedRoute)
+
+# Katalog değişmediği için bu yanıtlar süreç başına bir kez serileştirilir
+PROJECT_TYPES_RESPONSE = PrecomputedResponse(
+    ProjectTypesResponse(project_types=PROJECT_TYPES), max_age=settings.STATIC_CACHE_MAX_AGE_SECONDS
+)
+FRAMEWORKS_RESPONSE = PrecomputedResponse(
+    FrameworksResponse(frameworks=FRAMEWORKS), max_age=settings.STATIC_CACHE_MAX_AGE_SECONDS
+)
 
-router = APIRouter()
+registry.callback_counter("ruleset_cache_hits_total", "Ruleset cache isabetleri", lambda: ruleset_cache.hits)
+registry.callback_counter("ruleset_cache_misses_total", "Ruleset cache ıskaları", lambda: ruleset_cache.misses)
+registry.callback_counter(
+    "ruleset_semantic_reuses_total", "Benzerlik indeksinden yeniden kullanılan ruleset'ler",
+    lambda: semantic_index.matches
+)
+registry.callback_counter(
+    "ruleset_coalesced_requests_total", "Devam eden bir üretime katılan istekler",
+    lambda: ai_service.singleflight.coalesced
+)
+registry.callback_counter(
+    "ruleset_bundle_hits_total", "Önceden üretilmiş paketten cevaplanan istekler", lambda: ruleset_bundle.hits
+)
+registry.gauge("ruleset_jobs_queue_depth", "Kuyrukta bekleyen işler", lambda: job_service.stats()["queue_depth"])
 
 @router.get("/", response_model=dict)
 async def root():
@@ -26,96 +78,352 @@ async def root():
         "timestamp": datetime.now().isoformat()
     }
 
+@router.on_event("startup")
+async def start_background_services():
+    """Arka plan servislerini başlat"""
+    ruleset_bundle.load()
+    await ai_service.warm_up()
+    health_service.start()
+    await job_service.start()
+
+@router.on_event("shutdown")
+async def stop_background_services():
+    """Arka plan servislerini durdur"""
+    await health_service.stop()
+    await job_service.stop()
+    await ruleset_repository.stop()
+    ruleset_bundle.close()
+    await close_http_clients()
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Sağlık kontrolü"""
-    try:
-        health_data = await ai_service.check_health()
-        
-        return HealthResponse(
-            status="healthy" if health_data.get("available", False) else "unhealthy",
-            ai_provider=ai_service.provider_name,
-            ai_available=health_data.get("available", False),
-            message=health_data.get("error") if not health_data.get("available", False) else "All systems operational"
-        )
-    except Exception as e:
+    """Sağlık kontrolü (önbellekteki provider durumu)"""
+    health_data = health_service.readiness()
+    
+    if health_data is None:
         return HealthResponse(
-            status="unhealthy",
+            status="starting",
             ai_provider=ai_service.provider_name,
             ai_available=False,
-            message=f"Health check failed: {str(e)}"
+            message="Health check pending"
         )
+    
+    available = health_data.get("available", False)
+    return HealthResponse(
+        status="healthy" if available else "unhealthy",
+        ai_provider=ai_service.provider_name,
+        ai_available=available,
+        message=health_data.get("error") if not available else "All systems operational",
+        checked_at=health_data.get("checked_at")
+    )
+
+@router.get("/health/live")
+async def liveness_check():
+    """Liveness: süreç ayakta mı (ağ çağrısı yapmaz)"""
+    return health_service.liveness()
+
+@router.get("/health/ready", response_model=HealthResponse)
+async def readiness_check(response: Response):
+    """Readiness: provider kullanılabilir mi (önbellekten, hazır değilse 503)"""
+    health = await health_check()
+    if not health.ai_available:
+        response.status_code = 503
+    return health
+
+def _generation_error(e: Exception) -> HTTPException:
+    """Upstream hız limiti 429 olarak, diğer hatalar 500 olarak dönsün"""
+    if isinstance(e, ProviderError) and e.status_code == 429:
+        headers = {"Retry-After": str(max(1, math.ceil(e.retry_after)))} if e.retry_after is not None else None
+        return HTTPException(status_code=429, detail=f"Upstream rate limit: {str(e)}", headers=headers)
+    return HTTPException(status_code=500, detail=f"Ruleset generation failed: {str(e)}")
+
+async def _admit(
+    request: Request,
+    project_info: Optional[ProjectInfo] = None,
+    cache: CacheMode = CacheMode.DEFAULT
+) -> AdmissionTicket:
+    """Kabul kontrolü: slot yoksa hızlıca 429 (istemci kotası) veya 503 (aşırı yük) dön
+
+    Paketten cevaplanacak istekler provider'a gitmediği için kuyruğa girmez.
+    """
+    client = client_identity(
+        request.headers.get(settings.ADMISSION_CLIENT_HEADER),
+        request.client.host if request.client else None
+    )
+    if project_info is not None and cache == CacheMode.DEFAULT and ruleset_bundle.contains(project_info):
+        return AdmissionTicket(None, client)
+    try:
+        return await admission_controller.acquire(client)
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
 @router.post("/generate-ruleset", response_model=RulesetResponse)
-async def generate_ruleset(project_info: ProjectInfo):
+async def generate_ruleset(
+    project_info: ProjectInfo,
+    request: Request,
+    response: Response,
+    cache: CacheMode = Query(CacheMode.DEFAULT, description="Cache kullanımı: default, bypass veya refresh"),
+    mode: Optional[GenerationMode] = Query(None, description="Üretim modu: monolithic veya sectioned"),
+    compact: bool = Query(False, description="true: json_data.ruleset ağacı sadece başlıkları taşır (bölüm içerikleri yok)")
+):
     """Ruleset üret"""
+    ticket = await _admit(request, project_info, cache)
     try:
-        # Prompt üret
-        prompt = PromptService.generate_ruleset_prompt(project_info)
-        
-        # AI ile içerik üret
-        markdown_content = await ai_service.generate_ruleset(prompt)
+        result = await ruleset_service.generate(project_info, cache_mode=cache, mode=mode)
+        response.headers["X-Cache"] = result.cache_status.upper()
         
-        # JSON formatında da hazırla
-        json_data = {
-            "project_info": project_info.dict(),
-            "generated_at": datetime.now().isoformat(),
-            "ai_provider": ai_service.provider_name,
-            "ruleset_content": markdown_content
-        }
-        
-        return RulesetResponse(
-            markdown=markdown_content,
-            json_data=json_data
-        )
+        return ruleset_service.build_response(project_info, result, compact=compact)
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ruleset generation failed: {str(e)}")
+        ticket.release(e)
+        raise _generation_error(e)
+    finally:
+        ticket.release()
+
+@router.post("/generate-ruleset/diff", response_model=RulesetResponse)
+async def generate_ruleset_diff(
+    request: RulesetDiffRequest,
+    http_request: Request,
+    response: Response,
+    compact: bool = Query(False, description="true: json_data.ruleset ağacı sadece başlıkları taşır (bölüm içerikleri yok)")
+):
+    """Önceki ruleset'in sadece değişen alanlardan etkilenen bölümlerini yeniden üret"""
+    ticket = await _admit(http_request)
+    try:
+        result = await ruleset_service.regenerate_sections(request.previous_ruleset_id, request.project_info)
+    except Exception as e:
+        ticket.release(e)
+        raise _generation_error(e)
+    finally:
+        ticket.release()
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Previous ruleset not found")
+
+    response.headers["X-Cache"] = result.cache_status.upper()
+    body = ruleset_service.build_response(request.project_info, result, compact=compact)
+    body.json_data["previous_ruleset_id"] = request.previous_ruleset_id
+    return body
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events formatında tek bir olay"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post("/generate-ruleset/stream")
+async def generate_ruleset_stream(
+    project_info: ProjectInfo,
+    request: Request,
+    cache: CacheMode = Query(CacheMode.DEFAULT, description="Cache kullanımı: default, bypass veya refresh"),
+    mode: Optional[GenerationMode] = Query(None, description="Üretim modu: monolithic veya sectioned"),
+    compact: bool = Query(False, description="true: json_data.ruleset ağacı sadece başlıkları taşır (bölüm içerikleri yok)")
+):
+    """Ruleset'i Server-Sent Events olarak parça parça üret"""
+    started_at = time.perf_counter()
+    # Reddedilen istek SSE hatası yerine doğrudan 429/503 alır
+    ticket = await _admit(request, project_info, cache)
+
+    async def event_stream():
+        first_byte_at = None
+        try:
+            async for item in ruleset_service.stream(project_info, cache_mode=cache, mode=mode):
+                if isinstance(item, GenerationResult):
+                    finished_at = time.perf_counter()
+                    ttfb = (first_byte_at or finished_at) - started_at
+                    ttlb = finished_at - started_at
+                    stream_metrics.record(ttfb, ttlb)
+                    
+                    response = ruleset_service.build_response(project_info, item, compact=compact)
+                    payload = response.model_dump()
+                    payload["cache"] = item.cache_status
+                    payload["timings"] = {
+                        "time_to_first_byte_ms": round(ttfb * 1000, 2),
+                        "time_to_last_byte_ms": round(ttlb * 1000, 2)
+                    }
+                    yield _sse_event("done", payload)
+                else:
+                    if first_byte_at is None:
+                        first_byte_at = time.perf_counter()
+                    yield _sse_event("chunk", {"content": item})
+        except Exception as e:
+            ticket.release(e)
+            stream_metrics.record_error()
+            error = _generation_error(e)
+            payload = {"detail": error.detail, "status": error.status_code}
+            if error.headers:
+                payload["retry_after"] = int(error.headers["Retry-After"])
+            yield _sse_event("error", payload)
+        finally:
+            ticket.release()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # İstemci akış başlamadan ayrılırsa generator hiç çalışmaz; slot yine bırakılır
+        background=BackgroundTask(ticket.release)
+    )
+
+@router.post("/generate-rulesets/batch")
+async def generate_rulesets_batch(
+    request: BatchRulesetRequest,
+    cache: CacheMode = Query(CacheMode.DEFAULT, description="Cache kullanımı: default, bypass veya refresh")
+):
+    """Birden fazla ruleset üret, sonuçları NDJSON olarak tamamlandıkça akıt"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="En az bir proje gerekli")
+    if len(request.items) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"En fazla {settings.BATCH_MAX_ITEMS} proje gönderilebilir")
+
+    async def ndjson_stream():
+        async for line in batch_service.generate_batch(request.items, request.concurrency, cache_mode=cache):
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(ndjson_stream(), media_type="application/x-ndjson")
+
+@router.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(
+    project_info: ProjectInfo,
+    request: Request,
+    cache: CacheMode = Query(CacheMode.DEFAULT, description="Cache kullanımı: default, bypass veya refresh")
+):
+    """Ruleset üretimini kuyruğa al, hemen iş id'si döndür"""
+    try:
+        job = await job_service.submit(project_info, cache_mode=cache)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="İş kuyruğu dolu", headers={"Retry-After": "5"})
+    except JobQueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return JobSubmitResponse(
+        job_id=job["id"],
+        status=job["status"],
+        status_url=str(request.url_for("get_job", job_id=job["id"]))
+    )
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """İş durumunu ve kısmi/son çıktıyı getir"""
+    try:
+        job = await job_service.get(job_id)
+    except JobQueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    
+    return JobStatusResponse(
+        job_id=job["id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"],
+        partial_markdown=job["partial_markdown"],
+        result=job["result"],
+        error=job["error"]
+    )
+
+@router.get("/rulesets")
+async def search_rulesets(
+    framework: Optional[str] = Query(None, description="Frontend veya backend framework (ör. React, Python/FastAPI)"),
+    q: Optional[str] = Query(None, description="Ruleset içeriğinde tam metin arama"),
+    category: Optional[str] = Query(None, description="Proje kategorisi"),
+    database: Optional[str] = Query(None, description="Veritabanı türü"),
+    provider: Optional[str] = Query(None, description="AI provider"),
+    cursor: Optional[int] = Query(None, description="Önceki sayfanın next_cursor değeri"),
+    limit: int = Query(20, ge=1, description="Sayfa boyutu")
+):
+    """Kaydedilmiş ruleset'lerde ara (en yeni önce, cursor ile sayfalı)"""
+    if not ruleset_repository.enabled:
+        raise HTTPException(status_code=503, detail="Ruleset deposu kapalı (RULESET_DB_PATH)")
+
+    items, next_cursor = await ruleset_repository.search(
+        framework=framework,
+        query=q,
+        category=category,
+        database=database,
+        provider=provider,
+        cursor=cursor,
+        limit=min(limit, settings.RULESET_SEARCH_MAX_LIMIT)
+    )
+
+    async def json_stream():
+        # Sayfa tek parça serileştirilmek yerine kayıt kayıt gönderilir
+        yield '{"items":['
+        for index, item in enumerate(items):
+            yield ("," if index else "") + json.dumps(item, ensure_ascii=False)
+        yield f'],"next_cursor":{json.dumps(next_cursor)}}}'
+
+    return StreamingResponse(json_stream(), media_type="application/json")
+
+@router.get("/rulesets/{ruleset_id}")
+async def get_ruleset(ruleset_id: str):
+    """Kaydedilmiş bir ruleset'i tüm içeriğiyle getir"""
+    if not ruleset_repository.enabled:
+        raise HTTPException(status_code=503, detail="Ruleset deposu kapalı (RULESET_DB_PATH)")
+
+    record = await ruleset_repository.get(ruleset_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Ruleset bulunamadı")
+    return record
+
+@router.get("/rulesets/{ruleset_id}/export")
+async def export_ruleset(
+    ruleset_id: str,
+    format: str = Query("zip", description="zip (bütün formatlar) veya tek format: " + ", ".join(EXPORT_FORMATS))
+):
+    """Üretilmiş ruleset'i Cursor, Copilot, CLAUDE.md, JSON formatlarında indir (yeni AI çağrısı yapılmaz)"""
+    if format != "zip" and format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Desteklenmeyen format: {format}")
+
+    document = await ruleset_service.document(ruleset_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Ruleset bulunamadı")
+
+    with stage("export_render"):
+        files = render_exports(document, None if format == "zip" else [format])
+        if len(files) == 1:
+            export = files[0]
+            return Response(
+                export.content,
+                media_type=export.media_type,
+                headers={"Content-Disposition": f'attachment; filename="{export.path.rsplit("/", 1)[-1]}"'}
+            )
+        # Birden fazla dosya (zip veya Cursor'ın bölüm başına kuralları): dizin yapısıyla arşivle
+        archive = zip_exports(files)
+
+    return Response(
+        archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="ruleset-{ruleset_id}-{format}.zip"'}
+    )
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text formatında metrikler"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@router.get("/stats", response_model=dict)
+async def get_stats():
+    """Cache ve üretim istatistikleri"""
+    return {
+        "cache": ruleset_cache.stats(),
+        "semantic_cache": semantic_index.stats(),
+        "coalescing": ai_service.singleflight.stats(),
+        "providers": ai_service.provider_stats(),
+        "scheduler": ai_service.scheduler_stats(),
+        "token_budget": ai_service.token_budget_stats(),
+        "admission": admission_controller.stats(),
+        "streaming": stream_metrics.stats(),
+        "jobs": job_service.stats(),
+        "ruleset_repository": ruleset_repository.stats(),
+        "bundle": ruleset_bundle.stats()
+    }
 
 @router.get("/project-types", response_model=ProjectTypesResponse)
-async def get_project_types():
+async def get_project_types(request: Request):
     """Mevcut proje türlerini getir"""
-    project_types = [
-        "Web Application",
-        "Mobile Application", 
-        "Desktop Application",
-        "API/Microservice",
-        "Library/Package",
-        "CLI Tool",
-        "E-commerce Platform",
-        "Content Management System",
-        "Dashboard/Admin Panel",
-        "Real-time Application",
-        "Machine Learning Project",
-        "Blockchain Application",
-        "IoT Application",
-        "Game Development",
-        "Other"
-    ]
-    
-    return ProjectTypesResponse(project_types=project_types)
+    return PROJECT_TYPES_RESPONSE.respond(request)
 
 @router.get("/frameworks", response_model=FrameworksResponse)
-async def get_frameworks():
+async def get_frameworks(request: Request):
     """Mevcut framework'leri getir"""
-    frameworks = {
-        "frontend": [
-            "React", "Vue.js", "Angular", "Svelte", "Next.js", "Nuxt.js", 
-            "Vanilla JavaScript", "jQuery", "Alpine.js", "Lit", "Other"
-        ],
-        "backend": [
-            "Node.js/Express", "Node.js/Fastify", "Python/Django", "Python/FastAPI", 
-            "Python/Flask", "Java/Spring", "C#/.NET", "PHP/Laravel", "PHP/Symfony", 
-            "Ruby on Rails", "Go/Gin", "Go/Echo", "Rust/Actix", "Other"
-        ],
-        "mobile": [
-            "React Native", "Flutter", "Swift/iOS", "Kotlin/Android", 
-            "Xamarin", "Ionic", "Cordova/PhoneGap", "Other"
-        ],
-        "database": [
-            "PostgreSQL", "MySQL", "MongoDB", "SQLite", "Redis", 
-            "Cassandra", "DynamoDB", "Firebase", "Supabase", "Other"
-        ]
-    }
-    
-    return FrameworksResponse(frameworks=frameworks)
+    return FRAMEWORKS_RESPONSE.respond(request)
@@ -0,0 +1,152 @@
+"""
+Önceden serileştirilmiş (ETag'li) yanıtlar ve gzip/brotli yanıt sıkıştırma
+"""
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse sadece gzip kullanılır
+    brotli = None
+
+# Akışlı yanıtlar parça parça iletilmeli, sıkıştırılırsa tamponda bekler
+_STREAMING_MEDIA_TYPES = ("text/event-stream", "application/x-ndjson")
+# Zaten sıkıştırılmış içerik tekrar sıkıştırılmaz
+_COMPRESSED_MEDIA_TYPES = ("application/zip", "application/gzip", "image/", "video/", "audio/")
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """Accept-Encoding başlığını kodlama -> q değeri olarak çöz"""
+    encodings = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            encodings[name.strip().lower()] = quality
+    return encodings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """İstemcinin kabul ettiği en iyi kodlama (br > gzip), yoksa None"""
+    encodings = _accepted_encodings(accept_encoding)
+    wildcard = encodings.get("*", 0.0)
+    for name in ("br", "gzip"):
+        if name == "br" and brotli is None:
+            continue
+        if encodings.get(name, wildcard) > 0:
+            return name
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    # mtime=0: aynı gövde her zaman aynı bayt dizisine sıkışsın
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL, mtime=0)
+
+
+class PrecomputedResponse:
+    """Değişmeyen bir yanıtın JSON gövdesi, güçlü ETag'i ve sıkıştırılmış halleri"""
+
+    def __init__(self, content: Any, max_age: int = 3600):
+        if isinstance(content, BaseModel):
+            content = content.model_dump(mode="json")
+        self.body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.cache_control = f"public, max-age={max_age}"
+        self.encoded: Dict[str, bytes] = {"gzip": compress(self.body, "gzip")}
+        if brotli is not None:
+            self.encoded["br"] = compress(self.body, "br")
+
+    def _not_modified(self, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        # Zayıf karşılaştırma: W/ önekini yok say
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return self.etag in tags
+
+    def respond(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if self._not_modified(request.headers.get("if-none-match", "")):
+            return Response(status_code=304, headers=headers)
+
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is not None and encoding in self.encoded:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded[encoding], media_type="application/json", headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+
+class CompressionMiddleware:
+    """Tek parça gönderilen büyük yanıtları gzip/brotli ile sıkıştır; akışlara dokunma"""
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope["headers"])
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Dict[str, Any]] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                media_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or media_type.startswith(_STREAMING_MEDIA_TYPES + _COMPRESSED_MEDIA_TYPES):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            # http.response.body: birden fazla parça geliyorsa akış, olduğu gibi ilet
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers: List[Tuple[bytes, bytes]] = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name not in (b"content-length", b"content-encoding")
+            ]
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+            ]
+            vary = [value for name, value in headers if name == b"vary"]
+            if not vary:
+                headers.append((b"vary", b"Accept-Encoding"))
+            elif b"accept-encoding" not in vary[0].lower():
+                headers = [(name, value) for name, value in headers if name != b"vary"]
+                headers.append((b"vary", vary[0] + b", Accept-Encoding"))
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,308 @@
+"""
+Gelen üretim istekleri için kabul kontrolü: uyarlanabilir eşzamanlılık limiti,
+süreli bekleme kuyruğu (yük atma) ve istemci başına adil pay
+"""
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+from app.services.ai_provider import ProviderError
+from app.services.latency_stats import LatencyWindow
+from app.services.metrics import registry, current_timings
+from app.core.config import settings
+
+ADMISSION_WAIT = registry.histogram(
+    "ruleset_admission_wait_seconds", "Kabul edilen isteğin kabul kuyruğunda beklediği süre"
+)
+ADMISSION_SHED = registry.counter(
+    "ruleset_admission_shed_total", "Kabul edilmeyen (atılan) istekler", ("reason",)
+)
+
+# Upstream'in aşırı yüklendiğini gösteren hata kodları: limit hemen küçülür
+_OVERLOAD_STATUS_CODES = (429, 503, 504)
+
+
+class AdmissionRejected(Exception):
+    """İstek kabul edilmedi; status_code 429 (istemci kotası) veya 503 (aşırı yük)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int, reason: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def client_identity(api_key: Optional[str], host: Optional[str]) -> str:
+    """Adil pay anahtarı: API key (özetlenmiş) veya istemci IP'si"""
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    return f"ip:{host or 'unknown'}"
+
+
+class AdmissionTicket:
+    """Kabul edilen isteğin slotu; release() birden fazla çağrılabilir, ilki geçerlidir"""
+
+    def __init__(self, controller: Optional["AdmissionController"], client: str):
+        self.controller = controller
+        self.client = client
+        self.admitted_at = time.perf_counter()
+        self.released = False
+
+    def release(self, error: Optional[BaseException] = None):
+        if self.released:
+            return
+        self.released = True
+        if self.controller is not None:
+            self.controller.release(self, error)
+
+
+class _Waiter:
+    __slots__ = ("client", "future", "enqueued_at")
+
+    def __init__(self, client: str, future: asyncio.Future):
+        self.client = client
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+def _upstream_seconds() -> Optional[float]:
+    """Bu istekte upstream aşamalarında geçen süre (cache isabetinde None)"""
+    timings = current_timings()
+    if timings is None:
+        return None
+    durations = [seconds for name, seconds in timings.stages if name == "upstream"]
+    return sum(durations) if durations else None
+
+
+class AdmissionController:
+    """Uçuştaki istek limiti, istemciler arası round-robin kuyruk ve gecikmeye göre uyarlanan limit
+
+    Limit AIMD ile ayarlanır: her `update_every` upstream ölçümünde son pencerenin
+    medyanı, uzun penceredeki en küçük değerin (yüksüz gecikme) `tolerance` katını
+    aşıyorsa limit `decrease_ratio` ile çarpılır; aşmıyorsa ve limit dolmuşsa bir
+    artırılır. Upstream'den aşırı yük hatası (429/503/504) gelirse limit hemen küçülür.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 32,
+        min_limit: int = 4,
+        max_limit: int = 256,
+        adaptive: bool = True,
+        tolerance: float = 2.0,
+        decrease_ratio: float = 0.9,
+        update_every: int = 10,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+        client_share: float = 0.5
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(max_limit, initial_limit)))
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.decrease_ratio = decrease_ratio
+        self.update_every = update_every
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.client_share = client_share
+        self.inflight = 0
+        self._client_inflight: Dict[str, int] = {}
+        # İstemci başına FIFO, istemciler arası round-robin
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._queued = 0
+        self._recent = LatencyWindow(size=max(update_every * 5, 50))
+        # Yüksüz gecikme: son ölçümlerin en küçüğü (gecikme kalıcı artarsa pencereden çıkınca yükselir)
+        self._baseline = LatencyWindow(size=500)
+        self._samples_since_update = 0
+        self._peak_inflight = 0
+        self._last_decrease = 0.0
+        # Slot başına ortalama tutulma süresi (kuyrukta bekleme tahmini için; ilk ölçüme kadar yok)
+        self._service_time: Optional[float] = None
+        self.admitted = 0
+        self.queued_total = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "deadline": 0, "timeout": 0, "client_quota": 0}
+
+    # --- Kabul ---
+
+    @property
+    def current_limit(self) -> int:
+        return max(1, int(self.limit))
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    def _client_quota(self) -> int:
+        """Bir istemcinin aynı anda uçuşta + kuyrukta tutabileceği istek sayısı"""
+        return max(1, math.ceil((self.current_limit + self.max_queue) * self.client_share))
+
+    def _estimated_wait(self, position: int) -> float:
+        """Kuyruğun `position`. sırasındaki isteğin tahmini bekleme süresi"""
+        if self._service_time is None:
+            return 0.0
+        return position * self._service_time / self.current_limit
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._estimated_wait(self._queued + 1)))
+
+    def _reject(self, reason: str, status_code: int, message: str) -> AdmissionRejected:
+        self.shed[reason] += 1
+        ADMISSION_SHED.inc(reason)
+        return AdmissionRejected(message, status_code, self._retry_after(), reason)
+
+    def _admit(self, client: str) -> AdmissionTicket:
+        self.inflight += 1
+        self._client_inflight[client] = self._client_inflight.get(client, 0) + 1
+        self._peak_inflight = max(self._peak_inflight, self.inflight)
+        self.admitted += 1
+        return AdmissionTicket(self, client)
+
+    async def acquire(self, client: str) -> AdmissionTicket:
+        """Slot al; dolu ise süreli kuyrukta bekle, beklenemeyecekse hemen reddet"""
+        if not settings.ADMISSION_ENABLED:
+            return AdmissionTicket(None, client)
+
+        outstanding = self._client_inflight.get(client, 0) + len(self._queues.get(client, ()))
+        if outstanding >= self._client_quota():
+            raise self._reject("client_quota", 429, "İstemci eşzamanlı istek kotası doldu")
+
+        if self.inflight < self.current_limit and not self._queued:
+            ADMISSION_WAIT.observe(0.0)
+            return self._admit(client)
+
+        if self._queued >= self.max_queue:
+            raise self._reject("queue_full", 503, "Sunucu aşırı yüklü, kabul kuyruğu dolu")
+        # Süre dolmadan sıra gelmeyecekse bekletmeden reddet
+        if self._estimated_wait(self._queued + 1) > self.queue_timeout:
+            raise self._reject("deadline", 503, "Sunucu aşırı yüklü, tahmini bekleme süresi çok uzun")
+
+        waiter = _Waiter(client, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(client, deque()).append(waiter)
+        self._queued += 1
+        self.queued_total += 1
+        try:
+            ticket = await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            if self._remove(waiter):
+                raise self._reject("timeout", 503, "Sunucu aşırı yüklü, kabul kuyruğunda süre doldu")
+            # Süre dolarken slot verildi
+            ticket = waiter.future.result()
+        except asyncio.CancelledError:
+            if not self._remove(waiter):
+                # İstemci ayrıldı ama slot verilmişti: geri bırak
+                waiter.future.result().release()
+            raise
+        ADMISSION_WAIT.observe(time.perf_counter() - waiter.enqueued_at)
+        return ticket
+
+    def _remove(self, waiter: _Waiter) -> bool:
+        """Bekleyeni kuyruktan çıkar; zaten slot verilmişse False"""
+        if waiter.future.done():
+            return False
+        queue = self._queues.get(waiter.client)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[waiter.client]
+        waiter.future.cancel()
+        return True
+
+    def _dispatch(self):
+        """Boş slotları istemciler arasında sırayla dağıt"""
+        while self._queues and self.inflight < self.current_limit:
+            client, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+            if queue:
+                self._queues.move_to_end(client)
+            else:
+                del self._queues[client]
+            waiter.future.set_result(self._admit(client))
+
+    def release(self, ticket: AdmissionTicket, error: Optional[BaseException] = None):
+        """Slotu bırak, upstream gecikmesini limite yansıt, sıradakini kabul et"""
+        self.inflight -= 1
+        remaining = self._client_inflight.get(ticket.client, 1) - 1
+        if remaining:
+            self._client_inflight[ticket.client] = remaining
+        else:
+            self._client_inflight.pop(ticket.client, None)
+
+        held = time.perf_counter() - ticket.admitted_at
+        self._service_time = held if self._service_time is None else 0.8 * self._service_time + 0.2 * held
+        if self.adaptive:
+            if isinstance(error, ProviderError) and error.status_code in _OVERLOAD_STATUS_CODES:
+                self._decrease()
+            else:
+                upstream = _upstream_seconds()
+                if upstream is not None and error is None:
+                    self._observe(upstream)
+        self._dispatch()
+
+    # --- Uyarlanabilir limit ---
+
+    def _decrease(self):
+        # Art arda gelen hatalar limiti bir anda çökertmesin: gecikme süresi başına bir azaltma
+        now = time.monotonic()
+        if now - self._last_decrease < min(self._service_time or 0.0, 1.0):
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_ratio)
+
+    def _observe(self, seconds: float):
+        self._recent.add(seconds)
+        self._baseline.add(seconds)
+        self._samples_since_update += 1
+        if self._samples_since_update < self.update_every:
+            return
+        self._samples_since_update = 0
+
+        observed = self._recent.percentile(50)
+        baseline = self._baseline.percentile(0)
+        if observed > baseline * self.tolerance:
+            self._decrease()
+        elif self._peak_inflight >= self.current_limit:
+            # Limit dolduğu halde gecikme artmadı: kapasite var
+            self.limit = min(float(self.max_limit), self.limit + 1)
+        self._peak_inflight = self.inflight
+
+    def stats(self) -> Dict[str, Any]:
+        """Limit, kuyruk ve atılan istek metrikleri"""
+        def to_ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "limit": self.current_limit,
+            "inflight": self.inflight,
+            "queue_depth": self.queue_depth,
+            "queued_clients": len(self._queues),
+            "active_clients": len(self._client_inflight),
+            "client_quota": self._client_quota(),
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "shed": dict(self.shed),
+            "upstream_p50_ms": to_ms(self._recent.percentile(50)),
+            "upstream_baseline_ms": to_ms(self._baseline.percentile(0)),
+        }
+
+
+# Global admission controller instance
+admission_controller = AdmissionController(
+    initial_limit=settings.ADMISSION_INITIAL_LIMIT,
+    min_limit=settings.ADMISSION_MIN_LIMIT,
+    max_limit=settings.ADMISSION_MAX_LIMIT,
+    adaptive=settings.ADMISSION_ADAPTIVE,
+    tolerance=settings.ADMISSION_LATENCY_TOLERANCE,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    client_share=settings.ADMISSION_CLIENT_SHARE
+)
+
+registry.gauge("ruleset_admission_limit", "Uyarlanabilir eşzamanlılık limiti", lambda: admission_controller.current_limit)
+registry.gauge("ruleset_admission_inflight", "Kabul edilmiş, süren üretim istekleri", lambda: admission_controller.inflight)
+registry.gauge("ruleset_admission_queue_depth", "Kabul kuyruğunda bekleyen istekler", lambda: admission_controller.queue_depth)
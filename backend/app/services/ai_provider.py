@@ -1,24 +1,107 @@
 """
 AI provider base class
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Any, Optional, Callable, TypeVar, AsyncIterator
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Async yolu olmayan SDK çağrıları için sınırlı thread havuzu
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PROVIDER_THREADPOOL_SIZE,
+    thread_name_prefix="ai-provider"
+)
+
+
+async def run_in_threadpool(func: Callable[..., T], *args, **kwargs) -> T:
+    """Bloklayan bir çağrıyı event loop'u dondurmadan çalıştır"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+class ProviderError(Exception):
+    """Upstream AI provider hatası"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+@dataclass
+class GenerationLimits:
+    """Tek bir upstream çağrısının çıktı limiti ve provider'ın bildirdiği sonuç"""
+    max_tokens: Optional[int] = None
+    truncated: Optional[bool] = None  # Çıktı max_tokens'a takılıp kesildi mi
+    completion_tokens: Optional[int] = None
+
+
+_generation_limits: ContextVar[Optional[GenerationLimits]] = ContextVar("generation_limits", default=None)
+
+
+@contextmanager
+def generation_limits_scope(max_tokens: Optional[int]):
+    """Bu blokta yapılan upstream çağrısına çıktı limiti ver, sonucunu topla"""
+    limits = GenerationLimits(max_tokens=max_tokens)
+    token = _generation_limits.set(limits)
+    try:
+        yield limits
+    finally:
+        _generation_limits.reset(token)
+
+
+def max_output_tokens(default: Optional[int] = None) -> Optional[int]:
+    """Provider'ların kullanacağı çıktı limiti: bütçe verilmişse o, yoksa varsayılan"""
+    limits = _generation_limits.get()
+    if limits is not None and limits.max_tokens:
+        return limits.max_tokens
+    return default
+
+
+def report_completion(truncated: Optional[bool], completion_tokens: Optional[int] = None):
+    """Provider çıktının kesilip kesilmediğini ve token sayısını bildirir"""
+    limits = _generation_limits.get()
+    if limits is not None:
+        limits.truncated = truncated
+        limits.completion_tokens = completion_tokens
+
 
 class AIProvider(ABC):
     """AI provider için base class"""
-    
+
     @abstractmethod
     async def generate_content(self, prompt: str) -> str:
         """İçerik üret"""
         pass
-    
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """İçeriği parça parça üret (varsayılan: tek parça)"""
+        yield await self.generate_content(prompt)
+
+    async def warm_up(self):
+        """Başlangıçta provider'ı hazırla (varsayılan: bir şey yapma)"""
+        pass
+
     @abstractmethod
     async def check_health(self) -> Dict[str, Any]:
         """Sağlık kontrolü"""
         pass
-    
+
     @property
     @abstractmethod
     def provider_name(self) -> str:
         """Provider adı"""
         pass
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Kullanılan model adı"""
+        pass
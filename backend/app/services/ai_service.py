@@ -1,51 +1,222 @@
 """
 AI service factory ve manager
 """
-from typing import Optional
+import logging
+import time
+from typing import Optional, AsyncIterator, Callable, Dict, Any
 from app.services.ai_provider import AIProvider
-from app.services.gemini_provider import GeminiProvider
-from app.services.openai_provider import OpenAIProvider
+from app.services.provider_pool import ProviderPool
+from app.services.scheduler import ScheduledProvider, UpstreamScheduler
+from app.services.singleflight import SingleFlight, prompt_key
+from app.services.token_budget import BudgetRequest, token_budgeter
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+
+# Provider SDK'ları ağır olduğu için modüller sadece seçildiklerinde import edilir
+def _gemini() -> AIProvider:
+    from app.services.gemini_provider import GeminiProvider
+    return GeminiProvider()
+
+
+def _openai() -> AIProvider:
+    from app.services.openai_provider import OpenAIProvider
+    return OpenAIProvider()
+
+
+def _ollama() -> AIProvider:
+    from app.services.ollama_provider import OllamaProvider
+    return OllamaProvider()
+
+
+def _huggingface() -> AIProvider:
+    from app.services.huggingface_provider import HuggingFaceProvider
+    return HuggingFaceProvider()
+
+
+def _fake() -> AIProvider:
+    from app.services.fake_provider import FakeProvider
+    return FakeProvider.from_settings()
+
+
+PROVIDER_REGISTRY: Dict[str, Callable[[], AIProvider]] = {
+    "gemini": _gemini,
+    "openai": _openai,
+    "ollama": _ollama,
+    "huggingface": _huggingface,
+    "fake": _fake,
+}
+
+
+def register_provider(name: str, factory: Callable[[], AIProvider]):
+    """Yeni bir provider fabrikası kaydet"""
+    PROVIDER_REGISTRY[name] = factory
+
+
 class AIService:
     """AI service manager"""
     
     def __init__(self):
-        self.provider: Optional[AIProvider] = None
-        self._initialize_provider()
+        # Provider ilk kullanımda (veya startup'ta warm_up ile) oluşturulur
+        self._provider: Optional[AIProvider] = None
+        self._init_error: Optional[str] = None
+        self._init_failed_at: Optional[float] = None
+        self.singleflight = SingleFlight()
+    
+    @property
+    def provider(self) -> Optional[AIProvider]:
+        if self._provider is None and self._should_initialize():
+            try:
+                self._initialize_provider()
+                self._init_error = None
+                self._init_failed_at = None
+            except Exception as e:
+                if self._init_error is None:
+                    logger.exception("AI provider başlatılamadı")
+                else:
+                    logger.warning("AI provider hâlâ başlatılamıyor: %s", e)
+                self._init_error = str(e)
+                self._init_failed_at = time.monotonic()
+        return self._provider
+    
+    @provider.setter
+    def provider(self, provider: Optional[AIProvider]):
+        self._provider = provider
+        self._init_error = None
+        self._init_failed_at = None
+    
+    def _should_initialize(self) -> bool:
+        """Son başarısız denemeden sonra bekleme süresi doldu mu (her erişimde SDK yeniden import edilmez)"""
+        if self._init_failed_at is None:
+            return True
+        return time.monotonic() - self._init_failed_at >= settings.PROVIDER_INIT_RETRY_SECONDS
+    
+    def _unavailable(self) -> Exception:
+        """Saklanan başlatma hatasıyla ucuz hata"""
+        if self._init_error:
+            return Exception(f"AI provider başlatılamadı: {self._init_error}")
+        return Exception("AI provider başlatılamadı")
+    
+    @staticmethod
+    def _create_provider(provider_name: str) -> AIProvider:
+        """İsme göre provider oluştur"""
+        factory = PROVIDER_REGISTRY.get(provider_name)
+        if factory is None:
+            raise ValueError(f"Desteklenmeyen AI provider: {provider_name}")
+        return factory()
+    
+    @staticmethod
+    def _schedule(provider: AIProvider) -> ScheduledProvider:
+        """Provider'ın önüne RPM/TPM bütçeli, öncelik şeritli zamanlayıcı koy"""
+        scheduler = UpstreamScheduler(
+            provider.provider_name,
+            requests_per_minute=settings.PROVIDER_RPM,
+            tokens_per_minute=settings.PROVIDER_TPM,
+            max_queue=settings.SCHEDULER_MAX_QUEUE
+        )
+        return ScheduledProvider(
+            provider,
+            scheduler,
+            completion_tokens_estimate=settings.SCHEDULER_COMPLETION_TOKENS_ESTIMATE,
+            max_retries=settings.RATE_LIMIT_MAX_RETRIES,
+            backoff_base=settings.RATE_LIMIT_BACKOFF_BASE_SECONDS,
+            backoff_max=settings.RATE_LIMIT_BACKOFF_MAX_SECONDS
+        )
     
     def _initialize_provider(self):
-        """Provider'ı başlat"""
-        provider_name = settings.AI_PROVIDER.lower()
+        """Provider'ı başlat (birden fazla ise havuz olarak)"""
+        provider_names = [
+            name.strip().lower()
+            for name in (settings.AI_PROVIDERS or settings.AI_PROVIDER).split(",")
+            if name.strip()
+        ]
+        providers = [self._schedule(self._create_provider(name)) for name in provider_names]
         
-        if provider_name == "gemini":
-            self.provider = GeminiProvider()
-        elif provider_name == "openai":
-            self.provider = OpenAIProvider()
+        if len(providers) == 1:
+            self._provider = providers[0]
         else:
-            raise ValueError(f"Desteklenmeyen AI provider: {provider_name}")
+            self._provider = ProviderPool(
+                providers,
+                hedging=settings.PROVIDER_HEDGING_ENABLED,
+                hedge_min_delay=settings.PROVIDER_HEDGE_MIN_DELAY_SECONDS,
+                failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+                cooldown_seconds=settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+            )
     
-    async def generate_ruleset(self, prompt: str) -> str:
-        """Ruleset üret"""
+    async def generate_ruleset(self, prompt: str, budget: Optional[BudgetRequest] = None) -> str:
+        """Ruleset üret (budget verilirse öğrenilmiş çıktı limitiyle, kesilirse devam ettirerek)"""
         if not self.provider:
-            raise Exception("AI provider başlatılamadı")
+            raise self._unavailable()
+        
+        provider = self.provider
+        if budget is not None and settings.TOKEN_BUDGET_ENABLED:
+            generate = lambda: token_budgeter.generate(provider.generate_content, prompt, budget)
+        else:
+            generate = lambda: provider.generate_content(prompt)
         
-        return await self.provider.generate_content(prompt)
+        if not settings.COALESCE_REQUESTS:
+            return await generate()
+        
+        # Aynı prompt için devam eden bir üretim varsa onu bekle (devam edilmiş metin dahil)
+        key = prompt_key(prompt, provider.provider_name, provider.model_name)
+        return await self.singleflight.do(key, generate)
+    
+    async def stream_ruleset(self, prompt: str, budget: Optional[BudgetRequest] = None) -> AsyncIterator[str]:
+        """Ruleset'i parça parça üret"""
+        if not self.provider:
+            raise self._unavailable()
+        
+        if budget is not None and settings.TOKEN_BUDGET_ENABLED:
+            source = token_budgeter.stream(self.provider.stream_content, prompt, budget)
+        else:
+            source = self.provider.stream_content(prompt)
+        async for chunk in source:
+            yield chunk
+    
+    async def warm_up(self):
+        """Provider'ı başlangıçta hazırla"""
+        if self.provider:
+            await self.provider.warm_up()
     
     async def check_health(self):
         """Sağlık kontrolü"""
         if not self.provider:
             return {
                 "available": False,
-                "error": "Provider başlatılamadı"
+                "error": f"Provider başlatılamadı: {self._init_error}" if self._init_error else "Provider başlatılamadı"
             }
         
         return await self.provider.check_health()
     
+    def provider_stats(self) -> Dict[str, Any]:
+        """Havuzdaki provider'ların yönlendirme metrikleri"""
+        if isinstance(self.provider, ProviderPool):
+            return self.provider.stats()
+        return {}
+    
+    def scheduler_stats(self) -> Dict[str, Any]:
+        """Provider başına zamanlayıcı kuyruğu ve kısıtlama metrikleri"""
+        providers = self.provider.providers if isinstance(self.provider, ProviderPool) else [self.provider]
+        return {
+            provider.provider_name: provider.scheduler.stats()
+            for provider in providers
+            if isinstance(provider, ScheduledProvider)
+        }
+    
+    def token_budget_stats(self) -> Dict[str, Any]:
+        """Çıktı token bütçesi ve tasarruf raporu"""
+        return token_budgeter.stats()
+    
     @property
     def provider_name(self) -> str:
         """Aktif provider adı"""
         return self.provider.provider_name if self.provider else "none"
+    
+    @property
+    def model_name(self) -> str:
+        """Aktif model adı"""
+        return self.provider.model_name if self.provider else "none"
 
 # Global AI service instance
 ai_service = AIService()
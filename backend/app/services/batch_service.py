@@ -0,0 +1,114 @@
+"""
+Toplu ruleset üretimi (sınırlı eşzamanlılık; hız limiti upstream zamanlayıcıda)
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+from app.models.schemas import ProjectInfo, CacheMode
+from app.services.ai_service import ai_service
+from app.services.cache_service import make_cache_key
+from app.services.ruleset_service import ruleset_service
+from app.services.scheduler import Priority, priority_scope
+from app.core.config import settings
+
+
+class BatchService:
+    """Çok sayıda ProjectInfo için ruleset üret, sonuçları geldikçe döndür"""
+
+    def __init__(self, default_concurrency: int, max_concurrency: int):
+        self.default_concurrency = default_concurrency
+        self.max_concurrency = max_concurrency
+
+    async def _generate_one(
+        self,
+        project_info: ProjectInfo,
+        cache_mode: CacheMode,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                # RPM/TPM bütçesi zamanlayıcıda; toplu istekler etkileşimli isteklerin arkasında bekler
+                with priority_scope(Priority.BATCH):
+                    result = await ruleset_service.generate(project_info, cache_mode=cache_mode)
+            except Exception as e:
+                return {"status": "error", "error": str(e), "duration_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+            response = ruleset_service.build_response(project_info, result)
+            return {
+                "status": "ok",
+                "cache": result.cache_status,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                **response.model_dump()
+            }
+
+    async def _generate_group(self, indexes: List[int], *args) -> Tuple[List[int], Dict[str, Any]]:
+        return indexes, await self._generate_one(*args)
+
+    async def generate_batch(
+        self,
+        items: List[ProjectInfo],
+        concurrency: Optional[int] = None,
+        cache_mode: CacheMode = CacheMode.DEFAULT
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Her öğenin sonucunu tamamlandığı sırayla, en sonda özet döndür"""
+        started = time.perf_counter()
+        concurrency = max(1, min(concurrency or self.default_concurrency, self.max_concurrency))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        # Aynı (normalize edilmiş) ProjectInfo'lar tek sefer üretilir
+        groups: Dict[str, List[int]] = {}
+        for index, project_info in enumerate(items):
+            key = make_cache_key(project_info, ai_service.provider_name, ai_service.model_name)
+            groups.setdefault(key, []).append(index)
+
+        tasks = [
+            asyncio.create_task(self._generate_group(indexes, items[indexes[0]], cache_mode, semaphore))
+            for indexes in groups.values()
+        ]
+
+        succeeded = failed = 0
+        try:
+            for completed in asyncio.as_completed(tasks):
+                indexes, result = await completed
+                for index in indexes:
+                    line = {"type": "result", "index": index, **result}
+                    if index != indexes[0]:
+                        line["duplicate_of"] = indexes[0]
+                    if result["status"] == "ok":
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    yield line
+        finally:
+            # İstemci bağlantıyı keserse kalan üretimleri durdur
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        yield {
+            "type": "summary",
+            "total": len(items),
+            "unique": len(groups),
+            "succeeded": succeeded,
+            "failed": failed,
+            "concurrency": concurrency,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    async def run(
+        self,
+        items: List[ProjectInfo],
+        concurrency: Optional[int] = None,
+        cache_mode: CacheMode = CacheMode.DEFAULT
+    ) -> List[Dict[str, Any]]:
+        """Python'dan kullanım için: tüm sonuçları index sırasıyla döndür"""
+        results = [line async for line in self.generate_batch(items, concurrency, cache_mode) if line["type"] == "result"]
+        return sorted(results, key=lambda line: line["index"])
+
+
+# Global batch service instance
+batch_service = BatchService(
+    default_concurrency=settings.BATCH_DEFAULT_CONCURRENCY,
+    max_concurrency=settings.BATCH_MAX_CONCURRENCY
+)
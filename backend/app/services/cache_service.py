@@ -0,0 +1,219 @@
+"""
+Ruleset cache katmanı (bellek içi LRU + opsiyonel SQLite)
+"""
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from app.models.schemas import ProjectInfo
+from app.services.prompt_service import PROMPT_TEMPLATE_VERSION
+from app.core.config import settings
+
+CACHE_KEY_VERSION = 1
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_text(value: Optional[str]) -> Optional[str]:
+    """Boşlukları sadeleştir ve küçük harfe çevir"""
+    if value is None:
+        return None
+    value = _WHITESPACE_RE.sub(" ", value).strip().lower()
+    return value or None
+
+
+def normalize_project_info(project_info: ProjectInfo) -> Dict[str, Any]:
+    """Aynı anlama gelen ProjectInfo'ları aynı sözlüğe indirge"""
+    data = project_info.model_dump()
+
+    for field, value in data.items():
+        if isinstance(value, str):
+            data[field] = value.strip() or None
+
+    data["notes"] = _normalize_text(project_info.notes)
+    data["additional_requirements"] = sorted(
+        item.strip() for item in (project_info.additional_requirements or []) if item and item.strip()
+    )
+    return data
+
+
+def make_cache_key(project_info: ProjectInfo, provider: str, model: str) -> str:
+    """ProjectInfo + provider/model için içerik adresli cache anahtarı"""
+    payload = {
+        "v": CACHE_KEY_VERSION,
+        "template": PROMPT_TEMPLATE_VERSION,
+        "provider": provider.lower(),
+        "model": model,
+        "project": normalize_project_info(project_info),
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheTier:
+    """TTL ve boyut limitli LRU bellek cache'i"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value, _ = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: Optional[float] = None):
+        size = len(value.get("markdown", "").encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (expires_at or time.time() + self.ttl_seconds, value, size)
+        self._bytes += size
+
+        # En eski kayıtları limitlere inene kadar çıkar
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class SQLiteCacheTier:
+    """Yeniden başlatmalardan sonra da kalıcı olan disk cache'i"""
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ruleset_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM ruleset_cache WHERE expires_at <= ?", (time.time(),))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ruleset_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return row[1], json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ruleset_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + self.ttl_seconds)
+            )
+            self._conn.commit()
+
+
+class RulesetCache:
+    """İki katmanlı ruleset cache'i"""
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int,
+        max_bytes: int,
+        sqlite_path: str = ""
+    ):
+        self.memory = MemoryCacheTier(ttl_seconds, max_entries, max_bytes)
+        self.disk: Optional[SQLiteCacheTier] = SQLiteCacheTier(sqlite_path, ttl_seconds) if sqlite_path else None
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, record_stats: bool = True) -> Optional[Dict[str, Any]]:
+        """Önce bellekte, sonra diskte ara"""
+        value = self.memory.get(key)
+        if value is not None:
+            if record_stats:
+                self.hits += 1
+                self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            row = await asyncio.to_thread(self.disk.get, key)
+            if row is not None:
+                expires_at, value = row
+                self.memory.set(key, value, expires_at)
+                if record_stats:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return value
+
+        if record_stats:
+            self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        """Her iki katmana yaz"""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss sayaçları"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.memory),
+            "bytes": self.memory.size_bytes,
+            "evictions": self.memory.evictions,
+            "disk_enabled": self.disk is not None,
+        }
+
+
+# Global cache instance
+ruleset_cache = RulesetCache(
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+    sqlite_path=settings.CACHE_SQLITE_PATH
+)
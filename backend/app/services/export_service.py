@@ -0,0 +1,224 @@
+"""
+Tek üretimden yerel dışa aktarma: bölüm ağacı ve asistan formatları (Cursor, Copilot, CLAUDE.md, JSON)
+"""
+import io
+import json
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.services.section_service import ParsedRuleset
+
+_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+_NUMBER_RE = re.compile(r"^\W*\d+[.)]?\s*")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+# Zip girdilerinin sabit zaman damgası: aynı ruleset her zaman aynı arşivi üretir
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _slug(text: str) -> str:
+    return _SLUG_RE.sub("-", text.lower().replace("&", " and ")).strip("-") or "section"
+
+
+def _clean_title(heading_text: str) -> str:
+    """'1. **Agent Role Definition**' -> 'Agent Role Definition'"""
+    return _NUMBER_RE.sub("", heading_text.replace("**", "")).strip()
+
+
+def _split_headings(text: str, level: int) -> Tuple[str, List[Tuple[str, str]]]:
+    """Metni verilen seviyedeki başlıklardan böl: (ilk başlıktan önceki metin, [(başlık, içerik)])"""
+    intro: List[str] = []
+    parts: List[Tuple[str, List[str]]] = []
+    in_code = False
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_code = not in_code
+        elif not in_code:
+            match = _HEADING_RE.match(line)
+            if match and len(match.group(1)) == level:
+                parts.append((match.group(2), []))
+                continue
+        (parts[-1][1] if parts else intro).append(line)
+    return "".join(intro).strip(), [(heading, "".join(lines).strip()) for heading, lines in parts]
+
+
+@dataclass
+class DocumentSection:
+    """Bölüm ağacındaki bir düğüm: başlık, başlığın altındaki metin ve alt bölümler"""
+    title: str
+    level: int
+    body: str
+    subsections: List["DocumentSection"] = field(default_factory=list)
+
+    @property
+    def slug(self) -> str:
+        return _slug(self.title)
+
+    def markdown(self, level: Optional[int] = None) -> str:
+        """Bölümü (alt bölümleriyle) verilen seviyeden başlayan başlıklarla yaz"""
+        level = level or self.level
+        parts = [f"{'#' * level} {self.title}\n"]
+        if self.body:
+            parts.append(f"\n{self.body}\n")
+        for subsection in self.subsections:
+            parts.append("\n" + subsection.markdown(min(6, level + 1)))
+        return "".join(parts)
+
+    def to_dict(self, content: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"title": self.title, "slug": self.slug, "level": self.level}
+        if content:
+            data["content"] = self.body
+        if self.subsections:
+            data["subsections"] = [subsection.to_dict(content) for subsection in self.subsections]
+        return data
+
+
+def _build_sections(body: str, level: int) -> Tuple[str, List[DocumentSection]]:
+    """Gövdeyi bir alt seviyedeki başlıklara göre özyinelemeli ağaca çevir"""
+    if level > 6:
+        return body.strip(), []
+    intro, parts = _split_headings(body, level)
+    if not parts:
+        # Bu seviyede başlık yok: daha derin seviyeleri dene ("##" sonrası doğrudan "####" gibi)
+        return _build_sections(body, level + 1)
+    sections = []
+    for heading, content in parts:
+        text, children = _build_sections(content, level + 1)
+        sections.append(DocumentSection(_clean_title(heading), level, text, children))
+    return intro, sections
+
+
+@dataclass
+class RulesetDocument:
+    """Bir kez ayrıştırılıp bütün formatlara kaynak olan ruleset bölüm ağacı"""
+    title: str
+    intro: str
+    sections: List[DocumentSection]
+    markdown: str
+    project_info: Dict[str, Any]
+
+    @classmethod
+    def from_parsed(cls, parsed: ParsedRuleset, project_info: Dict[str, Any]) -> "RulesetDocument":
+        title = f"{project_info.get('project_type', 'Project')} Ruleset"
+        intro, headings = _split_headings(parsed.preamble, 1)
+        if headings:
+            # "# Başlık" satırı belge başlığı, altındaki metin giriş
+            title = _clean_title(headings[0][0]) or title
+            intro = "\n\n".join(text for text in (intro, headings[0][1]) if text)
+
+        sections = []
+        for section in parsed.sections:
+            heading_line, _, body = section.content.partition("\n")
+            match = _HEADING_RE.match(heading_line)
+            level = len(match.group(1)) if match else 2
+            text, children = _build_sections(body, level + 1)
+            sections.append(DocumentSection(section.title, level, text, children))
+        return cls(title, intro, sections, parsed.render(), project_info)
+
+    def body_markdown(self, level: int = 2) -> str:
+        """Bütün bölümler, numarasız ve aynı seviyeden başlıklarla"""
+        return "\n".join(section.markdown(level) for section in self.sections)
+
+    def to_dict(self, content: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"title": self.title}
+        if content:
+            data["intro"] = self.intro
+        data["sections"] = [section.to_dict(content) for section in self.sections]
+        return data
+
+
+@dataclass
+class ExportFile:
+    """Dışa aktarılan tek dosya"""
+    path: str
+    content: str
+    media_type: str = "text/markdown"  # charset'i Starlette ekler
+
+
+def _stack_summary(document: RulesetDocument) -> str:
+    info = document.project_info
+    return f"{info.get('project_type', 'project')} ({info.get('project_category', 'unknown')})"
+
+
+def _markdown(document: RulesetDocument) -> List[ExportFile]:
+    return [ExportFile("ruleset.md", document.markdown)]
+
+
+def _cursor(document: RulesetDocument) -> List[ExportFile]:
+    """.cursor/rules altında bölüm başına bir .mdc kuralı"""
+    sections = document.sections or [DocumentSection(document.title, 1, document.markdown)]
+    files = []
+    for index, section in enumerate(sections, start=1):
+        frontmatter = (
+            "---\n"
+            f"description: {section.title} - {_stack_summary(document)}\n"
+            "globs:\n"
+            "alwaysApply: true\n"
+            "---\n\n"
+        )
+        files.append(ExportFile(f".cursor/rules/{index:02d}-{section.slug}.mdc", frontmatter + section.markdown(1)))
+    return files
+
+
+def _copilot(document: RulesetDocument) -> List[ExportFile]:
+    """GitHub Copilot depo geneli talimat dosyası"""
+    intro = f"{document.intro}\n\n" if document.intro else ""
+    content = f"# {document.title}\n\n{intro}{document.body_markdown(2)}"
+    return [ExportFile(".github/copilot-instructions.md", content)]
+
+
+def _claude(document: RulesetDocument) -> List[ExportFile]:
+    """Depo kökündeki CLAUDE.md ajan talimatları"""
+    content = (
+        "# CLAUDE.md\n\n"
+        f"This file provides guidance to AI coding agents working on this {_stack_summary(document)} codebase.\n"
+        "Follow these rules when reading, writing, or reviewing code in this repository.\n\n"
+        f"{document.body_markdown(2)}"
+    )
+    return [ExportFile("CLAUDE.md", content)]
+
+
+def _json(document: RulesetDocument) -> List[ExportFile]:
+    content = json.dumps(
+        {"project_info": document.project_info, **document.to_dict()}, ensure_ascii=False, indent=2
+    )
+    return [ExportFile("ruleset.json", content + "\n", "application/json")]
+
+
+# Format adı -> dosya üreticisi
+EXPORT_FORMATS: Dict[str, Callable[[RulesetDocument], List[ExportFile]]] = {
+    "markdown": _markdown,
+    "cursor": _cursor,
+    "copilot": _copilot,
+    "claude": _claude,
+    "json": _json,
+}
+
+
+def register_export_format(name: str, renderer: Callable[[RulesetDocument], List[ExportFile]]):
+    """Yeni bir dışa aktarma formatı kaydet"""
+    EXPORT_FORMATS[name] = renderer
+
+
+def render_exports(document: RulesetDocument, formats: Optional[List[str]] = None) -> List[ExportFile]:
+    """İstenen (varsayılan: bütün) formatların dosyaları; provider çağrısı yapılmaz"""
+    files = []
+    for name in formats or EXPORT_FORMATS:
+        renderer = EXPORT_FORMATS.get(name)
+        if renderer is None:
+            raise ValueError(f"Desteklenmeyen dışa aktarma formatı: {name}")
+        files.extend(renderer(document))
+    return files
+
+
+def zip_exports(files: List[ExportFile]) -> bytes:
+    """Dosyaları tek bir zip arşivinde topla"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for export in files:
+            info = zipfile.ZipInfo(export.path, date_time=_ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            archive.writestr(info, export.content.encode("utf-8"))
+    return buffer.getvalue()
@@ -0,0 +1,158 @@
+"""
+Gerçek API çağrısı yapmayan, deterministik sahte provider (yük testi ve yerel geliştirme için)
+"""
+import asyncio
+import math
+import random
+import re
+from typing import AsyncIterator, Dict, Any, List, Optional
+from app.services.ai_provider import AIProvider, ProviderError, max_output_tokens, report_completion
+from app.core.config import settings
+
+# Tam prompt'taki "1. **Başlık** - açıklama" ve bölüm prompt'undaki "- ## 1. Başlık  (açıklama)" satırları
+_FULL_SECTION_RE = re.compile(r"^(\d+)\. \*\*(.+?)\*\* - ", re.MULTILINE)
+_PARTIAL_SECTION_RE = re.compile(r"^- (#{1,6} .+?)  \(", re.MULTILINE)
+
+_FILLER_WORDS = (
+    "use", "consistent", "naming", "for", "modules", "and", "keep", "functions", "small", "prefer",
+    "explicit", "types", "validate", "inputs", "at", "boundaries", "write", "tests", "first", "document",
+)
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+class FakeProvider(AIProvider):
+    """Gecikme dağılımı, akış hızı ve hata oranı ayarlanabilen sahte provider"""
+
+    def __init__(
+        self,
+        latency_distribution: str = "fixed",
+        latency_mean: float = 0.5,
+        latency_stddev: float = 0.1,
+        tokens_per_second: float = 200.0,
+        output_tokens: int = 800,
+        chunk_tokens: int = 16,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Desteklenmeyen gecikme dağılımı: {latency_distribution}")
+        self.latency_distribution = latency_distribution
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    def _first_token_latency(self) -> float:
+        """İlk token'a kadar geçen süre, seçili dağılımdan"""
+        mean, stddev = self.latency_mean, self.latency_stddev
+        if self.latency_distribution == "fixed":
+            value = mean
+        elif self.latency_distribution == "uniform":
+            value = self._random.uniform(mean - stddev, mean + stddev)
+        elif self.latency_distribution == "normal":
+            value = self._random.gauss(mean, stddev)
+        elif self.latency_distribution == "lognormal":
+            # Ortalaması ve standart sapması verilen log-normal (uzun kuyruk)
+            if mean <= 0:
+                return 0.0
+            sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+            value = self._random.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        else:
+            value = self._random.expovariate(1 / mean) if mean > 0 else 0.0
+        return max(0.0, value)
+
+    def _maybe_fail(self):
+        if self.error_rate > 0 and self._random.random() < self.error_rate:
+            self.errors += 1
+            retry_after = 1.0 if self.error_status == 429 else None
+            raise ProviderError(
+                f"Fake provider injected error ({self.error_status})",
+                status_code=self.error_status,
+                retry_after=retry_after
+            )
+
+    @staticmethod
+    def _limit(parts: List[str]) -> List[str]:
+        """Çıktı bütçesi verilmişse metni o kadar token'da kes (gerçek API'ler gibi)"""
+        max_tokens = max_output_tokens()
+        truncated = max_tokens is not None and len(parts) > max_tokens
+        if truncated:
+            parts = parts[:max_tokens]
+        report_completion(truncated, len(parts))
+        return parts
+
+    def _render(self, prompt: str) -> List[str]:
+        """Prompt'taki bölüm başlıklarından deterministik markdown, token (kelime) listesi olarak"""
+        headings = [f"## {index}. {title}" for index, title in _FULL_SECTION_RE.findall(prompt)]
+        if not headings:
+            headings = _PARTIAL_SECTION_RE.findall(prompt)
+        if not headings:
+            headings = ["## Ruleset"]
+
+        per_section = max(1, self.output_tokens // len(headings))
+        # Aynı prompt her zaman aynı metni üretir
+        seed = sum(map(ord, prompt[-64:])) + len(prompt)
+        parts = [] if len(headings) < 3 else ["# Project Ruleset\n\n"]
+        for position, heading in enumerate(headings):
+            words = [_FILLER_WORDS[(seed + position * 7 + i) % len(_FILLER_WORDS)] for i in range(per_section)]
+            parts.append(f"{heading}\n\n")
+            parts.extend(f"{word} " for word in words)
+            parts.append("\n\n")
+        return parts
+
+    async def generate_content(self, prompt: str) -> str:
+        self.calls += 1
+        parts = self._limit(self._render(prompt))
+        await asyncio.sleep(self._first_token_latency())
+        self._maybe_fail()
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(len(parts) / self.tokens_per_second)
+        return "".join(parts)
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        self.calls += 1
+        parts = self._limit(self._render(prompt))
+        await asyncio.sleep(self._first_token_latency())
+        self._maybe_fail()
+        for start in range(0, len(parts), self.chunk_tokens):
+            chunk = parts[start:start + self.chunk_tokens]
+            if self.tokens_per_second > 0:
+                await asyncio.sleep(len(chunk) / self.tokens_per_second)
+            yield "".join(chunk)
+
+    async def check_health(self) -> Dict[str, Any]:
+        return {
+            "available": True,
+            "model": self.model_name,
+            "status": "healthy"
+        }
+
+    @property
+    def provider_name(self) -> str:
+        return "fake"
+
+    @property
+    def model_name(self) -> str:
+        return "fake-1"
+
+    @classmethod
+    def from_settings(cls) -> "FakeProvider":
+        return cls(
+            latency_distribution=settings.FAKE_LATENCY_DISTRIBUTION,
+            latency_mean=settings.FAKE_LATENCY_MEAN_SECONDS,
+            latency_stddev=settings.FAKE_LATENCY_STDDEV_SECONDS,
+            tokens_per_second=settings.FAKE_TOKENS_PER_SECOND,
+            output_tokens=settings.FAKE_OUTPUT_TOKENS,
+            chunk_tokens=settings.FAKE_CHUNK_TOKENS,
+            error_rate=settings.FAKE_ERROR_RATE,
+            error_status=settings.FAKE_ERROR_STATUS,
+            seed=settings.FAKE_SEED
+        )
@@ -2,31 +2,85 @@
 Gemini AI provider implementation
 """
 import google.generativeai as genai
-from typing import Dict, Any
-from app.services.ai_provider import AIProvider
+from typing import Dict, Any, AsyncIterator, Optional
+from app.services.ai_provider import AIProvider, ProviderError, run_in_threadpool, max_output_tokens, report_completion
 from app.core.config import settings
 
 class GeminiProvider(AIProvider):
     """Gemini AI provider"""
-    
+
     def __init__(self):
         if settings.GEMINI_API_KEY:
             genai.configure(api_key=settings.GEMINI_API_KEY)
             self.model = genai.GenerativeModel(settings.GEMINI_MODEL)
         else:
             self.model = None
-    
+
+    @staticmethod
+    def _generation_config() -> Optional[Dict[str, Any]]:
+        """Çıktı bütçesi verilmişse max_output_tokens (yoksa modelin kendi limiti)"""
+        max_tokens = max_output_tokens()
+        return {"max_output_tokens": max_tokens} if max_tokens else None
+
+    @staticmethod
+    def _report(response):
+        """Son adayın bitiş nedeni ve kullanım bilgisini bildir"""
+        candidates = getattr(response, "candidates", None) or []
+        if not candidates:
+            return
+        reason = getattr(candidates[0].finish_reason, "name", str(candidates[0].finish_reason))
+        usage = getattr(response, "usage_metadata", None)
+        report_completion(reason == "MAX_TOKENS", getattr(usage, "candidates_token_count", None) or None)
+
+    async def _generate(self, prompt: str):
+        """SDK'nın async yolunu kullan, yoksa thread havuzuna düş"""
+        request_options = {"timeout": settings.PROVIDER_TIMEOUT_SECONDS}
+        generation_config = self._generation_config()
+        if hasattr(self.model, "generate_content_async"):
+            return await self.model.generate_content_async(
+                prompt, generation_config=generation_config, request_options=request_options
+            )
+        return await run_in_threadpool(
+            self.model.generate_content, prompt, generation_config=generation_config, request_options=request_options
+        )
+
     async def generate_content(self, prompt: str) -> str:
         """Gemini ile içerik üret"""
         if not self.model:
             raise Exception("Gemini API key bulunamadı")
-        
+
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt)
+            self._report(response)
             return response.text
         except Exception as e:
-            raise Exception(f"Gemini API hatası: {str(e)}")
-    
+            raise ProviderError(f"Gemini API hatası: {str(e)}", status_code=getattr(e, "code", None))
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """Gemini ile içeriği parça parça üret"""
+        if not self.model:
+            raise Exception("Gemini API key bulunamadı")
+
+        if not hasattr(self.model, "generate_content_async"):
+            yield await self.generate_content(prompt)
+            return
+
+        try:
+            response = await self.model.generate_content_async(
+                prompt,
+                stream=True,
+                generation_config=self._generation_config(),
+                request_options={"timeout": settings.PROVIDER_TIMEOUT_SECONDS}
+            )
+            async for chunk in response:
+                self._report(chunk)
+                # Güvenlik filtresi vb. durumlarda parça metin içermeyebilir
+                text = chunk.text if chunk.parts else ""
+                if text:
+                    yield text
+        except Exception as e:
+            raise ProviderError(f"Gemini API hatası: {str(e)}", status_code=getattr(e, "code", None))
+
     async def check_health(self) -> Dict[str, Any]:
         """Gemini sağlık kontrolü"""
         try:
@@ -35,10 +89,10 @@ class GeminiProvider(AIProvider):
                     "available": False,
                     "error": "API key eksik"
                 }
-            
-            # Basit bir test prompt'u gönder
-            test_response = self.model.generate_content("Test")
-            
+
+            # Üretim yapmadan sadece model metadata'sını sorgula
+            await run_in_threadpool(genai.get_model, f"models/{settings.GEMINI_MODEL}")
+
             return {
                 "available": True,
                 "model": settings.GEMINI_MODEL,
@@ -49,7 +103,11 @@ class GeminiProvider(AIProvider):
                 "available": False,
                 "error": str(e)
             }
-    
+
     @property
     def provider_name(self) -> str:
         return "gemini"
+
+    @property
+    def model_name(self) -> str:
+        return settings.GEMINI_MODEL
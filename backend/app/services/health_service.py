@@ -0,0 +1,87 @@
+"""
+Katmanlı sağlık kontrolü (liveness / readiness)
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any
+from app.services.ai_service import ai_service
+from app.core.config import settings
+
+
+class HealthService:
+    """Provider durumunu önbellekte tutan sağlık servisi"""
+
+    def __init__(self, ttl_seconds: float, refresh_interval: float, timeout: float):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._checked_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def liveness() -> Dict[str, Any]:
+        """Süreç ayakta mı (ağ çağrısı yok)"""
+        return {"status": "alive", "timestamp": datetime.now().isoformat()}
+
+    @property
+    def is_stale(self) -> bool:
+        return self._snapshot is None or time.monotonic() - self._checked_at > self.ttl_seconds
+
+    def readiness(self) -> Optional[Dict[str, Any]]:
+        """Önbellekteki readiness sonucu; bayatsa arka planda tazele"""
+        if self.is_stale:
+            self.schedule_refresh()
+        return self._snapshot
+
+    def schedule_refresh(self) -> asyncio.Task:
+        """Aynı anda tek bir kontrol çalışacak şekilde tazeleme başlat"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self._refresh_task
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Provider'a hafif bir readiness çağrısı yap"""
+        try:
+            result = await asyncio.wait_for(ai_service.check_health(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            result = {"available": False, "error": f"Health check {self.timeout}s içinde yanıt vermedi"}
+        except Exception as e:
+            result = {"available": False, "error": str(e)}
+
+        result["checked_at"] = datetime.now().isoformat()
+        self._snapshot = result
+        self._checked_at = time.monotonic()
+        return result
+
+    async def _refresh_loop(self):
+        while True:
+            await self.schedule_refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        """Arka plan tazeleyicisini başlat"""
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """Arka plan tazeleyicisini durdur"""
+        for task in (self._background_task, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._background_task = None
+        self._refresh_task = None
+
+
+# Global health service instance
+health_service = HealthService(
+    ttl_seconds=settings.HEALTH_CACHE_TTL_SECONDS,
+    refresh_interval=settings.HEALTH_REFRESH_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS
+)
@@ -0,0 +1,31 @@
+"""
+Provider'lar arasında paylaşılan, bağlantı havuzlu HTTP client'ları
+"""
+from typing import Dict
+import httpx
+from app.core.config import settings
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Base URL başına tek bir keep-alive havuzlu AsyncClient döndür"""
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(settings.PROVIDER_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        _clients[base_url] = client
+    return client
+
+
+async def close_http_clients():
+    """Uygulama kapanırken tüm client'ları kapat"""
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
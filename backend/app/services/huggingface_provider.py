@@ -0,0 +1,171 @@
+"""
+Hugging Face text-generation-inference (TGI) uyumlu, self-hosted endpoint provider'ı
+"""
+import asyncio
+import json
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import httpx
+from app.services.ai_provider import AIProvider, ProviderError, max_output_tokens, report_completion
+from app.services.http_client import get_http_client
+from app.services.micro_batcher import MicroBatcher
+from app.core.config import settings
+
+# Tek prompt'un sonucu: (metin, finish_reason, üretilen token sayısı)
+Completion = Tuple[str, Optional[str], Optional[int]]
+
+
+class HuggingFaceProvider(AIProvider):
+    """TGI provider; eşzamanlı generate çağrılarını micro-batch olarak gönderir"""
+
+    def __init__(self):
+        self.base_url = settings.HUGGINGFACE_BASE_URL.rstrip("/")
+        self.model = settings.HUGGINGFACE_MODEL
+        self.headers = {"Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}"} if settings.HUGGINGFACE_API_KEY else {}
+        self.batcher = MicroBatcher(
+            self._generate_batch,
+            max_batch_size=settings.HUGGINGFACE_BATCH_MAX_SIZE,
+            max_wait=settings.HUGGINGFACE_BATCH_MAX_WAIT_MS / 1000
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return get_http_client(self.base_url)
+
+    @staticmethod
+    def _parameters(max_new_tokens: int = None) -> Dict[str, Any]:
+        return {
+            "max_new_tokens": max_new_tokens or settings.HUGGINGFACE_MAX_NEW_TOKENS,
+            "return_full_text": False,
+            # finish_reason ve generated_tokens: kesilme tespiti ve token bütçesi için
+            "details": True
+        }
+
+    @staticmethod
+    def _error(e: Exception) -> ProviderError:
+        if isinstance(e, ProviderError):
+            return e
+        status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+        retry_after = None
+        if isinstance(e, httpx.HTTPStatusError) and e.response.headers.get("retry-after"):
+            try:
+                retry_after = float(e.response.headers["retry-after"])
+            except ValueError:
+                pass
+        return ProviderError(f"Hugging Face API hatası: {str(e)}", status_code=status_code, retry_after=retry_after)
+
+    @staticmethod
+    def _completion(item: Any) -> Completion:
+        """{"generated_text": ..., "details": ...} veya pipeline'ın döndürdüğü [{...}]"""
+        if isinstance(item, list):
+            item = item[0] if item else {}
+        if not isinstance(item, dict) or "generated_text" not in item:
+            raise ProviderError(f"Beklenmeyen Hugging Face yanıtı: {str(item)[:200]}")
+        details = item.get("details") or {}
+        return item["generated_text"], details.get("finish_reason"), details.get("generated_tokens")
+
+    async def _generate_group(self, prompts: List[str], max_new_tokens: int) -> List[Completion]:
+        """Aynı çıktı limitli prompt'ları tek istekle üret"""
+        parameters = self._parameters(max_new_tokens)
+        try:
+            if len(prompts) == 1:
+                response = await self.client.post(
+                    "/generate",
+                    json={"inputs": prompts[0], "parameters": parameters},
+                    headers=self.headers
+                )
+                response.raise_for_status()
+                return [self._completion(response.json())]
+
+            response = await self.client.post(
+                settings.HUGGINGFACE_BATCH_PATH,
+                json={"inputs": prompts, "parameters": parameters},
+                headers=self.headers
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise self._error(e)
+
+        if not isinstance(data, list) or len(data) != len(prompts):
+            raise ProviderError(f"Beklenmeyen Hugging Face toplu yanıtı: {str(data)[:200]}")
+        return [self._completion(item) for item in data]
+
+    async def _generate_batch(self, items: List[Tuple[str, int]]) -> List[Completion]:
+        """(prompt, max_new_tokens) öğelerini üret
+
+        Toplu istekte parametreler ortak olduğu için öğeler çıktı limitine göre gruplanır;
+        bütçeler (kategori, proje tipi) başına öğrenildiği için aynı türden istekler birlikte gider.
+        """
+        groups: Dict[int, List[int]] = {}
+        for index, (_, max_new_tokens) in enumerate(items):
+            groups.setdefault(max_new_tokens, []).append(index)
+        results: List[Optional[Completion]] = [None] * len(items)
+        completions = await asyncio.gather(*(
+            self._generate_group([items[index][0] for index in indexes], max_new_tokens)
+            for max_new_tokens, indexes in groups.items()
+        ))
+        for indexes, group in zip(groups.values(), completions):
+            for index, completion in zip(indexes, group):
+                results[index] = completion
+        return results
+
+    async def generate_content(self, prompt: str) -> str:
+        """Hugging Face ile içerik üret (eşzamanlı çağrılarla birlikte toplu gönderilir)"""
+        # Bütçe ve sonuç bildirimi çağıranın bağlamında: batcher görevine context taşınmaz
+        max_new_tokens = max_output_tokens(settings.HUGGINGFACE_MAX_NEW_TOKENS)
+        text, finish_reason, generated_tokens = await self.batcher.submit((prompt, max_new_tokens))
+        if finish_reason:
+            report_completion(finish_reason == "length", generated_tokens)
+        return text
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """TGI /generate_stream (SSE) ile token token üret; akışlar toplanmaz"""
+        try:
+            async with self.client.stream(
+                "POST",
+                "/generate_stream",
+                json={"inputs": prompt, "parameters": self._parameters(max_output_tokens())},
+                headers=self.headers
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = json.loads(line[len("data:"):])
+                    if data.get("error"):
+                        raise ProviderError(f"Hugging Face API hatası: {data['error']}")
+                    details = data.get("details") or {}
+                    if details.get("finish_reason"):
+                        report_completion(details["finish_reason"] == "length", details.get("generated_tokens"))
+                    token = data.get("token") or {}
+                    if token.get("text") and not token.get("special"):
+                        yield token["text"]
+        except Exception as e:
+            raise self._error(e)
+
+    async def check_health(self) -> Dict[str, Any]:
+        """TGI sağlık kontrolü (/health ve /info)"""
+        try:
+            response = await self.client.get("/health", headers=self.headers)
+            response.raise_for_status()
+            info = await self.client.get("/info", headers=self.headers)
+            model = info.json().get("model_id", self.model) if info.status_code == 200 else self.model
+            return {
+                "available": True,
+                "model": model,
+                "status": "healthy",
+                "batching": self.batcher.stats()
+            }
+        except Exception as e:
+            return {
+                "available": False,
+                "error": str(e)
+            }
+
+    @property
+    def provider_name(self) -> str:
+        return "huggingface"
+
+    @property
+    def model_name(self) -> str:
+        return self.model
@@ -0,0 +1,424 @@
+"""
+Uzun üretimler için asenkron iş kuyruğu
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from app.models.schemas import ProjectInfo, CacheMode
+from app.services.ruleset_service import ruleset_service, GenerationResult
+from app.services.scheduler import Priority, priority_scope
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobQueueUnavailable(Exception):
+    """İş kuyruğu bu ortamda kullanılamaz"""
+
+
+class JobStore(ABC):
+    """İş kayıtları için depolama arayüzü"""
+
+    @abstractmethod
+    async def create(self, job: Dict[str, Any]):
+        """Yeni iş kaydı oluştur"""
+        pass
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """İş kaydını getir"""
+        pass
+
+    @abstractmethod
+    async def update(self, job_id: str, **fields):
+        """İş kaydının alanlarını güncelle"""
+        pass
+
+    @abstractmethod
+    async def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        """Kuyruktaki işi atomik olarak sahiplen; iş başka bir worker'daysa False"""
+        pass
+
+    async def renew(self, job_id: str, owner: str, lease_seconds: float):
+        """Çalışan işin kira süresini uzat"""
+        pass
+
+    async def recoverable(self) -> List[str]:
+        """Yeniden başlatmadan sonra kuyruğa alınacak işler (sahibi yaşamayan çalışan işler dahil)"""
+        return []
+
+
+class InMemoryJobStore(JobStore):
+    """Süreç belleğinde tutulan iş kayıtları"""
+
+    def __init__(self, retention_seconds: int):
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in (JOB_COMPLETED, JOB_FAILED) and job["finished_ts"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def create(self, job: Dict[str, Any]):
+        self._prune()
+        self._jobs[job["id"]] = job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def update(self, job_id: str, **fields):
+        if job_id in self._jobs:
+            self._jobs[job_id].update(fields)
+
+    async def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None or job["status"] != JOB_QUEUED:
+            return False
+        job.update(status=JOB_RUNNING, started_at=datetime.now().isoformat(), owner=owner)
+        return True
+
+
+class SQLiteJobStore(JobStore):
+    """Yeniden başlatmalardan sonra da kalıcı, birden fazla sürecin paylaşabildiği iş kayıtları
+
+    Worker'lar işi koşullu UPDATE ile sahiplenir ve çalışırken kirasını (lease_expires) uzatır;
+    kirası dolmuş çalışan iş, sahibi ölmüş sayılıp kuyruğa geri alınır.
+    """
+
+    _COLUMNS = (
+        "id", "status", "project_info", "cache_mode", "created_at", "started_at",
+        "finished_at", "finished_ts", "partial_markdown", "result", "error", "owner", "lease_expires"
+    )
+    _JSON_COLUMNS = ("project_info", "result")
+    # Bu sütunlardan önce oluşturulmuş tablolara eklenir
+    _ADDED_COLUMNS = {"owner": "TEXT", "lease_expires": "REAL"}
+
+    def __init__(self, path: str, retention_seconds: int):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Bağlantı ilk kullanımda açılır: import sırasında disk erişimi olmasın
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    project_info TEXT NOT NULL,
+                    cache_mode TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    finished_ts REAL,
+                    partial_markdown TEXT,
+                    result TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    lease_expires REAL
+                )
+                """
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in self._ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _encode(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: json.dumps(value, ensure_ascii=False) if key in self._JSON_COLUMNS and value is not None else value
+            for key, value in fields.items()
+        }
+
+    def _decode(self, row) -> Dict[str, Any]:
+        job = dict(zip(self._COLUMNS, row))
+        for key in self._JSON_COLUMNS:
+            if job[key] is not None:
+                job[key] = json.loads(job[key])
+        return job
+
+    def _execute(self, sql: str, params=()) -> list:
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+        return rows
+
+    def _execute_count(self, sql: str, params=()) -> int:
+        """Değişen satır sayısını döndüren yazma"""
+        with self._lock:
+            conn = self._connection()
+            count = conn.execute(sql, params).rowcount
+            conn.commit()
+        return count
+
+    async def create(self, job: Dict[str, Any]):
+        job = self._encode(job)
+        columns = ", ".join(self._COLUMNS)
+        placeholders = ", ".join("?" for _ in self._COLUMNS)
+        await asyncio.to_thread(
+            self._execute,
+            f"INSERT INTO jobs ({columns}) VALUES ({placeholders})",
+            tuple(job.get(column) for column in self._COLUMNS)
+        )
+        await asyncio.to_thread(
+            self._execute,
+            "DELETE FROM jobs WHERE finished_ts IS NOT NULL AND finished_ts < ?",
+            (time.time() - self.retention_seconds,)
+        )
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = await asyncio.to_thread(
+            self._execute, f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+        )
+        return self._decode(rows[0]) if rows else None
+
+    async def update(self, job_id: str, **fields):
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        await asyncio.to_thread(
+            self._execute, f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id)
+        )
+
+    async def claim(self, job_id: str, owner: str, lease_seconds: float) -> bool:
+        count = await asyncio.to_thread(
+            self._execute_count,
+            "UPDATE jobs SET status = ?, started_at = ?, owner = ?, lease_expires = ? WHERE id = ? AND status = ?",
+            (JOB_RUNNING, datetime.now().isoformat(), owner, time.time() + lease_seconds, job_id, JOB_QUEUED)
+        )
+        return count == 1
+
+    async def renew(self, job_id: str, owner: str, lease_seconds: float):
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND owner = ? AND status = ?",
+            (time.time() + lease_seconds, job_id, owner, JOB_RUNNING)
+        )
+
+    async def recoverable(self) -> List[str]:
+        # Kirası dolmuş (veya kirasız eski) çalışan işler sahipsizdir; yaşayan süreçlerin işlerine dokunulmaz
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, owner = NULL, lease_expires = NULL, partial_markdown = NULL "
+            "WHERE status = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+            (JOB_QUEUED, JOB_RUNNING, time.time())
+        )
+        rows = await asyncio.to_thread(
+            self._execute, "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (JOB_QUEUED,)
+        )
+        return [job_id for (job_id,) in rows]
+
+
+class JobService:
+    """İşleri kuyruğa alan ve worker havuzuyla işleyen servis"""
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int,
+        max_queue: int,
+        progress_interval: float,
+        lease_seconds: float,
+        unavailable_reason: Optional[str] = None
+    ):
+        self.store = store
+        self.unavailable_reason = unavailable_reason
+        self.workers = workers
+        self.progress_interval = progress_interval
+        self.lease_seconds = lease_seconds
+        # Bu sürecin worker'larının kimliği: ortak depoda işin kimde çalıştığı
+        self.owner = uuid.uuid4().hex
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._worker_tasks: List[asyncio.Task] = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(self, project_info: ProjectInfo, cache_mode: CacheMode = CacheMode.DEFAULT) -> Dict[str, Any]:
+        """İşi kaydet ve kuyruğa al (üretimi beklemez)"""
+        if self.unavailable_reason:
+            raise JobQueueUnavailable(self.unavailable_reason)
+        if self._queue.full():
+            raise asyncio.QueueFull()
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "status": JOB_QUEUED,
+            "project_info": project_info.model_dump(),
+            "cache_mode": cache_mode.value,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "finished_ts": None,
+            "partial_markdown": None,
+            "result": None,
+            "error": None,
+            "owner": None,
+            "lease_expires": None,
+        }
+        await self.store.create(job)
+        self._queue.put_nowait(job["id"])
+        self.submitted += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if self.unavailable_reason:
+            raise JobQueueUnavailable(self.unavailable_reason)
+        return await self.store.get(job_id)
+
+    async def _keep_lease(self, job_id: str):
+        """İş sürdükçe kirayı uzat; kira dolarsa başka süreç işi sahipsiz sayar"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.store.renew(job_id, self.owner, self.lease_seconds)
+            except Exception:
+                logger.warning("Job kirası uzatılamadı: %s", job_id, exc_info=True)
+
+    async def _process(self, job_id: str):
+        # Aynı iş başka bir süreçte de kuyruğa alınmış olabilir: sadece sahiplenen çalıştırır
+        if not await self.store.claim(job_id, self.owner, self.lease_seconds):
+            return
+        job = await self.store.get(job_id)
+        if job is None:
+            return
+
+        lease = asyncio.create_task(self._keep_lease(job_id))
+        try:
+            await self._run(job_id, job)
+        finally:
+            lease.cancel()
+
+    async def _run(self, job_id: str, job: Dict[str, Any]):
+        project_info = ProjectInfo(**job["project_info"])
+        chunks: List[str] = []
+        last_flush = time.monotonic()
+
+        try:
+            async for item in ruleset_service.stream(project_info, cache_mode=CacheMode(job["cache_mode"])):
+                if isinstance(item, GenerationResult):
+                    response = ruleset_service.build_response(project_info, item)
+                    await self.store.update(
+                        job_id,
+                        status=JOB_COMPLETED,
+                        finished_at=datetime.now().isoformat(),
+                        finished_ts=time.time(),
+                        partial_markdown=None,
+                        result={"cache": item.cache_status, **response.model_dump()}
+                    )
+                    self.completed += 1
+                    return
+
+                chunks.append(item)
+                # Kısmi çıktıyı belirli aralıklarla kaydet
+                if time.monotonic() - last_flush >= self.progress_interval:
+                    await self.store.update(job_id, partial_markdown="".join(chunks))
+                    last_flush = time.monotonic()
+        except Exception as e:
+            await self.store.update(
+                job_id,
+                status=JOB_FAILED,
+                finished_at=datetime.now().isoformat(),
+                finished_ts=time.time(),
+                error=f"Ruleset generation failed: {str(e)}"
+            )
+            self.failed += 1
+
+    async def _worker(self):
+        # İş kuyruğundaki üretimler upstream'de etkileşimli isteklerin arkasında sıraya girer
+        with priority_scope(Priority.BACKGROUND):
+            while True:
+                job_id = await self._queue.get()
+                try:
+                    await self._process(job_id)
+                except Exception:
+                    logger.exception("Job işlenemedi: %s", job_id)
+                finally:
+                    self._queue.task_done()
+
+    async def start(self):
+        """Worker'ları başlat, bekleyen ve sahipsiz kalmış işleri kuyruğa al"""
+        if self.unavailable_reason:
+            logger.error("İş kuyruğu devre dışı: %s", self.unavailable_reason)
+            return
+        if self._worker_tasks:
+            return
+        for job_id in await self.store.recoverable():
+            if self._queue.full():
+                break
+            self._queue.put_nowait(job_id)
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Worker'ları durdur"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": not self.unavailable_reason,
+            "workers": len(self._worker_tasks),
+            "queue_depth": self._queue.qsize(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+def _create_store() -> JobStore:
+    """Ayarlara göre iş deposunu seç"""
+    if settings.JOB_STORE == "sqlite":
+        return SQLiteJobStore(settings.JOB_SQLITE_PATH, settings.JOB_RETENTION_SECONDS)
+    elif settings.JOB_STORE == "memory":
+        return InMemoryJobStore(settings.JOB_RETENTION_SECONDS)
+    else:
+        raise ValueError(f"Desteklenmeyen job store: {settings.JOB_STORE}")
+
+
+def _unavailable_reason() -> Optional[str]:
+    """Serverless'ta süreç yanıttan sonra dondurulur: süreç içi worker'lar hangi depoyla olursa olsun durur"""
+    if settings.SERVERLESS:
+        return (
+            "İş kuyruğu serverless ortamda desteklenmiyor (worker'lar istek bitince dondurulur); "
+            "/generate-ruleset/stream kullanın"
+        )
+    return None
+
+
+# Global job service instance
+job_service = JobService(
+    store=_create_store(),
+    workers=settings.JOB_WORKERS,
+    max_queue=settings.JOB_MAX_QUEUE,
+    progress_interval=settings.JOB_PROGRESS_INTERVAL_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    unavailable_reason=_unavailable_reason()
+)
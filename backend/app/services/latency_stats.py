@@ -0,0 +1,45 @@
+"""
+Gecikme istatistikleri için yardımcılar
+"""
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+def percentile(values: Iterable[float], q: float) -> Optional[float]:
+    """Nearest-rank yöntemiyle yüzdelik hesapla (q: 0-100)"""
+    ordered: List[float] = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyWindow:
+    """Son N ölçümü tutan kayan pencere"""
+
+    def __init__(self, size: int = 500):
+        self._samples: deque = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, seconds: float):
+        self._samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        return percentile(self._samples, q)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """Milisaniye cinsinden özet"""
+        def to_ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "p50_ms": to_ms(self.percentile(50)),
+            "p95_ms": to_ms(self.percentile(95)),
+            "p99_ms": to_ms(self.percentile(99)),
+        }
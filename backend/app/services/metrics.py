@@ -0,0 +1,224 @@
+"""
+Prometheus text formatında metrikler ve istek başına aşama zamanlaması
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Sadece artan sayaç"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labelvalues, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Okuma anında fonksiyondan alınan değer; etiketliyse fonksiyon labelvalues -> değer döndürür"""
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], Any], kind: str = "gauge",
+                 labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        if not self.labelnames:
+            return self.header() + [f"{self.name} {float(self.function())}"]
+        lines = self.header()
+        for labelvalues, value in self.function().items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {float(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Sabit bucket'lı histogram"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labelvalues -> [bucket sayıları..., +Inf sayısı, toplam]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        series = self._values.get(labelvalues)
+        if series is None:
+            series = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labelvalues, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labelvalues)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labelvalues)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Tüm metrikleri tutan ve text formatına çeviren kayıt"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, function: Callable[[], Any],
+              labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, function, labelnames=labelnames))
+
+    def callback_counter(self, name: str, documentation: str, function: Callable[[], float]) -> Gauge:
+        """Başka bir servisin tuttuğu sayacı counter olarak yayınla"""
+        return self.register(Gauge(name, documentation, function, kind="counter"))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP istek süresi", ("method", "route", "status")
+)
+STAGE_DURATION = registry.histogram(
+    "ruleset_stage_duration_seconds", "Ruleset üretim aşaması süresi",
+    ("stage", "provider", "model", "project_category")
+)
+TOKENS = registry.counter(
+    "ruleset_tokens_total", "Tahmini token sayısı (karakter/4)",
+    ("provider", "model", "project_category", "kind")
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "ruleset_upstream_requests_total", "Upstream provider çağrıları, durum koduna göre",
+    ("provider", "model", "status")
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Provider'dan bağımsız kaba token tahmini"""
+    return max(1, len(text) // 4) if text else 0
+
+
+class RequestTimings:
+    """Tek bir isteğin aşama süreleri"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.handler_started: Optional[float] = None
+        self.handler_finished: Optional[float] = None
+        self.stages: List[Tuple[str, float]] = []
+        self.labels: Dict[str, str] = {}
+
+    def add(self, name: str, seconds: float):
+        self.stages.append((name, seconds))
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        """Server-Timing başlığı değeri"""
+        entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages]
+        if total is not None:
+            entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+def set_request_labels(**labels: str):
+    """Aşama histogramları için istek etiketlerini kaydet"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.labels.update(labels)
+
+
+def record_stage(name: str, seconds: float, provider: str = "", model: str = "", project_category: str = ""):
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+        labels = timings.labels
+        provider = provider or labels.get("provider", "")
+        model = model or labels.get("model", "")
+        project_category = project_category or labels.get("project_category", "")
+    STAGE_DURATION.observe(seconds, name, provider, model, project_category)
+
+
+@contextmanager
+def stage(name: str, **labels: str):
+    """Bir aşamanın süresini ölç"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started, **labels)
@@ -0,0 +1,77 @@
+"""
+Eşzamanlı çağrıları kısa bir süre toplayıp tek toplu istek olarak gönderen micro-batcher
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.services.ai_provider import ProviderError
+
+
+class MicroBatcher:
+    """En fazla `max_batch_size` öğe veya `max_wait` saniye dolunca toplu gönder"""
+
+    def __init__(
+        self,
+        submit_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.01
+    ):
+        self.submit_batch = submit_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        self.batches = 0
+        self.items = 0
+        self.max_observed_batch = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Öğeyi sıradaki toplu isteğe ekle ve kendi sonucunu bekle"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Beklerken iptal edilen çağrıları gönderme
+        pending = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        for start in range(0, len(pending), self.max_batch_size):
+            task = asyncio.create_task(self._run(pending[start:start + self.max_batch_size]))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.max_observed_batch = max(self.max_observed_batch, len(batch))
+        try:
+            results = await self.submit_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ProviderError(f"Toplu yanıt {len(batch)} yerine {len(results)} sonuç içeriyor")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Sonuçlar girdilerle aynı sırada döner
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_observed_batch,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,120 @@
+"""
+Ollama (yerel) provider implementation
+"""
+import json
+import logging
+from typing import Dict, Any, AsyncIterator
+import httpx
+from app.services.ai_provider import AIProvider, ProviderError, max_output_tokens, report_completion
+from app.services.http_client import get_http_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class OllamaProvider(AIProvider):
+    """Ollama provider"""
+
+    def __init__(self):
+        self.base_url = settings.OLLAMA_BASE_URL.rstrip("/")
+        self.model = settings.OLLAMA_MODEL
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return get_http_client(self.base_url)
+
+    def _payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            # Model istekler arasında bellekte kalsın
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+            "options": {
+                "num_ctx": settings.OLLAMA_NUM_CTX,
+                "num_predict": max_output_tokens(settings.OLLAMA_NUM_PREDICT)
+            }
+        }
+
+    @staticmethod
+    def _error(e: Exception) -> ProviderError:
+        status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+        return ProviderError(f"Ollama API hatası: {str(e)}", status_code=status_code)
+
+    async def generate_content(self, prompt: str) -> str:
+        """Ollama ile içerik üret"""
+        try:
+            response = await self.client.post("/api/generate", json=self._payload(prompt, stream=False))
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise self._error(e)
+
+        if data.get("error"):
+            raise ProviderError(f"Ollama API hatası: {data['error']}")
+        report_completion(data.get("done_reason") == "length", data.get("eval_count"))
+        return data.get("response", "")
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """Ollama ile içeriği parça parça üret (NDJSON)"""
+        try:
+            async with self.client.stream("POST", "/api/generate", json=self._payload(prompt, stream=True)) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if data.get("error"):
+                        raise ProviderError(f"Ollama API hatası: {data['error']}")
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        report_completion(data.get("done_reason") == "length", data.get("eval_count"))
+                        break
+        except ProviderError:
+            raise
+        except Exception as e:
+            raise self._error(e)
+
+    async def warm_up(self):
+        """Modeli belleğe yükle ki ilk istek yükleme süresini ödemesin"""
+        try:
+            # Prompt'suz generate isteği sadece modeli yükler
+            response = await self.client.post(
+                "/api/generate",
+                json={"model": self.model, "keep_alive": settings.OLLAMA_KEEP_ALIVE}
+            )
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning("Ollama warm-up başarısız: %s", e)
+
+    async def check_health(self) -> Dict[str, Any]:
+        """Ollama sağlık kontrolü"""
+        try:
+            response = await self.client.get("/api/tags")
+            response.raise_for_status()
+            models = [m.get("name", "") for m in response.json().get("models", [])]
+
+            if self.model not in models and f"{self.model}:latest" not in models:
+                return {
+                    "available": False,
+                    "error": f"Model bulunamadı: {self.model} (ollama pull {self.model})"
+                }
+
+            return {
+                "available": True,
+                "model": self.model,
+                "status": "healthy"
+            }
+        except Exception as e:
+            return {
+                "available": False,
+                "error": str(e)
+            }
+
+    @property
+    def provider_name(self) -> str:
+        return "ollama"
+
+    @property
+    def model_name(self) -> str:
+        return self.model
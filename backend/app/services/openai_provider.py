@@ -2,49 +2,93 @@
 OpenAI provider implementation
 """
 import openai
-from typing import Dict, Any
-from app.services.ai_provider import AIProvider
+from typing import Dict, Any, Optional, AsyncIterator
+from app.services.ai_provider import AIProvider, ProviderError, max_output_tokens, report_completion
 from app.core.config import settings
 
+def _retry_after(error: Exception) -> Optional[float]:
+    """Hata yanıtındaki Retry-After başlığını oku"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
 class OpenAIProvider(AIProvider):
     """OpenAI provider"""
-    
+
     def __init__(self):
+        self.client: Optional[openai.AsyncOpenAI] = None
         if settings.OPENAI_API_KEY:
-            openai.api_key = settings.OPENAI_API_KEY
-        
+            self.client = openai.AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                timeout=settings.PROVIDER_TIMEOUT_SECONDS
+            )
+
     async def generate_content(self, prompt: str) -> str:
         """OpenAI ile içerik üret"""
-        if not settings.OPENAI_API_KEY:
+        if not self.client:
             raise Exception("OpenAI API key bulunamadı")
-        
+
         try:
-            response = openai.ChatCompletion.create(
+            response = await self.client.chat.completions.create(
                 model=settings.OPENAI_MODEL,
                 messages=[{"role": "user", "content": prompt}],
-                max_tokens=4000,
+                max_tokens=max_output_tokens(settings.TOKEN_BUDGET_DEFAULT_MAX_TOKENS),
                 temperature=0.7
             )
+            usage = getattr(response, "usage", None)
+            report_completion(
+                response.choices[0].finish_reason == "length",
+                getattr(usage, "completion_tokens", None)
+            )
             return response.choices[0].message.content
         except Exception as e:
-            raise Exception(f"OpenAI API hatası: {str(e)}")
-    
+            raise ProviderError(
+                f"OpenAI API hatası: {str(e)}",
+                status_code=getattr(e, "status_code", None),
+                retry_after=_retry_after(e)
+            )
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """OpenAI ile içeriği parça parça üret"""
+        if not self.client:
+            raise Exception("OpenAI API key bulunamadı")
+
+        try:
+            stream = await self.client.chat.completions.create(
+                model=settings.OPENAI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_output_tokens(settings.TOKEN_BUDGET_DEFAULT_MAX_TOKENS),
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].finish_reason:
+                    report_completion(chunk.choices[0].finish_reason == "length")
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise ProviderError(
+                f"OpenAI API hatası: {str(e)}",
+                status_code=getattr(e, "status_code", None),
+                retry_after=_retry_after(e)
+            )
+
     async def check_health(self) -> Dict[str, Any]:
         """OpenAI sağlık kontrolü"""
         try:
-            if not settings.OPENAI_API_KEY:
+            if not self.client:
                 return {
                     "available": False,
                     "error": "API key eksik"
                 }
-            
-            # Basit bir test prompt'u gönder
-            response = openai.ChatCompletion.create(
-                model=settings.OPENAI_MODEL,
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=10
-            )
-            
+
+            # Üretim yapmadan sadece model metadata'sını sorgula
+            await self.client.models.retrieve(settings.OPENAI_MODEL)
+
             return {
                 "available": True,
                 "model": settings.OPENAI_MODEL,
@@ -55,7 +99,11 @@ class OpenAIProvider(AIProvider):
                 "available": False,
                 "error": str(e)
             }
-    
+
     @property
     def provider_name(self) -> str:
         return "openai"
+
+    @property
+    def model_name(self) -> str:
+        return settings.OPENAI_MODEL
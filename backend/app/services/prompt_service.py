@@ -1,17 +1,220 @@
 """
 Ruleset prompt generation service
 """
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
 from app.models.schemas import ProjectInfo
 
+# Prompt metni değiştiğinde artırılmalı; cache anahtarları bu sürüme bağlıdır
+PROMPT_TEMPLATE_VERSION = "1"
+
+# Çıktı formatı
+_OUTPUT_FORMAT = """
+IMPORTANT FORMATTING REQUIREMENTS:
+1. Use proper markdown formatting with headers, lists, and code blocks
+2. Include specific code examples where relevant
+3. Make rules actionable and specific, not generic
+4. Include file structure examples
+5. Provide concrete examples of good vs bad practices
+6. Include relevant package/dependency recommendations
+7. Make the ruleset ready to copy-paste as context for AI assistants
+
+Format the output as a comprehensive markdown document that can be directly used as context for AI coding assistants.
+"""
+
+# Sadece seçili bölümler yeniden üretilirken kullanılan çıktı formatı
+_SECTIONS_OUTPUT_FORMAT = """
+IMPORTANT FORMATTING REQUIREMENTS:
+1. Output ONLY the sections listed above, in the given order, and nothing else
+2. Start each section with exactly the heading line given for it
+3. Use proper markdown formatting with lists and code blocks
+4. Include specific code examples where relevant
+5. Make rules actionable and specific, not generic
+"""
+
+# Değişirse tüm bölümleri etkileyen alanlar (tam yeniden üretim gerekir)
+_GLOBAL_FIELDS = frozenset(("project_category", "project_type", "additional_requirements", "notes"))
+
+
+class _CategoryTemplate:
+    """Kategoriye özel teknoloji bloğu ve bölüm listesi"""
+
+    def __init__(
+        self,
+        heading: str,
+        fields: Tuple[Tuple[str, str, str], ...],
+        sections: Tuple[Tuple[str, str], ...],
+        dependencies: Dict[str, Tuple[str, ...]]
+    ):
+        self.fields = fields
+        self.sections = sections
+        # Alan -> etkilediği bölümler; _GLOBAL_FIELDS'deki alanlar tüm bölümleri etkiler
+        self.dependencies = dependencies
+        self.values = attrgetter(*(field for field, _, _ in fields))
+        self.defaults = tuple(default for _, _, default in fields)
+        # (alan, etiket, varsayılan) -> "- Etiket: {}"
+        lines = "\n".join(f"- {label}: {{}}" for _, label, _ in fields)
+        self.tech_template = f"\n{heading}:\n{lines}\n"
+        numbered = "\n".join(
+            f"{index}. **{title}** - {description}" for index, (title, description) in enumerate(sections, start=1)
+        )
+        self.sections_text = f"\nGenerate a detailed markdown ruleset that includes:\n\n{numbered}\n"
+
+    def render_tech(self, values: Tuple[Optional[str], ...]) -> str:
+        return self.tech_template.format(*(value or default for value, default in zip(values, self.defaults)))
+
+
+_CATEGORY_TEMPLATES: Dict[str, _CategoryTemplate] = {
+    "frontend": _CategoryTemplate(
+        "FRONTEND TECHNOLOGY STACK",
+        (
+            ("frontend_framework", "Framework", "Not specified"),
+            ("styling_approach", "Styling Approach", "Standard CSS"),
+            ("state_management", "State Management", "Component state"),
+            ("http_client", "HTTP Client", "Fetch API"),
+            ("ui_library", "UI Library", "None"),
+            ("build_tool", "Build Tool", "Standard bundler"),
+            ("testing_framework", "Testing Framework", "Not specified"),
+        ),
+        (
+            ("Agent Role Definition", "Frontend developer persona for AI assistants"),
+            ("Technology Stack", "Specific frontend technologies and their usage patterns"),
+            ("Component Architecture", "Component structure, atomic design, file organization"),
+            ("Styling Guidelines", "CSS/SCSS/Styled-components best practices"),
+            ("State Management", "How to handle local and global state"),
+            ("API Integration", "HTTP client usage, data fetching patterns"),
+            ("Performance Optimization", "Bundle size, lazy loading, memoization"),
+            ("Accessibility Standards", "A11Y guidelines and semantic HTML"),
+            ("Testing Strategy", "Unit, integration, and E2E testing approaches"),
+            ("Code Organization", "File structure, naming conventions"),
+            ("Development Workflow", "Git workflow, PR guidelines, code review"),
+            ("Build and Deployment", "Bundling, optimization, deployment strategies"),
+        ),
+        {
+            "frontend_framework": ("*",),
+            "styling_approach": ("Technology Stack", "Styling Guidelines"),
+            "state_management": ("Technology Stack", "State Management"),
+            "http_client": ("Technology Stack", "API Integration"),
+            "ui_library": ("Technology Stack", "Component Architecture", "Styling Guidelines", "Accessibility Standards"),
+            "build_tool": ("Technology Stack", "Performance Optimization", "Build and Deployment"),
+            "testing_framework": ("Technology Stack", "Testing Strategy"),
+            "code_style": ("Code Organization", "Development Workflow"),
+            "testing_requirement": ("Testing Strategy", "Development Workflow"),
+            "deployment_platform": ("Build and Deployment",),
+        },
+    ),
+    "backend": _CategoryTemplate(
+        "BACKEND TECHNOLOGY STACK",
+        (
+            ("backend_language", "Language", "Not specified"),
+            ("backend_framework", "Framework", "Not specified"),
+            ("database_type", "Database", "Not specified"),
+            ("auth_method", "Authentication", "Basic auth"),
+            ("api_style", "API Style", "REST"),
+            ("orm_tool", "ORM/Database Tool", "Native queries"),
+        ),
+        (
+            ("Agent Role Definition", "Backend developer persona for AI assistants"),
+            ("Technology Stack", "Specific backend technologies and frameworks"),
+            ("API Design Principles", "RESTful/GraphQL design patterns"),
+            ("Database Design", "Schema design, migrations, queries"),
+            ("Authentication & Authorization", "Security patterns and implementations"),
+            ("Error Handling", "Exception management and error responses"),
+            ("Testing Strategy", "Unit, integration, and API testing"),
+            ("Performance & Optimization", "Caching, indexing, query optimization"),
+            ("Security Guidelines", "Input validation, SQL injection prevention"),
+            ("Code Architecture", "Clean architecture, SOLID principles"),
+            ("Documentation Standards", "API documentation, code comments"),
+            ("Deployment & DevOps", "Containerization, CI/CD, monitoring"),
+        ),
+        {
+            "backend_language": ("*",),
+            "backend_framework": ("*",),
+            "database_type": ("Technology Stack", "Database Design", "Performance & Optimization"),
+            "auth_method": ("Technology Stack", "Authentication & Authorization", "Security Guidelines"),
+            "api_style": ("Technology Stack", "API Design Principles", "Error Handling", "Documentation Standards"),
+            "orm_tool": ("Technology Stack", "Database Design", "Performance & Optimization", "Security Guidelines"),
+            "code_style": ("Code Architecture", "Documentation Standards"),
+            "testing_requirement": ("Testing Strategy",),
+            "deployment_platform": ("Deployment & DevOps",),
+        },
+    ),
+    "fullstack": _CategoryTemplate(
+        "FULLSTACK TECHNOLOGY STACK",
+        (
+            ("frontend_framework", "Frontend Framework", "Not specified"),
+            ("backend_language", "Backend Language", "Not specified"),
+            ("backend_framework", "Backend Framework", "Not specified"),
+            ("database_type", "Database", "Not specified"),
+            ("auth_method", "Authentication", "Basic auth"),
+        ),
+        (
+            ("Agent Role Definition", "Full-stack developer persona for AI assistants"),
+            ("Technology Stack", "Complete frontend and backend technologies"),
+            ("Project Architecture", "Monorepo vs separate repos, folder structure"),
+            ("API Design", "Backend API design and frontend integration"),
+            ("Database Design", "Schema design and frontend data handling"),
+            ("Authentication Flow", "End-to-end auth implementation"),
+            ("State Management", "Frontend state with backend synchronization"),
+            ("Testing Strategy", "Full-stack testing approach"),
+            ("Performance", "Both frontend and backend optimization"),
+            ("Security", "Comprehensive security measures"),
+            ("Development Workflow", "Full-stack development practices"),
+            ("Deployment", "Complete application deployment strategy"),
+        ),
+        {
+            "frontend_framework": ("*",),
+            "backend_language": ("*",),
+            "backend_framework": ("*",),
+            "database_type": ("Technology Stack", "Database Design", "Performance"),
+            "auth_method": ("Technology Stack", "Authentication Flow", "Security"),
+            "code_style": ("Project Architecture", "Development Workflow"),
+            "testing_requirement": ("Testing Strategy", "Development Workflow"),
+            "deployment_platform": ("Deployment",),
+        },
+    ),
+}
+
+
+@lru_cache(maxsize=4096)
+def _category_fragment(category_key: str, values: Tuple[Optional[str], ...]) -> str:
+    """Teknoloji bloğu + bölüm listesi, alan değerlerine göre memoize edilir"""
+    template = _CATEGORY_TEMPLATES[category_key]
+    return template.render_tech(values) + template.sections_text
+
+
 class PromptService:
     """Prompt üretimi için service"""
-    
+
     @staticmethod
-    def generate_ruleset_prompt(project_info: ProjectInfo) -> str:
-        """Proje bilgilerine göre ruleset prompt'u üret"""
-        
-        # Temel bilgiler
-        base_info = f"""
+    def category_key(project_category: str) -> str:
+        """frontend/backend dışındaki her kategori fullstack şablonunu kullanır"""
+        return project_category if project_category in ("frontend", "backend") else "fullstack"
+
+    @staticmethod
+    def get_sections(project_category: str) -> List[Tuple[str, str]]:
+        """Kategori için (başlık, açıklama) bölüm listesi"""
+        return list(_CATEGORY_TEMPLATES[PromptService.category_key(project_category)].sections)
+
+    @staticmethod
+    def affected_sections(project_category: str, changed_fields) -> Optional[List[str]]:
+        """Değişen alanların etkilediği bölüm başlıkları (None: hepsi)"""
+        template = _CATEGORY_TEMPLATES[PromptService.category_key(project_category)]
+        affected = set()
+        for field in changed_fields:
+            if field in _GLOBAL_FIELDS:
+                return None
+            # Kategorinin prompt'unda yer almayan alanlar çıktıyı etkilemez
+            titles = template.dependencies.get(field, ())
+            if "*" in titles:
+                return None
+            affected.update(titles)
+        return [title for title, _ in template.sections if title in affected]
+
+    @staticmethod
+    def _base_info(project_info: ProjectInfo) -> str:
+        return f"""
 Create a comprehensive project ruleset for an AI coding assistant (like Copilot, Cursor, or ChatGPT). 
 This ruleset should serve as context for generating high-quality, consistent code.
 
@@ -19,93 +222,9 @@ PROJECT CATEGORY: {project_info.project_category.upper()}
 PROJECT TYPE: {project_info.project_type}
 """
 
-        # Kategori-özel bilgiler
-        if project_info.project_category == "frontend":
-            tech_details = f"""
-FRONTEND TECHNOLOGY STACK:
-- Framework: {project_info.frontend_framework or 'Not specified'}
-- Styling Approach: {project_info.styling_approach or 'Standard CSS'}
-- State Management: {project_info.state_management or 'Component state'}
-- HTTP Client: {project_info.http_client or 'Fetch API'}
-- UI Library: {project_info.ui_library or 'None'}
-- Build Tool: {project_info.build_tool or 'Standard bundler'}
-- Testing Framework: {project_info.testing_framework or 'Not specified'}
-"""
-            
-            specific_sections = """
-Generate a detailed markdown ruleset that includes:
-
-1. **Agent Role Definition** - Frontend developer persona for AI assistants
-2. **Technology Stack** - Specific frontend technologies and their usage patterns
-3. **Component Architecture** - Component structure, atomic design, file organization
-4. **Styling Guidelines** - CSS/SCSS/Styled-components best practices
-5. **State Management** - How to handle local and global state
-6. **API Integration** - HTTP client usage, data fetching patterns
-7. **Performance Optimization** - Bundle size, lazy loading, memoization
-8. **Accessibility Standards** - A11Y guidelines and semantic HTML
-9. **Testing Strategy** - Unit, integration, and E2E testing approaches
-10. **Code Organization** - File structure, naming conventions
-11. **Development Workflow** - Git workflow, PR guidelines, code review
-12. **Build and Deployment** - Bundling, optimization, deployment strategies
-"""
-
-        elif project_info.project_category == "backend":
-            tech_details = f"""
-BACKEND TECHNOLOGY STACK:
-- Language: {project_info.backend_language or 'Not specified'}
-- Framework: {project_info.backend_framework or 'Not specified'}
-- Database: {project_info.database_type or 'Not specified'}
-- Authentication: {project_info.auth_method or 'Basic auth'}
-- API Style: {project_info.api_style or 'REST'}
-- ORM/Database Tool: {project_info.orm_tool or 'Native queries'}
-"""
-            
-            specific_sections = """
-Generate a detailed markdown ruleset that includes:
-
-1. **Agent Role Definition** - Backend developer persona for AI assistants
-2. **Technology Stack** - Specific backend technologies and frameworks
-3. **API Design Principles** - RESTful/GraphQL design patterns
-4. **Database Design** - Schema design, migrations, queries
-5. **Authentication & Authorization** - Security patterns and implementations
-6. **Error Handling** - Exception management and error responses
-7. **Testing Strategy** - Unit, integration, and API testing
-8. **Performance & Optimization** - Caching, indexing, query optimization
-9. **Security Guidelines** - Input validation, SQL injection prevention
-10. **Code Architecture** - Clean architecture, SOLID principles
-11. **Documentation Standards** - API documentation, code comments
-12. **Deployment & DevOps** - Containerization, CI/CD, monitoring
-"""
-
-        else:  # fullstack
-            tech_details = f"""
-FULLSTACK TECHNOLOGY STACK:
-- Frontend Framework: {project_info.frontend_framework or 'Not specified'}
-- Backend Language: {project_info.backend_language or 'Not specified'}
-- Backend Framework: {project_info.backend_framework or 'Not specified'}
-- Database: {project_info.database_type or 'Not specified'}
-- Authentication: {project_info.auth_method or 'Basic auth'}
-"""
-            
-            specific_sections = """
-Generate a detailed markdown ruleset that includes:
-
-1. **Agent Role Definition** - Full-stack developer persona for AI assistants
-2. **Technology Stack** - Complete frontend and backend technologies
-3. **Project Architecture** - Monorepo vs separate repos, folder structure
-4. **API Design** - Backend API design and frontend integration
-5. **Database Design** - Schema design and frontend data handling
-6. **Authentication Flow** - End-to-end auth implementation
-7. **State Management** - Frontend state with backend synchronization
-8. **Testing Strategy** - Full-stack testing approach
-9. **Performance** - Both frontend and backend optimization
-10. **Security** - Comprehensive security measures
-11. **Development Workflow** - Full-stack development practices
-12. **Deployment** - Complete application deployment strategy
-"""
-
-        # Ortak gereksinimler
-        common_requirements = f"""
+    @staticmethod
+    def _common_requirements(project_info: ProjectInfo) -> str:
+        return f"""
 ADDITIONAL REQUIREMENTS:
 - Code Style: {project_info.code_style or 'Standard conventions'}
 - Testing Required: {'Yes' if project_info.testing_requirement else 'No'}
@@ -114,18 +233,83 @@ ADDITIONAL REQUIREMENTS:
 - Notes: {project_info.notes or 'None'}
 """
 
-        # Çıktı formatı
-        output_format = """
-IMPORTANT FORMATTING REQUIREMENTS:
-1. Use proper markdown formatting with headers, lists, and code blocks
-2. Include specific code examples where relevant
-3. Make rules actionable and specific, not generic
-4. Include file structure examples
-5. Provide concrete examples of good vs bad practices
-6. Include relevant package/dependency recommendations
-7. Make the ruleset ready to copy-paste as context for AI assistants
+    @staticmethod
+    def generate_ruleset_prompt(project_info: ProjectInfo) -> str:
+        """Proje bilgilerine göre ruleset prompt'u üret"""
+        category_key = PromptService.category_key(project_info.project_category)
+        template = _CATEGORY_TEMPLATES[category_key]
 
-Format the output as a comprehensive markdown document that can be directly used as context for AI coding assistants.
-"""
+        return "".join((
+            PromptService._base_info(project_info),
+            _category_fragment(category_key, template.values(project_info)),
+            PromptService._common_requirements(project_info),
+            _OUTPUT_FORMAT
+        ))
+
+    @staticmethod
+    def _sections_prompt(project_info: ProjectInfo, headings: Dict[str, str], instruction: str) -> str:
+        """Ortak proje bağlamı + sadece verilen bölümleri isteyen talimat"""
+        template = _CATEGORY_TEMPLATES[PromptService.category_key(project_info.project_category)]
+        all_titles = "\n".join(f"{index}. {title}" for index, (title, _) in enumerate(template.sections, start=1))
+        requested = "\n".join(
+            f"- {headings[title]}  ({description})" for title, description in template.sections if title in headings
+        )
+
+        return "".join((
+            PromptService._base_info(project_info),
+            template.render_tech(template.values(project_info)),
+            PromptService._common_requirements(project_info),
+            f"""
+The complete ruleset for this project consists of these sections:
+
+{all_titles}
+
+{instruction}
+Start each section with exactly this heading line:
+
+{requested}
+""",
+            _SECTIONS_OUTPUT_FORMAT
+        ))
 
-        return base_info + tech_details + specific_sections + common_requirements + output_format
+    @staticmethod
+    def generate_sections_prompt(project_info: ProjectInfo, headings: Dict[str, str]) -> str:
+        """Mevcut bir ruleset'in sadece verilen bölümlerini yeniden üreten prompt
+
+        headings: bölüm başlığı -> önceki ruleset'teki başlık satırı
+        """
+        return PromptService._sections_prompt(
+            project_info,
+            headings,
+            "An existing ruleset already contains all of them, but the project details above have changed.\n"
+            "Regenerate ONLY the following sections so they match the updated details."
+        )
+
+    @staticmethod
+    def generate_section_prompts(project_info: ProjectInfo) -> List[Tuple[str, str, str]]:
+        """Paralel üretim için her bölüme ayrı prompt: (başlık, başlık satırı, prompt)"""
+        prompts = []
+        for index, (title, _) in enumerate(PromptService.get_sections(project_info.project_category), start=1):
+            heading = f"## {index}. {title}"
+            prompts.append((title, heading, PromptService._sections_prompt(
+                project_info,
+                {title: heading},
+                "The sections are written in parallel; the other sections are written separately, "
+                "so do not repeat their content.\nWrite ONLY the following section."
+            )))
+        return prompts
+
+    @staticmethod
+    def continuation_prompt(prompt: str, partial: str) -> str:
+        """Çıktı limitine takılıp kesilen cevabı kaldığı yerden devam ettiren prompt"""
+        return f"""{prompt}
+Your previous response was cut off because it reached the output length limit.
+Here is the response so far:
+
+<partial_response>
+{partial}
+</partial_response>
+
+Continue the response exactly where it stopped. Do not repeat any text that is already written,
+do not add an introduction, and keep the same markdown structure and heading format.
+"""
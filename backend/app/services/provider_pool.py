@@ -0,0 +1,312 @@
+"""
+Birden fazla provider arasında gecikmeye duyarlı yönlendirme
+"""
+import asyncio
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from app.services.ai_provider import AIProvider, ProviderError
+from app.services.latency_stats import LatencyWindow
+
+# Aşırı yük bildiren upstream durumları (kabul kontrolü bunlarda limiti düşürür)
+_OVERLOAD_STATUSES = (429, 503, 504)
+
+
+class CircuitBreaker:
+    """Art arda hata veren provider'ı geçici olarak devre dışı bırak"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def available(self) -> bool:
+        """İstek gönderilebilir görünüyor mu (sıralama için; durumu değiştirmez)"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return time.monotonic() - self._opened_at >= self.cooldown_seconds
+        return not self._probing
+
+    def try_dispatch(self) -> bool:
+        """İstek gönderilmeden hemen önce çağrılır; False: gönderme
+
+        Soğuma süresi dolunca deneme hakkını yalnızca ilk çağıran alır (kontrol ve
+        işaretleme arasında await yok); aynı anda gelen diğer istekler reddedilir.
+        """
+        if self.state == self.CLOSED:
+            return True
+        if not self.available():
+            return False
+        self.state = self.HALF_OPEN
+        self._probing = True
+        return True
+
+    def on_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._probing = False
+
+    def on_failure(self):
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def on_abandon(self):
+        """İstek sonuçlanmadan iptal edildi (hedge kaybedeni vb.)"""
+        self._probing = False
+
+
+class ProviderStats:
+    """Provider başına kayan pencere gecikme ve hata oranı"""
+
+    def __init__(self, window_size: int):
+        self.latency = LatencyWindow(window_size)
+        self._outcomes: deque = deque(maxlen=window_size)
+        self.requests = 0
+        self.failures = 0
+        self.hedges_won = 0
+
+    def record(self, seconds: Optional[float], success: bool):
+        self.requests += 1
+        self._outcomes.append(success)
+        if success:
+            self.latency.add(seconds)
+        else:
+            self.failures += 1
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return 1 - sum(self._outcomes) / len(self._outcomes)
+
+
+class ProviderPool(AIProvider):
+    """Birden fazla provider'ı tek bir AIProvider olarak sun"""
+
+    def __init__(
+        self,
+        providers: List[AIProvider],
+        hedging: bool = False,
+        hedge_min_delay: float = 2.0,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        window_size: int = 200
+    ):
+        if not providers:
+            raise ValueError("ProviderPool en az bir provider gerektirir")
+
+        self.providers = providers
+        self.hedging = hedging
+        self.hedge_min_delay = hedge_min_delay
+        self.hedged_requests = 0
+        self._stats: Dict[str, ProviderStats] = {
+            p.provider_name: ProviderStats(window_size) for p in providers
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {
+            p.provider_name: CircuitBreaker(failure_threshold, cooldown_seconds) for p in providers
+        }
+
+    def _score(self, provider: AIProvider) -> float:
+        """Düşük skor daha iyi: p50 gecikme, hata oranıyla cezalandırılmış"""
+        stats = self._stats[provider.provider_name]
+        p50 = stats.latency.percentile(50)
+        if p50 is None:
+            # Ölçümü olmayan provider'ı önce dene
+            return 0.0
+        return p50 / max(0.05, 1 - stats.error_rate)
+
+    def ranked(self) -> List[AIProvider]:
+        """Sağlıklı provider'lar, en hızlıdan yavaşa"""
+        healthy = [p for p in self.providers if self._breakers[p.provider_name].available()]
+        return sorted(healthy, key=self._score)
+
+    @staticmethod
+    def _circuit_open(name: str) -> ProviderError:
+        return ProviderError(f"{name}: circuit breaker açık", status_code=503)
+
+    async def _call(self, provider: AIProvider, prompt: str) -> str:
+        name = provider.provider_name
+        breaker = self._breakers[name]
+        if not breaker.try_dispatch():
+            raise self._circuit_open(name)
+        started = time.perf_counter()
+        try:
+            result = await provider.generate_content(prompt)
+        except asyncio.CancelledError:
+            breaker.on_abandon()
+            raise
+        except Exception:
+            breaker.on_failure()
+            self._stats[name].record(None, success=False)
+            raise
+
+        breaker.on_success()
+        self._stats[name].record(time.perf_counter() - started, success=True)
+        return result
+
+    def _hedge_delay(self, provider: AIProvider) -> float:
+        """Birincilin p95'i, en az hedge_min_delay: az veya hızlı örnekle her istek çiftlenmesin"""
+        p95 = self._stats[provider.provider_name].latency.percentile(95)
+        return max(p95 or 0.0, self.hedge_min_delay)
+
+    async def _hedged(
+        self,
+        prompt: str,
+        primary: AIProvider,
+        secondary: AIProvider,
+        failures: List[Tuple[str, Exception]]
+    ) -> str:
+        """Birincil p95 içinde yanıt vermezse ikinciyi de başlat, ilk başarılıyı al
+
+        Başarısız denemeler `failures` listesine eklenir.
+        """
+        tasks = {asyncio.create_task(self._call(primary, prompt)): primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary))
+            if not done:
+                self.hedged_requests += 1
+            if not done or next(iter(done)).exception() is not None:
+                tasks[asyncio.create_task(self._call(secondary, prompt))] = secondary
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] is secondary:
+                            self._stats[secondary.provider_name].hedges_won += 1
+                        return task.result()
+                    failures.append((tasks[task].provider_name, task.exception()))
+            raise self._exhausted(failures)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _exhausted(failures: List[Tuple[str, Exception]]) -> ProviderError:
+        """Tüm denemeler hız limitine takıldıysa 429, aşırı yük bildirdiyse 503 olarak bildir"""
+        message = f"Tüm provider'lar başarısız: {'; '.join(f'{name}: {e}' for name, e in failures)}"
+        statuses = [getattr(e, "status_code", None) for _, e in failures]
+        retry_after = min(
+            (e.retry_after for _, e in failures if getattr(e, "retry_after", None) is not None), default=None
+        )
+        if statuses and all(status == 429 for status in statuses):
+            return ProviderError(message, status_code=429, retry_after=retry_after)
+        if statuses and all(status in _OVERLOAD_STATUSES for status in statuses):
+            return ProviderError(message, status_code=503, retry_after=retry_after)
+        return ProviderError(message)
+
+    async def generate_content(self, prompt: str) -> str:
+        """En hızlı sağlıklı provider ile üret, hata olursa diğerine geç"""
+        candidates = self.ranked()
+        if not candidates:
+            raise ProviderError("Kullanılabilir AI provider yok (circuit breaker açık)", status_code=503)
+
+        failures: List[Tuple[str, Exception]] = []
+        if self.hedging and len(candidates) > 1:
+            try:
+                return await self._hedged(prompt, candidates[0], candidates[1], failures)
+            except Exception:
+                candidates = candidates[2:]
+
+        for provider in candidates:
+            try:
+                return await self._call(provider, prompt)
+            except Exception as e:
+                failures.append((provider.provider_name, e))
+
+        raise self._exhausted(failures)
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """İlk parça gelene kadar failover yap, sonra tek provider'dan akıt"""
+        candidates = self.ranked()
+        if not candidates:
+            raise ProviderError("Kullanılabilir AI provider yok (circuit breaker açık)", status_code=503)
+
+        failures: List[Tuple[str, Exception]] = []
+        for provider in candidates:
+            name = provider.provider_name
+            breaker = self._breakers[name]
+            if not breaker.try_dispatch():
+                failures.append((name, self._circuit_open(name)))
+                continue
+            started = time.perf_counter()
+            emitted = False
+            try:
+                async for chunk in provider.stream_content(prompt):
+                    emitted = True
+                    yield chunk
+            except (asyncio.CancelledError, GeneratorExit):
+                breaker.on_abandon()
+                raise
+            except Exception as e:
+                breaker.on_failure()
+                self._stats[name].record(None, success=False)
+                if emitted:
+                    raise
+                failures.append((name, e))
+                continue
+
+            breaker.on_success()
+            self._stats[name].record(time.perf_counter() - started, success=True)
+            return
+
+        raise self._exhausted(failures)
+
+    async def warm_up(self):
+        """Havuzdaki tüm provider'ları paralel hazırla"""
+        await asyncio.gather(*(p.warm_up() for p in self.providers), return_exceptions=True)
+
+    async def check_health(self) -> Dict[str, Any]:
+        """Tüm provider'ları kontrol et; biri bile hazırsa havuz hazırdır"""
+        results = await asyncio.gather(
+            *(p.check_health() for p in self.providers), return_exceptions=True
+        )
+        providers = {}
+        for provider, result in zip(self.providers, results):
+            if isinstance(result, Exception):
+                result = {"available": False, "error": str(result)}
+            result["circuit"] = self._breakers[provider.provider_name].state
+            providers[provider.provider_name] = result
+
+        available = [name for name, r in providers.items() if r.get("available")]
+        health = {"available": bool(available), "providers": providers}
+        if not available:
+            health["error"] = "; ".join(f"{name}: {r.get('error')}" for name, r in providers.items())
+        return health
+
+    def stats(self) -> Dict[str, Any]:
+        """Provider başına yönlendirme metrikleri"""
+        providers = {}
+        for provider in self.providers:
+            name = provider.provider_name
+            stats = self._stats[name]
+            providers[name] = {
+                "circuit": self._breakers[name].state,
+                "requests": stats.requests,
+                "failures": stats.failures,
+                "error_rate": round(stats.error_rate, 4),
+                "hedges_won": stats.hedges_won,
+                **stats.latency.summary(),
+            }
+        return {"hedged_requests": self.hedged_requests, "providers": providers}
+
+    @property
+    def provider_name(self) -> str:
+        return "+".join(p.provider_name for p in self.providers)
+
+    @property
+    def model_name(self) -> str:
+        return "+".join(p.model_name for p in self.providers)
@@ -0,0 +1,36 @@
+"""
+Token bucket hız sınırlayıcı (upstream zamanlayıcının RPM/TPM bütçesi)
+"""
+import time
+
+
+class AsyncTokenBucket:
+    """Saniyede `rate` token dolan, en fazla `capacity` token tutan kova"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, amount: float, burst: float = None) -> "AsyncTokenBucket":
+        """Dakika başına limitten kova oluştur"""
+        return cls(rate=amount / 60.0, capacity=burst if burst is not None else max(1.0, amount / 60.0))
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Bu kadar token için beklenmesi gereken süre"""
+        self._refill()
+        missing = min(tokens, self.capacity) - self._tokens
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+    def take(self, tokens: float):
+        """Beklemeden token harca (negatif değer iade eder); kova borca girebilir"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - tokens)
+
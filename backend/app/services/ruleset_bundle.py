@@ -0,0 +1,190 @@
+"""
+Önceden üretilmiş ruleset paketi (mmap ile okunan, sıralı anahtar indeksli tek dosya)
+
+Dosya düzeni:
+    magic (8) | sürüm u32 | başlık uzunluğu u32 | başlık JSON
+    indeks: kayıt sayısı x (sha256 anahtar 32 | ofset u64 | uzunluk u32), anahtara göre sıralı
+    veri: zlib(JSON {"project_info", "markdown", "ai_provider"}) blokları
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from app.models.schemas import ProjectInfo
+from app.services.cache_service import normalize_project_info
+from app.services.prompt_service import PROMPT_TEMPLATE_VERSION
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_MAGIC = b"RSBUNDLE"
+BUNDLE_FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sII")
+_INDEX_ENTRY = struct.Struct("<32sQI")
+
+
+def bundle_key(project_info: ProjectInfo) -> bytes:
+    """Provider'dan bağımsız, normalize edilmiş ProjectInfo'nun sha256 özeti"""
+    canonical = json.dumps(
+        normalize_project_info(project_info), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+
+def write_bundle(
+    path: str,
+    records: Iterable[Tuple[ProjectInfo, str, str]],
+    metadata: Optional[Dict[str, Any]] = None
+) -> int:
+    """(project_info, markdown, ai_provider) kayıtlarından paket yaz; yazılan kayıt sayısı
+
+    Dosya geçici isimle yazılıp yerine taşınır: çalışan bir süreç yarım paket görmez.
+    """
+    blobs: Dict[bytes, bytes] = {}
+    for project_info, markdown, ai_provider in records:
+        record = {"project_info": project_info.model_dump(), "markdown": markdown, "ai_provider": ai_provider}
+        blobs[bundle_key(project_info)] = zlib.compress(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9
+        )
+
+    header = json.dumps({
+        **(metadata or {}),
+        "template": PROMPT_TEMPLATE_VERSION,
+        "count": len(blobs),
+        "created_at": datetime.now().isoformat(),
+    }, ensure_ascii=False).encode("utf-8")
+
+    keys = sorted(blobs)
+    offset = _PREAMBLE.size + len(header) + len(keys) * _INDEX_ENTRY.size
+    index = bytearray()
+    for key in keys:
+        index += _INDEX_ENTRY.pack(key, offset, len(blobs[key]))
+        offset += len(blobs[key])
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_PREAMBLE.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(header)))
+        file.write(header)
+        file.write(index)
+        for key in keys:
+            file.write(blobs[key])
+    os.replace(temp_path, path)
+    return len(keys)
+
+
+class RulesetBundle:
+    """Paketten birebir eşleşme ile ruleset okuyan salt okunur görünüm
+
+    Dosya bir kez mmap edilir; arama indekste ikili aramadır ve sadece eşleşen kaydın
+    sayfaları diskten okunur (soğuk başlangıçta tüm paket belleğe yüklenmez).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.metadata: Dict[str, Any] = {}
+        self.count = 0
+        self.hits = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._index_offset = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def load(self) -> bool:
+        """Paketi aç ve doğrula; dosya yoksa veya geçersizse paket devre dışı kalır"""
+        with self._lock:
+            if self._loaded:
+                return self._mm is not None
+            self._loaded = True
+            if not self.enabled or not os.path.exists(self.path):
+                return False
+            try:
+                with open(self.path, "rb") as file:
+                    mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, header_length = _PREAMBLE.unpack_from(mm, 0)
+                if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION:
+                    raise ValueError(f"Desteklenmeyen paket formatı: {magic!r} v{version}")
+                metadata = json.loads(mm[_PREAMBLE.size:_PREAMBLE.size + header_length])
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning("Ruleset paketi açılamadı (%s): %s", self.path, e)
+                return False
+            if metadata.get("template") != PROMPT_TEMPLATE_VERSION:
+                # Prompt şablonu değişti: paketteki ruleset'ler artık güncel değil
+                logger.warning(
+                    "Ruleset paketi eski prompt şablonuyla üretilmiş (%s != %s), kullanılmıyor",
+                    metadata.get("template"), PROMPT_TEMPLATE_VERSION
+                )
+                mm.close()
+                return False
+            self._mm = mm
+            self.metadata = metadata
+            self.count = int(metadata.get("count", 0))
+            self._index_offset = _PREAMBLE.size + header_length
+            return True
+
+    def _find(self, key: bytes) -> Optional[Tuple[int, int]]:
+        """İndekste ikili arama: (ofset, uzunluk)"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            position = self._index_offset + middle * _INDEX_ENTRY.size
+            candidate = self._mm[position:position + 32]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                _, offset, length = _INDEX_ENTRY.unpack_from(self._mm, position)
+                return offset, length
+        return None
+
+    def contains(self, project_info: ProjectInfo) -> bool:
+        if not self._loaded:
+            self.load()
+        return self._mm is not None and self._find(bundle_key(project_info)) is not None
+
+    def get(self, project_info: ProjectInfo) -> Optional[Dict[str, Any]]:
+        """Birebir eşleşen kayıt: {"project_info", "markdown", "ai_provider"}"""
+        if not self._loaded:
+            self.load()
+        if self._mm is None:
+            return None
+        location = self._find(bundle_key(project_info))
+        if location is None:
+            return None
+        offset, length = location
+        self.hits += 1
+        return json.loads(zlib.decompress(self._mm[offset:offset + length]))
+
+    def close(self):
+        with self._lock:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = None
+            self._loaded = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self._mm is not None,
+            "path": self.path or None,
+            "entries": self.count,
+            "hits": self.hits,
+            "created_at": self.metadata.get("created_at"),
+            "ai_provider": self.metadata.get("ai_provider"),
+            "model": self.metadata.get("model"),
+            "size_bytes": len(self._mm) if self._mm is not None else 0,
+        }
+
+
+# Global ruleset bundle instance
+ruleset_bundle = RulesetBundle(settings.RULESET_BUNDLE_PATH)
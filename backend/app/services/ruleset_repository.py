@@ -0,0 +1,332 @@
+"""
+Üretilen ruleset'lerin kalıcı deposu (SQLite, FTS5 tam metin arama, toplu yazma)
+"""
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Ayrı kolon olarak indekslenen yığın alanları
+INDEXED_FIELDS = ("project_category", "project_type", "frontend_framework", "backend_framework", "database_type")
+
+_SUMMARY_COLUMNS = (
+    "seq", "id", "created_at", *INDEXED_FIELDS, "ai_provider", "cache_status", "duration_ms"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rulesets (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    project_category TEXT,
+    project_type TEXT,
+    frontend_framework TEXT COLLATE NOCASE,
+    backend_framework TEXT COLLATE NOCASE,
+    database_type TEXT COLLATE NOCASE,
+    ai_provider TEXT,
+    cache_status TEXT,
+    duration_ms REAL,
+    timings TEXT,
+    project_info TEXT NOT NULL,
+    markdown TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_rulesets_frontend ON rulesets (frontend_framework);
+CREATE INDEX IF NOT EXISTS idx_rulesets_backend ON rulesets (backend_framework);
+CREATE INDEX IF NOT EXISTS idx_rulesets_database ON rulesets (database_type);
+CREATE INDEX IF NOT EXISTS idx_rulesets_category ON rulesets (project_category);
+CREATE VIRTUAL TABLE IF NOT EXISTS rulesets_fts USING fts5(
+    markdown, content='rulesets', content_rowid='seq'
+);
+CREATE TRIGGER IF NOT EXISTS rulesets_fts_insert AFTER INSERT ON rulesets BEGIN
+    INSERT INTO rulesets_fts (rowid, markdown) VALUES (new.seq, new.markdown);
+END;
+CREATE TRIGGER IF NOT EXISTS rulesets_fts_delete AFTER DELETE ON rulesets BEGIN
+    INSERT INTO rulesets_fts (rulesets_fts, rowid, markdown) VALUES ('delete', old.seq, old.markdown);
+END;
+"""
+
+_TOKEN_RE = re.compile(r"[\w.+#-]+\*?", re.UNICODE)
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Serbest metni güvenli bir FTS5 sorgusuna çevir: her kelime tırnaklı, hepsi AND"""
+    terms = []
+    for token in _TOKEN_RE.findall(text):
+        prefix = token.endswith("*")
+        word = token.rstrip("*").replace('"', "")
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return " ".join(terms) or None
+
+
+class RulesetRepository:
+    """Ruleset'leri arka planda toplu yazan, indeksli ve tam metin aranabilir depo"""
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 0.5, max_pending: int = 10000):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[Tuple] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        # Yazma ve okuma ayrı bağlantılarda: WAL sayesinde aramalar toplu yazmayı beklemez
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        # Bağlantı ilk kullanımda açılır: import sırasında disk erişimi olmasın
+        if self._write_conn is None:
+            self._write_conn = self._connect()
+            self._write_conn.executescript(_SCHEMA)
+            self._write_conn.commit()
+        return self._write_conn
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        if self._read_conn is None:
+            with self._write_lock:
+                self._writer_connection()
+            self._read_conn = self._connect()
+        return self._read_conn
+
+    # --- Yazma ---
+
+    def add(
+        self,
+        ruleset_id: str,
+        project_info: Dict[str, Any],
+        markdown: str,
+        ai_provider: str,
+        cache_status: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+        timings: Optional[Dict[str, float]] = None
+    ):
+        """Kaydı yazma kuyruğuna ekle; istek yolunda disk erişimi yapılmaz"""
+        if not self.enabled:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        self._pending.append((
+            ruleset_id,
+            datetime.now().isoformat(),
+            *(project_info.get(field) for field in INDEXED_FIELDS),
+            ai_provider,
+            cache_status,
+            duration_ms,
+            json.dumps(timings) if timings else None,
+            json.dumps(project_info, ensure_ascii=False),
+            markdown,
+        ))
+        self._ensure_writer()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _ensure_writer(self):
+        if self._writer is None or self._writer.done():
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.create_task(self._write_loop())
+
+    def _write_batch(self, rows: List[Tuple]):
+        with self._write_lock:
+            conn = self._writer_connection()
+            with conn:
+                conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO rulesets (
+                        id, created_at, project_category, project_type, frontend_framework,
+                        backend_framework, database_type, ai_provider, cache_status, duration_ms,
+                        timings, project_info, markdown
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows
+                )
+
+    async def flush(self):
+        """Bekleyen kayıtları tek transaction'da yaz"""
+        while self._pending:
+            rows, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            try:
+                await asyncio.to_thread(self._write_batch, rows)
+                self.written += len(rows)
+                self.batches += 1
+            except Exception:
+                self.dropped += len(rows)
+                logger.exception("Ruleset deposuna yazılamadı (%d kayıt)", len(rows))
+
+    async def _write_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def stop(self):
+        """Yazıcıyı durdur, kalan kayıtları yaz"""
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        await self.flush()
+
+    # --- Okuma ---
+
+    def _read(self, sql: str, params: Tuple) -> list:
+        with self._read_lock:
+            return self._reader_connection().execute(sql, params).fetchall()
+
+    def _search(
+        self,
+        framework: Optional[str],
+        query: Optional[str],
+        category: Optional[str],
+        database: Optional[str],
+        provider: Optional[str],
+        cursor: Optional[int],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if category:
+            conditions.append("r.project_category = ?")
+            params.append(category)
+        if database:
+            conditions.append("r.database_type = ?")
+            params.append(database)
+        if provider:
+            conditions.append("r.ai_provider = ?")
+            params.append(provider)
+        # Keyset sayfalama: en yeniden eskiye, cursor = son görülen seq
+        if cursor is not None:
+            conditions.append("r.seq < ?")
+            params.append(cursor)
+
+        columns = ", ".join(f"r.{column}" for column in _SUMMARY_COLUMNS)
+        match = fts_query(query) if query else None
+        if match:
+            # FTS indeksi seq sırasıyla taranır, diğer filtreler satır satır uygulanır
+            if framework:
+                conditions.append("(r.frontend_framework = ? OR r.backend_framework = ?)")
+                params += [framework, framework]
+            sql = (
+                f"SELECT {columns}, snippet(rulesets_fts, 0, '[', ']', '…', 12) "
+                "FROM rulesets_fts JOIN rulesets r ON r.seq = rulesets_fts.rowid "
+                "WHERE rulesets_fts MATCH ?"
+            )
+            params.insert(0, match)
+            if conditions:
+                sql += " AND " + " AND ".join(conditions)
+            sql += " ORDER BY rulesets_fts.rowid DESC LIMIT ?"
+        elif framework:
+            # OR tek indeksle sıralı taranamaz: iki indeksten ayrı ayrı en yeni `limit` kayıt, sonra birleşim
+            branches = []
+            branch_params: List[Any] = []
+            for column in ("frontend_framework", "backend_framework"):
+                where = " AND ".join([f"r.{column} = ?", *conditions])
+                branches.append(f"SELECT seq FROM (SELECT r.seq FROM rulesets r WHERE {where} ORDER BY r.seq DESC LIMIT ?)")
+                branch_params += [framework, *params, limit]
+            sql = (
+                f"SELECT {columns}, NULL FROM rulesets r WHERE r.seq IN ({' UNION '.join(branches)}) "
+                "ORDER BY r.seq DESC LIMIT ?"
+            )
+            params = branch_params
+        else:
+            sql = f"SELECT {columns}, NULL FROM rulesets r"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY r.seq DESC LIMIT ?"
+        params.append(limit)
+
+        items = []
+        for row in self._read(sql, tuple(params)):
+            item = dict(zip(_SUMMARY_COLUMNS, row[:-1]))
+            if row[-1] is not None:
+                item["snippet"] = row[-1]
+            items.append(item)
+        return items
+
+    async def search(
+        self,
+        framework: Optional[str] = None,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        database: Optional[str] = None,
+        provider: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: int = 20
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Filtrelere uyan ruleset özetleri (en yeni önce) ve sonraki sayfanın cursor'ı"""
+        items = await asyncio.to_thread(self._search, framework, query, category, database, provider, cursor, limit)
+        next_cursor = items[-1]["seq"] if len(items) == limit else None
+        for item in items:
+            del item["seq"]
+        return items, next_cursor
+
+    def _get(self, ruleset_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read(
+            "SELECT id, created_at, ai_provider, cache_status, duration_ms, timings, project_info, markdown "
+            "FROM rulesets WHERE id = ?",
+            (ruleset_id,)
+        )
+        if not rows:
+            return None
+        record = dict(zip(
+            ("id", "created_at", "ai_provider", "cache_status", "duration_ms", "timings", "project_info", "markdown"),
+            rows[0]
+        ))
+        record["timings"] = json.loads(record["timings"]) if record["timings"] else None
+        record["project_info"] = json.loads(record["project_info"])
+        return record
+
+    async def get(self, ruleset_id: str) -> Optional[Dict[str, Any]]:
+        """Tam kaydı getir; henüz yazılmamış (kuyruktaki) kayıtlar da bulunur"""
+        for row in reversed(self._pending):
+            if row[0] == ruleset_id:
+                await self.flush()
+                break
+        return await asyncio.to_thread(self._get, ruleset_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+
+# Global ruleset repository instance
+ruleset_repository = RulesetRepository(
+    settings.RULESET_DB_PATH,
+    batch_size=settings.RULESET_WRITE_BATCH_SIZE,
+    flush_interval=settings.RULESET_WRITE_INTERVAL_SECONDS,
+    max_pending=settings.RULESET_WRITE_MAX_PENDING
+)
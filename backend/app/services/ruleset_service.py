@@ -0,0 +1,408 @@
+"""
+Ruleset üretim akışı (cache + prompt + AI)
+"""
+import asyncio
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Union
+from app.models.schemas import ProjectInfo, RulesetResponse, CacheMode, GenerationMode
+from app.services.ai_service import ai_service
+from app.services.cache_service import ruleset_cache, make_cache_key, normalize_project_info
+from app.services.export_service import RulesetDocument
+from app.services.metrics import stage, set_request_labels, current_timings, estimate_tokens, TOKENS, UPSTREAM_REQUESTS
+from app.services.prompt_service import PromptService
+from app.services.semantic_cache import semantic_index
+from app.services.ruleset_bundle import ruleset_bundle
+from app.services.ruleset_store import ruleset_store
+from app.services.ruleset_repository import ruleset_repository
+from app.services.section_service import parse_sections, extract_section, ruleset_header
+from app.services.token_budget import BudgetRequest
+from app.core.config import settings
+
+
+@dataclass
+class GenerationResult:
+    """Tek bir ruleset üretiminin sonucu"""
+    markdown: str
+    ai_provider: str
+    cache_status: str  # "bundle", "hit", "reuse", "miss", "bypass", "refresh", "disabled", "partial", "unchanged"
+    similarity: Optional[float] = None  # Sadece "reuse" için: eşleşen kaydın benzerliği
+    regenerated_sections: Optional[List[str]] = None  # Sadece bölüm bazlı güncellemede
+
+
+class RulesetService:
+    """Ruleset üretimi için service"""
+
+    async def generate(
+        self,
+        project_info: ProjectInfo,
+        cache_mode: CacheMode = CacheMode.DEFAULT,
+        mode: Optional[GenerationMode] = None
+    ) -> GenerationResult:
+        """Cache'e bak, yoksa AI ile üret"""
+        mode = mode or GenerationMode(settings.GENERATION_MODE)
+        labels = self._metric_labels(project_info)
+        use_cache = settings.CACHE_ENABLED and cache_mode != CacheMode.BYPASS
+        cache_key = make_cache_key(project_info, ai_service.provider_name, ai_service.model_name) if use_cache else None
+
+        if cache_mode == CacheMode.DEFAULT:
+            bundled = self._bundled_result(project_info, labels)
+            if bundled is not None:
+                return bundled
+
+        if use_cache and cache_mode == CacheMode.DEFAULT:
+            cached = await self._cached_result(project_info, cache_key, labels)
+            if cached is not None:
+                return cached
+
+        if mode == GenerationMode.SECTIONED:
+            with stage("upstream", **labels):
+                markdown_content = "".join([
+                    chunk async for chunk in self._stream_sectioned(project_info, labels)
+                ])
+        else:
+            with stage("prompt", **labels):
+                prompt = PromptService.generate_ruleset_prompt(project_info)
+            with stage("upstream", **labels), self._upstream_metrics(prompt, labels) as outcome:
+                markdown_content = await ai_service.generate_ruleset(
+                    prompt, budget=BudgetRequest.for_ruleset(project_info, ai_service.provider_name)
+                )
+                outcome["completion"] = markdown_content
+
+        if use_cache:
+            await self._store(project_info, cache_key, markdown_content)
+
+        return GenerationResult(
+            markdown=markdown_content,
+            ai_provider=ai_service.provider_name,
+            cache_status=self._cache_status(cache_mode)
+        )
+
+    async def stream(
+        self,
+        project_info: ProjectInfo,
+        cache_mode: CacheMode = CacheMode.DEFAULT,
+        mode: Optional[GenerationMode] = None
+    ) -> AsyncIterator[Union[str, GenerationResult]]:
+        """Markdown parçalarını üret, en sonda GenerationResult döndür"""
+        mode = mode or GenerationMode(settings.GENERATION_MODE)
+        labels = self._metric_labels(project_info)
+        use_cache = settings.CACHE_ENABLED and cache_mode != CacheMode.BYPASS
+        cache_key = make_cache_key(project_info, ai_service.provider_name, ai_service.model_name) if use_cache else None
+
+        if cache_mode == CacheMode.DEFAULT:
+            bundled = self._bundled_result(project_info, labels)
+            if bundled is not None:
+                yield bundled.markdown
+                yield bundled
+                return
+
+        if use_cache and cache_mode == CacheMode.DEFAULT:
+            cached = await self._cached_result(project_info, cache_key, labels)
+            if cached is not None:
+                yield cached.markdown
+                yield cached
+                return
+
+        if mode == GenerationMode.SECTIONED:
+            source = self._stream_sectioned(project_info, labels)
+        else:
+            source = self._stream_monolithic(project_info, labels)
+        chunks = []
+        with stage("upstream", **labels):
+            async for chunk in source:
+                chunks.append(chunk)
+                yield chunk
+        markdown_content = "".join(chunks)
+
+        if use_cache:
+            await self._store(project_info, cache_key, markdown_content)
+
+        yield GenerationResult(
+            markdown=markdown_content,
+            ai_provider=ai_service.provider_name,
+            cache_status=self._cache_status(cache_mode)
+        )
+
+    async def _stream_monolithic(self, project_info: ProjectInfo, labels: Dict[str, str]) -> AsyncIterator[str]:
+        """Tek prompt ile tüm ruleset'i akış halinde üret"""
+        with stage("prompt", **labels):
+            prompt = PromptService.generate_ruleset_prompt(project_info)
+        chunks = []
+        with self._upstream_metrics(prompt, labels) as outcome:
+            budget = BudgetRequest.for_ruleset(project_info, ai_service.provider_name)
+            async for chunk in ai_service.stream_ruleset(prompt, budget=budget):
+                chunks.append(chunk)
+                yield chunk
+            outcome["completion"] = "".join(chunks)
+
+    async def _generate_section(
+        self,
+        title: str,
+        heading: str,
+        prompt: str,
+        labels: Dict[str, str],
+        semaphore: asyncio.Semaphore
+    ) -> str:
+        async with semaphore:
+            with self._upstream_metrics(prompt, labels) as outcome:
+                content = await ai_service.generate_ruleset(prompt)
+                outcome["completion"] = content
+        return extract_section(content, title, heading)
+
+    async def _stream_sectioned(
+        self,
+        project_info: ProjectInfo,
+        labels: Dict[str, str]
+    ) -> AsyncIterator[str]:
+        """Bölümleri eşzamanlı üret, hazır oldukça sırayla döndür
+
+        Herhangi bir bölüm başarısız olursa kalanlar iptal edilir.
+        """
+        with stage("prompt", **labels):
+            prompts = PromptService.generate_section_prompts(project_info)
+        semaphore = asyncio.Semaphore(settings.SECTION_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(self._generate_section(title, heading, prompt, labels, semaphore))
+            for title, heading, prompt in prompts
+        ]
+        pending = set(tasks)
+        try:
+            yield ruleset_header(project_info.project_type, project_info.project_category)
+            for index, task in enumerate(tasks):
+                while not task.done():
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for finished in done:
+                        if finished.exception() is not None:
+                            raise finished.exception()
+                yield task.result() if index == 0 else "\n" + task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def regenerate_sections(
+        self,
+        previous_ruleset_id: str,
+        project_info: ProjectInfo
+    ) -> Optional[GenerationResult]:
+        """Önceki ruleset'in sadece değişen alanlardan etkilenen bölümlerini yeniden üret
+
+        Önceki ruleset bulunamazsa None döner. Değişiklik tüm bölümleri etkiliyorsa
+        veya bölümler ayrıştırılamıyorsa tam üretime düşer.
+        """
+        record = await self.load_ruleset(previous_ruleset_id)
+        if record is None:
+            return None
+
+        labels = self._metric_labels(project_info)
+        previous = record["parsed"]
+        old_values = normalize_project_info(ProjectInfo(**record["project_info"]))
+        new_values = normalize_project_info(project_info)
+        changed = [field for field, value in new_values.items() if old_values.get(field) != value]
+        affected = PromptService.affected_sections(project_info.project_category, changed)
+
+        if affected is None or any(previous.get(title) is None for title in affected):
+            return await self._regenerate_all(project_info)
+
+        if not affected:
+            return GenerationResult(
+                markdown=previous.render(),
+                ai_provider=record["ai_provider"],
+                cache_status="unchanged",
+                regenerated_sections=[]
+            )
+
+        with stage("prompt", **labels):
+            headings = {title: previous.get(title).heading for title in affected}
+            prompt = PromptService.generate_sections_prompt(project_info, headings)
+        with stage("upstream", **labels), self._upstream_metrics(prompt, labels) as outcome:
+            response = await ai_service.generate_ruleset(prompt)
+            outcome["completion"] = response
+
+        regenerated = parse_sections(response, affected)
+        if len(regenerated.sections) != len(affected):
+            # Model istenen başlıkları kullanmadı; yarım birleştirme yerine tam üretim
+            return await self._regenerate_all(project_info)
+
+        markdown_content = previous.replace(
+            {section.title: section.content for section in regenerated.sections}
+        ).render()
+        if settings.CACHE_ENABLED:
+            await self._store(
+                project_info,
+                make_cache_key(project_info, ai_service.provider_name, ai_service.model_name),
+                markdown_content
+            )
+
+        return GenerationResult(
+            markdown=markdown_content,
+            ai_provider=ai_service.provider_name,
+            cache_status="partial",
+            regenerated_sections=affected
+        )
+
+    @staticmethod
+    async def load_ruleset(ruleset_id: str) -> Optional[Dict]:
+        """Bölümlere ayrılmış ruleset kaydı; bellekteki depoda yoksa kalıcı depodan yüklenir"""
+        record = ruleset_store.get(ruleset_id)
+        if record is None:
+            # Bellekteki depodan düşmüş olabilir: kalıcı depodan yükle
+            stored = await ruleset_repository.get(ruleset_id) if ruleset_repository.enabled else None
+            if stored is None:
+                return None
+            ruleset_store.save(ProjectInfo(**stored["project_info"]), stored["ai_provider"], stored["markdown"])
+            record = ruleset_store.get(ruleset_id)
+        return record
+
+    async def document(self, ruleset_id: str) -> Optional[RulesetDocument]:
+        """Dışa aktarma için ruleset'in bölüm ağacı"""
+        record = await self.load_ruleset(ruleset_id)
+        if record is None:
+            return None
+        return RulesetDocument.from_parsed(record["parsed"], record["project_info"])
+
+    async def _regenerate_all(self, project_info: ProjectInfo) -> GenerationResult:
+        result = await self.generate(project_info)
+        result.regenerated_sections = [title for title, _ in PromptService.get_sections(project_info.project_category)]
+        return result
+
+    @staticmethod
+    def _bundled_result(project_info: ProjectInfo, labels: Dict[str, str]) -> Optional[GenerationResult]:
+        """Önceden üretilmiş paketten birebir eşleşme (provider ve cache'ten bağımsız)"""
+        if not ruleset_bundle.enabled:
+            return None
+        with stage("bundle_lookup", **labels):
+            record = ruleset_bundle.get(project_info)
+        if record is None:
+            return None
+        return GenerationResult(
+            markdown=record["markdown"],
+            ai_provider=record["ai_provider"],
+            cache_status="bundle"
+        )
+
+    @staticmethod
+    async def _cached_result(
+        project_info: ProjectInfo,
+        cache_key: str,
+        labels: Dict[str, str]
+    ) -> Optional[GenerationResult]:
+        """Birebir cache eşleşmesi, yoksa benzerlik indeksinden yeniden kullanım"""
+        with stage("cache_lookup", **labels):
+            cached = await ruleset_cache.get(cache_key)
+        if cached is not None:
+            return GenerationResult(
+                markdown=cached["markdown"],
+                ai_provider=cached["ai_provider"],
+                cache_status="hit"
+            )
+
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None
+
+        with stage("semantic_lookup", **labels):
+            match = semantic_index.lookup(project_info, ai_service.provider_name, ai_service.model_name)
+            if match is None:
+                return None
+            reused = await ruleset_cache.get(match.cache_key, record_stats=False)
+        if reused is None:
+            # Ruleset cache'ten düşmüş; indeks kaydı artık işe yaramaz
+            semantic_index.discard(match.cache_key)
+            return None
+
+        return GenerationResult(
+            markdown=reused["markdown"],
+            ai_provider=reused["ai_provider"],
+            cache_status="reuse",
+            similarity=match.similarity
+        )
+
+    @staticmethod
+    async def _store(project_info: ProjectInfo, cache_key: str, markdown_content: str):
+        """Cache'e yaz ve benzerlik indeksine ekle"""
+        await ruleset_cache.set(cache_key, {
+            "markdown": markdown_content,
+            "ai_provider": ai_service.provider_name
+        })
+        if settings.SEMANTIC_CACHE_ENABLED:
+            semantic_index.add(cache_key, project_info, ai_service.provider_name, ai_service.model_name)
+
+    @staticmethod
+    def _metric_labels(project_info: ProjectInfo) -> Dict[str, str]:
+        """Aşama metrikleri için etiketler (istek bağlamına da yazılır)"""
+        labels = {
+            "provider": ai_service.provider_name,
+            "model": ai_service.model_name,
+            "project_category": project_info.project_category
+        }
+        set_request_labels(**labels)
+        return labels
+
+    @staticmethod
+    @contextmanager
+    def _upstream_metrics(prompt: str, labels: Dict[str, str]):
+        """Upstream durum kodunu ve tahmini token sayılarını kaydet"""
+        outcome: Dict[str, str] = {}
+        provider, model, category = labels["provider"], labels["model"], labels["project_category"]
+        try:
+            yield outcome
+        except Exception as e:
+            UPSTREAM_REQUESTS.inc(provider, model, str(getattr(e, "status_code", None) or "error"))
+            raise
+        UPSTREAM_REQUESTS.inc(provider, model, "200")
+        TOKENS.inc(provider, model, category, "prompt", amount=estimate_tokens(prompt))
+        TOKENS.inc(provider, model, category, "completion", amount=estimate_tokens(outcome.get("completion", "")))
+
+    @staticmethod
+    def _cache_status(cache_mode: CacheMode) -> str:
+        """Cache'e bakılmadan üretilen sonucun durumu"""
+        if not settings.CACHE_ENABLED:
+            return "disabled"
+        if cache_mode == CacheMode.DEFAULT:
+            return "miss"
+        return cache_mode.value
+
+    @staticmethod
+    def build_response(project_info: ProjectInfo, result: GenerationResult, compact: bool = False) -> RulesetResponse:
+        """Üretim sonucunu API yanıtına dönüştür
+
+        json_data markdown'ın kopyasını taşımaz; json_data["ruleset"] bölüm ağacıdır
+        (compact: bölüm içerikleri de tekrarlanmaz, sadece başlıklar döner).
+        """
+        json_data = {
+            "project_info": project_info.model_dump(),
+            "generated_at": datetime.now().isoformat(),
+            "ai_provider": result.ai_provider
+        }
+        json_data["ruleset_id"] = ruleset_store.save(project_info, result.ai_provider, result.markdown)
+        # Depo markdown'ı zaten bölümlere ayırdı; ağaç aynı ayrıştırmadan kurulur
+        document = RulesetDocument.from_parsed(ruleset_store.sections(json_data["ruleset_id"]), json_data["project_info"])
+        json_data["ruleset"] = document.to_dict(content=not compact)
+        # Birebir cache isabetinin id'si üretildiğinde zaten yazıldı; reuse ve paket sonuçlarının
+        # id'si yeni isteğin bilgilerinden türediği için depoda henüz yoktur
+        if result.cache_status != "hit":
+            timings = current_timings()
+            ruleset_repository.add(
+                json_data["ruleset_id"],
+                json_data["project_info"],
+                result.markdown,
+                result.ai_provider,
+                cache_status=result.cache_status,
+                duration_ms=round((time.perf_counter() - timings.started) * 1000, 2) if timings else None,
+                timings={name: round(seconds * 1000, 2) for name, seconds in timings.stages} if timings else None
+            )
+        if result.similarity is not None:
+            json_data["reuse_similarity"] = round(result.similarity, 4)
+        if result.regenerated_sections is not None:
+            json_data["regenerated_sections"] = result.regenerated_sections
+
+        return RulesetResponse(
+            markdown=result.markdown,
+            json_data=json_data
+        )
+
+
+# Global ruleset service instance
+ruleset_service = RulesetService()
@@ -0,0 +1,66 @@
+"""
+Üretilmiş ruleset'lerin id ile adreslenebilir deposu
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.models.schemas import ProjectInfo
+from app.services.cache_service import normalize_project_info
+from app.services.prompt_service import PromptService
+from app.services.section_service import ParsedRuleset, parse_sections
+from app.core.config import settings
+
+
+def make_ruleset_id(project_info: ProjectInfo, ai_provider: str, markdown: str) -> str:
+    """İçerikten türetilen id: aynı ruleset tekrar kaydedilirse aynı id döner"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(normalize_project_info(project_info), sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    digest.update(ai_provider.encode("utf-8"))
+    digest.update(markdown.encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+class RulesetStore:
+    """Son üretilen ruleset'leri bölümlere ayrılmış olarak tutan LRU depo"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def save(self, project_info: ProjectInfo, ai_provider: str, markdown: str) -> str:
+        """Ruleset'i kaydet, id'sini döndür"""
+        ruleset_id = make_ruleset_id(project_info, ai_provider, markdown)
+        if ruleset_id in self._records:
+            self._records.move_to_end(ruleset_id)
+            return ruleset_id
+
+        titles = [title for title, _ in PromptService.get_sections(project_info.project_category)]
+        self._records[ruleset_id] = {
+            "id": ruleset_id,
+            "project_info": project_info.model_dump(),
+            "ai_provider": ai_provider,
+            "created_at": datetime.now().isoformat(),
+            "parsed": parse_sections(markdown, titles),
+        }
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+        return ruleset_id
+
+    def get(self, ruleset_id: str) -> Optional[Dict[str, Any]]:
+        record = self._records.get(ruleset_id)
+        if record is not None:
+            self._records.move_to_end(ruleset_id)
+        return record
+
+    def sections(self, ruleset_id: str) -> Optional[ParsedRuleset]:
+        record = self.get(ruleset_id)
+        return record["parsed"] if record is not None else None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+# Global ruleset store instance
+ruleset_store = RulesetStore(max_entries=settings.RULESET_STORE_MAX_ENTRIES)
@@ -0,0 +1,289 @@
+"""
+Upstream hız limitlerine (RPM/TPM) uyan, öncelik şeritli provider zamanlayıcısı
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.services.ai_provider import AIProvider, ProviderError, max_output_tokens
+from app.services.metrics import registry, estimate_tokens
+from app.services.rate_limiter import AsyncTokenBucket
+
+
+class Priority(IntEnum):
+    """Küçük değer önce gönderilir"""
+    INTERACTIVE = 0  # Kullanıcının beklediği UI istekleri
+    BATCH = 1        # Toplu üretim
+    BACKGROUND = 2   # İş kuyruğu, ön üretim
+
+
+_current_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: Priority):
+    """Bu blokta yapılan upstream çağrılarının önceliğini belirle"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+SCHEDULER_WAIT = registry.histogram(
+    "ruleset_scheduler_wait_seconds", "Upstream çağrısının zamanlayıcı kuyruğunda beklediği süre",
+    ("provider", "priority")
+)
+SCHEDULER_THROTTLED = registry.counter(
+    "ruleset_scheduler_throttled_total", "Upstream'den dönen 429 yanıtları", ("provider",)
+)
+SCHEDULER_RETRIES = registry.counter(
+    "ruleset_scheduler_retries_total", "429 sonrası yeniden denemeler", ("provider",)
+)
+
+_schedulers: List["UpstreamScheduler"] = []
+
+
+def _queue_depths() -> Dict[Tuple[str, ...], float]:
+    return {
+        (scheduler.name, priority.name.lower()): float(depth)
+        for scheduler in _schedulers
+        for priority, depth in scheduler.queue_depths().items()
+    }
+
+
+registry.gauge(
+    "ruleset_scheduler_queue_depth", "Zamanlayıcı kuyruğunda bekleyen upstream çağrıları",
+    _queue_depths, labelnames=("provider", "priority")
+)
+
+
+class UpstreamScheduler:
+    """Tek provider için RPM/TPM kovaları ve öncelik sıralı bekleme kuyruğu"""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_queue: int = 1000
+    ):
+        self.name = name
+        self.max_queue = max_queue
+        # Dakikalık kotanın en fazla ~10 saniyelik kısmı kadar patlamaya izin ver
+        self._requests = AsyncTokenBucket.per_minute(
+            requests_per_minute, burst=max(1.0, requests_per_minute / 6)
+        ) if requests_per_minute > 0 else None
+        self._tokens = AsyncTokenBucket.per_minute(
+            tokens_per_minute, burst=tokens_per_minute / 6
+        ) if tokens_per_minute > 0 else None
+        # (öncelik, sıra, future, token)
+        self._waiters: List[Tuple[int, int, asyncio.Future, float]] = []
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._paused_until = 0.0
+        self.dispatched = 0
+        self.throttled = 0
+        self.retries = 0
+        self._wait_seconds = 0.0
+        _schedulers.append(self)
+
+    def queue_depths(self) -> Dict[Priority, int]:
+        depths = {priority: 0 for priority in Priority}
+        for priority, _, future, _ in self._waiters:
+            if not future.done():
+                depths[Priority(priority)] += 1
+        return depths
+
+    def _delay(self, tokens: float) -> float:
+        """Kuyruğun başındaki çağrının gönderilebilmesi için beklenecek süre"""
+        delay = max(0.0, self._paused_until - time.monotonic())
+        if self._requests is not None:
+            delay = max(delay, self._requests.wait_time(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.wait_time(tokens))
+        return delay
+
+    async def _dispatch(self):
+        while True:
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)  # iptal edilen bekleyen
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, _, future, tokens = self._waiters[0]
+            delay = self._delay(tokens)
+            if delay > 0:
+                # Daha öncelikli bir çağrı gelirse erken uyan
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._waiters)
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(tokens)
+            future.set_result(None)
+
+    async def acquire(self, tokens: float, priority: Priority) -> float:
+        """Bütçe ve öncelik sırası gelene kadar bekle, beklenen süreyi döndür"""
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        if len(self._waiters) >= self.max_queue:
+            raise ProviderError(
+                f"{self.name} zamanlayıcı kuyruğu dolu",
+                status_code=429,
+                retry_after=max(1.0, self._delay(tokens))
+            )
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), future, tokens))
+        self._wakeup.set()
+        try:
+            await future
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+        waited = time.monotonic() - started
+        self.dispatched += 1
+        self._wait_seconds += waited
+        SCHEDULER_WAIT.observe(waited, self.name, priority.name.lower())
+        return waited
+
+    def settle(self, estimated_tokens: float, actual_tokens: float):
+        """Tahmini token harcamasını gerçekleşenle düzelt"""
+        if self._tokens is not None:
+            self._tokens.take(actual_tokens - estimated_tokens)
+
+    def pause(self, seconds: float):
+        """Upstream 429 döndü: kota paylaşıldığı için tüm gönderimleri beklet"""
+        self.throttled += 1
+        SCHEDULER_THROTTLED.inc(self.name)
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": {priority.name.lower(): depth for priority, depth in self.queue_depths().items()},
+            "dispatched": self.dispatched,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "avg_wait_ms": round(self._wait_seconds / self.dispatched * 1000, 2) if self.dispatched else 0.0,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+        }
+
+
+class ScheduledProvider(AIProvider):
+    """Bir provider'ın önüne zamanlayıcı koy: kuyruk, öncelik, 429 sonrası geri çekilme"""
+
+    def __init__(
+        self,
+        provider: AIProvider,
+        scheduler: UpstreamScheduler,
+        completion_tokens_estimate: int = 1000,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0
+    ):
+        self.provider = provider
+        self.scheduler = scheduler
+        self.completion_tokens_estimate = completion_tokens_estimate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Retry-After varsa ona uy, yoksa full-jitter üstel geri çekilme"""
+        if retry_after is not None:
+            # Aynı anda uyanan isteklerin yeniden çakışmaması için küçük bir sapma ekle
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.1))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _on_throttled(self, error: ProviderError, attempt: int) -> bool:
+        """429 ise beklet ve yeniden denenip denenmeyeceğini döndür"""
+        if error.status_code != 429:
+            return False
+        self.scheduler.pause(self._backoff(attempt, error.retry_after))
+        if attempt >= self.max_retries:
+            return False
+        self.scheduler.retries += 1
+        SCHEDULER_RETRIES.inc(self.scheduler.name)
+        return True
+
+    def _estimate(self, prompt: str) -> int:
+        """Rezervasyon: prompt + beklenen çıktı (çıktı bütçesi verilmişse onu aşamaz)"""
+        completion = self.completion_tokens_estimate
+        return estimate_tokens(prompt) + min(completion, max_output_tokens(completion))
+
+    async def generate_content(self, prompt: str) -> str:
+        estimated = self._estimate(prompt)
+        priority = current_priority()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(estimated, priority)
+            try:
+                result = await self.provider.generate_content(prompt)
+            except ProviderError as e:
+                if not self._on_throttled(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            self.scheduler.settle(estimated, estimate_tokens(prompt) + estimate_tokens(result))
+            return result
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        """İlk parçadan önce gelen 429'lar yeniden denenir, sonrası çağırana iletilir"""
+        estimated = self._estimate(prompt)
+        priority = current_priority()
+        attempt = 0
+        while True:
+            await self.scheduler.acquire(estimated, priority)
+            completion_tokens = 0
+            started = False
+            try:
+                async for chunk in self.provider.stream_content(prompt):
+                    started = True
+                    completion_tokens += estimate_tokens(chunk)
+                    yield chunk
+            except ProviderError as e:
+                if started or not self._on_throttled(e, attempt):
+                    raise
+                attempt += 1
+                continue
+            self.scheduler.settle(estimated, estimate_tokens(prompt) + completion_tokens)
+            return
+
+    async def warm_up(self):
+        await self.provider.warm_up()
+
+    async def check_health(self) -> Dict[str, Any]:
+        return await self.provider.check_health()
+
+    @property
+    def provider_name(self) -> str:
+        return self.provider.provider_name
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
@@ -0,0 +1,117 @@
+"""
+Ruleset markdown'ını adreslenebilir bölümlere ayırma ve bölüm değiştirme
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize_title(text: str) -> str:
+    """'## 5. **Authentication & Authorization**' -> 'authentication and authorization'"""
+    text = text.lower().replace("&", " and ")
+    text = re.sub(r"^\W*\d+[.)]?\s*", "", text)
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _match_title(heading: str, wanted: Dict[str, str]) -> Optional[str]:
+    """Başlık bir bölüm adıyla başlıyorsa ('... - açıklama' gibi) o bölümü tüket"""
+    candidates = [key for key in wanted if heading == key or heading.startswith(key + " ")]
+    if not candidates:
+        return None
+    return wanted.pop(max(candidates, key=len))
+
+
+@dataclass
+class RulesetSection:
+    """Tek bölüm: başlık satırı dahil içerik"""
+    title: str
+    content: str
+
+    @property
+    def heading(self) -> str:
+        return self.content.split("\n", 1)[0].strip()
+
+
+@dataclass
+class ParsedRuleset:
+    """Bölümlere ayrılmış ruleset; render() orijinal metni birebir geri verir"""
+    preamble: str
+    sections: List[RulesetSection] = field(default_factory=list)
+
+    def get(self, title: str) -> Optional[RulesetSection]:
+        for section in self.sections:
+            if section.title == title:
+                return section
+        return None
+
+    def render(self) -> str:
+        return self.preamble + "".join(section.content for section in self.sections)
+
+    def replace(self, replacements: Dict[str, str]) -> "ParsedRuleset":
+        """Verilen bölümlerin içeriğini değiştirilmiş yeni bir kopya döndür"""
+        sections = []
+        for section in self.sections:
+            content = replacements.get(section.title)
+            if content is None:
+                sections.append(section)
+                continue
+            # Bölümler arası boşluğu eski içerikteki gibi koru
+            old_body = section.content.rstrip("\n")
+            trailing = section.content[len(old_body):]
+            sections.append(RulesetSection(section.title, content.rstrip("\n") + (trailing or "\n")))
+        return ParsedRuleset(self.preamble, sections)
+
+
+def parse_sections(markdown: str, titles: Iterable[str]) -> ParsedRuleset:
+    """Bilinen bölüm başlıklarına göre markdown'ı böl
+
+    Başlık eşleşmesi numara, kalın yazı, noktalama ve büyük/küçük harf farklarını
+    yok sayar; kod bloklarının içindeki '#' satırları başlık sayılmaz.
+    Bilinmeyen alt başlıklar bir önceki bölüme dahil edilir.
+    """
+    wanted = {_normalize_title(title): title for title in titles}
+    parsed = ParsedRuleset(preamble="")
+    current: List[str] = []
+    current_title: Optional[str] = None
+    in_code = False
+    # Bölümler ilk eşleşen başlıkla aynı seviyede olmalı ("### State Management" gibi alt başlıklar atlanır)
+    section_level: Optional[int] = None
+
+    def flush():
+        text = "".join(current)
+        if current_title is None:
+            parsed.preamble = text
+        else:
+            parsed.sections.append(RulesetSection(current_title, text))
+
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith(("```", "~~~")):
+            in_code = not in_code
+        elif not in_code:
+            match = _HEADING_RE.match(line)
+            if match and section_level in (None, len(match.group(1))):
+                title = _match_title(_normalize_title(match.group(2)), wanted)
+                if title is not None:
+                    flush()
+                    current, current_title = [], title
+                    section_level = len(match.group(1))
+        current.append(line)
+
+    flush()
+    return parsed
+
+
+def extract_section(content: str, title: str, heading: str) -> str:
+    """Tek bölüm için model çıktısından giriş/kapanış cümlelerini at, başlık yoksa ekle"""
+    section = parse_sections(content, [title]).get(title)
+    if section is None:
+        return f"{heading}\n\n{content.strip()}\n"
+    return section.content.rstrip("\n") + "\n"
+
+
+def ruleset_header(project_type: str, project_category: str) -> str:
+    """Bölüm bölüm üretilen ruleset'lerin ortak başlığı"""
+    return f"# {project_type} Ruleset\n\nAI coding assistant context for a {project_category} project.\n\n"
@@ -0,0 +1,229 @@
+"""
+Neredeyse aynı ProjectInfo'lar için benzerlik indeksi (NumPy kosinüs benzerliği)
+"""
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from app.models.schemas import ProjectInfo
+from app.services.prompt_service import PROMPT_TEMPLATE_VERSION
+from app.core.config import settings
+
+# numpy ağır olduğu için indekse ilk eklemede import edilir: soğuk başlangıçta yüklenmez
+if TYPE_CHECKING:
+    import numpy as np
+# Seçmeli stack alanları: her (alan, değer) çifti one-hot olarak kodlanır
+STACK_FIELDS = (
+    "frontend_framework", "styling_approach", "state_management", "http_client", "ui_library",
+    "build_tool", "testing_framework", "backend_language", "backend_framework", "database_type",
+    "auth_method", "api_style", "orm_tool", "deployment_platform", "testing_requirement",
+)
+# Bu alanlar farklıysa ruleset kesinlikle yeniden kullanılamaz; indeks bunlara göre bölümlenir
+PARTITION_FIELDS = ("project_category", "frontend_framework", "backend_framework", "database_type")
+
+# Stack bloğu: görülen ilk (alan, değer) çiftleri sözlükten kendi sütununu alır (gerçek one-hot),
+# sözlük dolunca gelen nadir değerler küçük bir hash bölgesine düşer
+STACK_VOCABULARY_SIZE = 160
+STACK_OVERFLOW_DIMENSIONS = 32
+STACK_DIMENSIONS = STACK_VOCABULARY_SIZE + STACK_OVERFLOW_DIMENSIONS
+TEXT_DIMENSIONS = 128
+DIMENSIONS = STACK_DIMENSIONS + TEXT_DIMENSIONS
+
+# Toplam benzerlik = 0.8 * stack kosinüsü + 0.2 * metin kosinüsü.
+# 15 stack alanından biri farklıysa benzerlik en fazla 0.8 * 14/15 + 0.2 ≈ 0.947 olur,
+# yani varsayılan 0.95 eşiği yalnızca metin farklarını tolere eder.
+_STACK_WEIGHT = 0.8 ** 0.5
+_TEXT_WEIGHT = 0.2 ** 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9#+]+")
+
+
+def _bucket(feature: str, dimensions: int) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % dimensions
+
+
+def _normalize_value(value) -> str:
+    if value is None:
+        return "none"
+    return " ".join(_TOKEN_RE.findall(str(value).lower())) or "none"
+
+
+def _text_features(text: str) -> List[str]:
+    """Kelime + kelime içi karakter 3-gram'ları ("tailwind" ~ "tailwind css")"""
+    features = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        features.append(token)
+        padded = f"<{token}>"
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+def partition_key(project_info: ProjectInfo, provider: str, model: str) -> Tuple[str, ...]:
+    """Sadece aynı bölümdeki kayıtlar birbirinin yerine kullanılabilir"""
+    return (PROMPT_TEMPLATE_VERSION, provider.lower(), model) + tuple(
+        _normalize_value(getattr(project_info, field)) for field in PARTITION_FIELDS
+    )
+
+
+class StackVocabulary:
+    """(alan, değer) -> stack sütunu eşlemesi; atanan sütun bir daha değişmez"""
+
+    def __init__(self, size: int = STACK_VOCABULARY_SIZE):
+        self.size = size
+        self._slots: Dict[str, int] = {}
+
+    def slot(self, feature: str) -> int:
+        slot = self._slots.get(feature)
+        if slot is None:
+            if len(self._slots) >= self.size:
+                return self.size + _bucket(feature, STACK_OVERFLOW_DIMENSIONS)
+            slot = self._slots[feature] = len(self._slots)
+        return slot
+
+
+def encode(project_info: ProjectInfo, vocabulary: StackVocabulary) -> "np.ndarray":
+    """ProjectInfo için birim uzunlukta özellik vektörü"""
+    import numpy as np
+    stack = np.zeros(STACK_DIMENSIONS, dtype=np.float32)
+    for field in STACK_FIELDS:
+        stack[vocabulary.slot(f"{field}={_normalize_value(getattr(project_info, field))}")] = 1.0
+
+    text = np.zeros(TEXT_DIMENSIONS, dtype=np.float32)
+    free_text = " ".join(filter(None, (
+        project_info.project_type,
+        project_info.code_style,
+        " ".join(project_info.additional_requirements or []),
+        project_info.notes,
+    )))
+    for feature in _text_features(free_text):
+        text[_bucket(feature, TEXT_DIMENSIONS)] += 1.0
+
+    vector = np.empty(DIMENSIONS, dtype=np.float32)
+    vector[:STACK_DIMENSIONS] = stack * (_STACK_WEIGHT / np.linalg.norm(stack))
+    text_norm = np.linalg.norm(text)
+    vector[STACK_DIMENSIONS:] = text * (_TEXT_WEIGHT / text_norm) if text_norm else 0.0
+    return vector
+
+
+@dataclass
+class SemanticMatch:
+    """Benzerlik araması sonucu"""
+    cache_key: str
+    similarity: float
+
+
+class _Partition:
+    """Tek bölümün vektör matrisi (satır satır, kapasite iki katına çıkarak büyür)"""
+
+    def __init__(self):
+        import numpy as np
+        self.matrix = np.empty((16, DIMENSIONS), dtype=np.float32)
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: str, vector: "np.ndarray"):
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == len(self.matrix):
+                import numpy as np
+                grown = np.empty((row * 2, DIMENSIONS), dtype=np.float32)
+                grown[:row] = self.matrix
+                self.matrix = grown
+            self.keys.append(key)
+            self.rows[key] = row
+        self.matrix[row] = vector
+
+    def remove(self, key: str):
+        # Son satırı silinen satırın yerine taşı
+        row = self.rows.pop(key)
+        last = len(self.keys) - 1
+        last_key = self.keys.pop()
+        if row != last:
+            self.matrix[row] = self.matrix[last]
+            self.keys[row] = last_key
+            self.rows[last_key] = row
+
+    def best(self, vector: "np.ndarray") -> Tuple[str, float]:
+        scores = self.matrix[:len(self.keys)] @ vector
+        row = int(scores.argmax())
+        return self.keys[row], float(scores[row])
+
+
+class SemanticIndex:
+    """Önceden üretilmiş ruleset'lerin cache anahtarlarını benzerliğe göre bulan indeks"""
+
+    def __init__(self, threshold: float, max_entries: int):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.vocabulary = StackVocabulary()
+        self._partitions: Dict[Tuple[str, ...], _Partition] = {}
+        # Ekleme sırası (en eski kayıt önce çıkarılır): cache anahtarı -> bölüm
+        self._order: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self.lookups = 0
+        self.matches = 0
+        self._lookup_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, cache_key: str, project_info: ProjectInfo, provider: str, model: str):
+        """Üretilmiş bir ruleset'i indekse ekle"""
+        partition = partition_key(project_info, provider, model)
+        if cache_key in self._order:
+            self._order.move_to_end(cache_key)
+        else:
+            self._order[cache_key] = partition
+        self._partitions.setdefault(partition, _Partition()).add(cache_key, encode(project_info, self.vocabulary))
+
+        while len(self._order) > self.max_entries:
+            self.discard(next(iter(self._order)))
+
+    def discard(self, cache_key: str):
+        """Cache'ten düşmüş bir kaydı indeksten çıkar"""
+        partition = self._order.pop(cache_key, None)
+        if partition is None:
+            return
+        entries = self._partitions[partition]
+        entries.remove(cache_key)
+        if not entries:
+            del self._partitions[partition]
+
+    def lookup(self, project_info: ProjectInfo, provider: str, model: str) -> Optional[SemanticMatch]:
+        """Eşiği geçen en benzer kaydı bul"""
+        started = time.perf_counter()
+        self.lookups += 1
+        try:
+            entries = self._partitions.get(partition_key(project_info, provider, model))
+            if entries is None:
+                return None
+            cache_key, similarity = entries.best(encode(project_info, self.vocabulary))
+            if similarity < self.threshold:
+                return None
+            self.matches += 1
+            return SemanticMatch(cache_key=cache_key, similarity=similarity)
+        finally:
+            self._lookup_seconds += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._order),
+            "partitions": len(self._partitions),
+            "largest_partition": max((len(p) for p in self._partitions.values()), default=0),
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "avg_lookup_ms": round(self._lookup_seconds / self.lookups * 1000, 4) if self.lookups else 0.0,
+        }
+
+
+# Global semantic index instance
+semantic_index = SemanticIndex(
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+)
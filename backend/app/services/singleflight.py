@@ -0,0 +1,76 @@
+"""
+Aynı anda gelen özdeş istekleri tek upstream çağrısında birleştirme
+"""
+import asyncio
+import hashlib
+from typing import Awaitable, Callable, Dict, Any, TypeVar
+
+T = TypeVar("T")
+
+
+def prompt_key(prompt: str, *parts: str) -> str:
+    """Boşluk farklarından bağımsız prompt anahtarı"""
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256("\x00".join((*parts, normalized)).encode("utf-8")).hexdigest()
+
+
+class _Call:
+    """Devam eden tek bir upstream çağrısı"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Anahtar başına tek bir uçuşta olan çağrı"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.cancelled_waiters = 0
+        self.abandoned = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Aynı anahtar için çalışan çağrı varsa ona katıl, yoksa başlat"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(factory()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task: self._forget(key, call))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield: bir bekleyenin iptali paylaşılan çağrıyı iptal etmesin
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if not call.task.done():
+                self.cancelled_waiters += 1
+            raise
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Sonucu bekleyen kimse kalmadı, upstream çağrısını bırak
+                call.task.cancel()
+                self.abandoned += 1
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Bekleyeni kalmamış görevlerde "exception never retrieved" uyarısını önle
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Birleştirme metrikleri"""
+        return {
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._calls),
+            "cancelled_waiters": self.cancelled_waiters,
+            "abandoned": self.abandoned,
+        }
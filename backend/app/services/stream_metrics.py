@@ -0,0 +1,32 @@
+"""
+Streaming üretim için algılanan gecikme metrikleri
+"""
+from typing import Dict, Any
+from app.services.latency_stats import LatencyWindow
+
+
+class StreamMetrics:
+    """İstek başına ilk/son byte sürelerini topla"""
+
+    def __init__(self, window_size: int = 500):
+        self.time_to_first_byte = LatencyWindow(window_size)
+        self.time_to_last_byte = LatencyWindow(window_size)
+        self.errors = 0
+
+    def record(self, ttfb: float, ttlb: float):
+        self.time_to_first_byte.add(ttfb)
+        self.time_to_last_byte.add(ttlb)
+
+    def record_error(self):
+        self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "time_to_first_byte": self.time_to_first_byte.summary(),
+            "time_to_last_byte": self.time_to_last_byte.summary(),
+            "errors": self.errors,
+        }
+
+
+# Global streaming metrics instance
+stream_metrics = StreamMetrics()
@@ -0,0 +1,258 @@
+"""
+Uyarlanabilir çıktı token bütçesi: (kategori, proje tipi, provider) başına öğrenilen max_tokens
+ve limite takılıp kesilen cevapların otomatik devam ettirilmesi
+"""
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from app.models.schemas import ProjectInfo
+from app.services.ai_provider import GenerationLimits, generation_limits_scope
+from app.services.latency_stats import percentile
+from app.services.metrics import registry, estimate_tokens
+from app.services.prompt_service import PromptService
+from app.services.section_service import parse_sections
+from app.core.config import settings
+
+BudgetKey = Tuple[str, str, str]
+
+
+@dataclass
+class BudgetRequest:
+    """Bütçelenecek tek üretim: istatistik anahtarı ve çıktıda beklenen bölüm başlıkları"""
+    key: BudgetKey
+    expected_titles: List[str]
+
+    @classmethod
+    def for_ruleset(cls, project_info: ProjectInfo, provider_name: str) -> "BudgetRequest":
+        return cls(
+            key=(project_info.project_category, project_info.project_type, provider_name),
+            expected_titles=[title for title, _ in PromptService.get_sections(project_info.project_category)]
+        )
+
+
+def _open_fence(text: str) -> bool:
+    """Metin açık kalmış bir kod bloğuyla mı bitiyor"""
+    fences = sum(1 for line in text.splitlines() if line.lstrip().startswith(("```", "~~~")))
+    return fences % 2 == 1
+
+
+def _closing(text: str) -> str:
+    """Kesilen metnin sonuna eklenecek kapanış (yeni satır + açık kod bloğu)"""
+    tail = "" if text.endswith("\n") else "\n"
+    return tail + ("```\n" if _open_fence(text) else "")
+
+
+class TokenBudgeter:
+    """Gerçek çıktı uzunluklarının yüksek yüzdeliği + pay ile sıkı max_tokens tahmini"""
+
+    def __init__(
+        self,
+        default_max_tokens: int = 4000,
+        target_percentile: float = 95,
+        margin: float = 0.15,
+        min_samples: int = 20,
+        window: int = 200,
+        min_tokens: int = 256,
+        max_continuations: int = 2
+    ):
+        self.default_max_tokens = default_max_tokens
+        self.target_percentile = target_percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.window = window
+        self.min_tokens = min_tokens
+        self.max_continuations = max_continuations
+        self._samples: Dict[BudgetKey, Deque[int]] = {}
+        self.requests = 0
+        self.learned = 0  # Öğrenilmiş (varsayılandan sıkı olabilecek) bütçeyle yapılan istekler
+        self.budget_tokens = 0
+        self.reserved_tokens_saved = 0
+        self.completion_tokens = 0
+        self.truncated = 0
+        self.continuations = 0
+        self.continuation_tokens = 0
+        self.clipped = 0
+        self.incomplete = 0
+
+    def predict(self, key: BudgetKey) -> Optional[int]:
+        """Öğrenilmiş bütçe; yeterli örnek yoksa None"""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        budget = math.ceil(percentile(samples, self.target_percentile) * (1 + self.margin))
+        return min(self.default_max_tokens, max(self.min_tokens, budget))
+
+    def record(self, key: BudgetKey, tokens: int):
+        """Bir üretimin toplam çıktı token sayısını kaydet"""
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(tokens)
+
+    def _begin(self, key: BudgetKey) -> int:
+        budget = self.predict(key)
+        self.requests += 1
+        if budget is None:
+            budget = self.default_max_tokens
+        else:
+            self.learned += 1
+        self.budget_tokens += budget
+        self.reserved_tokens_saved += self.default_max_tokens - budget
+        return budget
+
+    def _count(self, limits: GenerationLimits, text: str, attempt: int) -> int:
+        # Provider kullanım bilgisi vermediyse yaklaşık say
+        tokens = limits.completion_tokens or estimate_tokens(text)
+        if attempt:
+            self.continuation_tokens += tokens
+        return tokens
+
+    @staticmethod
+    def _structurally_complete(text: str, expected_titles: List[str]) -> bool:
+        """Beklenen bütün bölümler var ve son bölümün en az bir tam satırı yazılmış mı"""
+        if not expected_titles:
+            return False
+        parsed = parse_sections(text, expected_titles)
+        if len(parsed.sections) < len(expected_titles):
+            return False
+        body = parsed.sections[-1].content.partition("\n")[2]
+        return bool(body[:body.rfind("\n") + 1].strip())
+
+    def _outcome(self, limits: GenerationLimits, text: str, attempt: int, request: BudgetRequest) -> str:
+        """Segment sonrası karar: "done", "clipped", "continue" veya "incomplete" """
+        if not limits.truncated:
+            return "done"
+        if attempt == 0:
+            self.truncated += 1
+        if attempt < self.max_continuations:
+            # Bütün bölümler yazılmış olsa da son bölüm yarım: kırpmak yerine devam ettir
+            self.continuations += 1
+            return "continue"
+        # Devam hakkı bitti: bölümler tamamsa yalnız yarım kalan kuyruk kırpılır
+        if self._structurally_complete(text, request.expected_titles):
+            return "clipped"
+        return "incomplete"
+
+    def _continuation_budget(self, produced: int) -> int:
+        """Devam çağrısı varsayılan limitin kalanını kullanır"""
+        return max(self.min_tokens, self.default_max_tokens - produced)
+
+    def _finish(self, key: BudgetKey, produced: int, outcome: str):
+        self.completion_tokens += produced
+        if outcome == "clipped":
+            self.clipped += 1
+        elif outcome == "incomplete":
+            self.incomplete += 1
+        else:
+            # Sadece tamamlanan cevapların uzunluğu öğrenilir; kesilen uzunluk bütçeyi aşağı çekerdi
+            self.record(key, produced)
+
+    async def generate(
+        self,
+        generate: Callable[[str], Awaitable[str]],
+        prompt: str,
+        request: BudgetRequest
+    ) -> str:
+        """Bütçeli üretim; kesilirse kaldığı yerden devam ettirir"""
+        budget = self._begin(request.key)
+        text, produced = "", 0
+        for attempt in range(self.max_continuations + 1):
+            source = prompt if attempt == 0 else PromptService.continuation_prompt(prompt, text)
+            with generation_limits_scope(budget) as limits:
+                part = await generate(source)
+            text += part
+            produced += self._count(limits, part, attempt)
+            outcome = self._outcome(limits, text, attempt, request)
+            if outcome != "continue":
+                break
+            budget = self._continuation_budget(produced)
+
+        if outcome == "clipped":
+            # Yarım kalan son satırı at, açık kod bloğunu kapat
+            text = text[:text.rfind("\n") + 1] or text
+            text += _closing(text)
+        self._finish(request.key, produced, outcome)
+        return text
+
+    async def stream(
+        self,
+        stream: Callable[[str], AsyncIterator[str]],
+        prompt: str,
+        request: BudgetRequest
+    ) -> AsyncIterator[str]:
+        """Bütçeli akış; kesilirse devam parçaları aynı akışa eklenir"""
+        budget = self._begin(request.key)
+        text, produced = "", 0
+        for attempt in range(self.max_continuations + 1):
+            source = prompt if attempt == 0 else PromptService.continuation_prompt(prompt, text)
+            chunks = []
+            with generation_limits_scope(budget) as limits:
+                async for chunk in stream(source):
+                    chunks.append(chunk)
+                    yield chunk
+            part = "".join(chunks)
+            text += part
+            produced += self._count(limits, part, attempt)
+            outcome = self._outcome(limits, text, attempt, request)
+            if outcome != "continue":
+                break
+            budget = self._continuation_budget(produced)
+
+        if outcome == "clipped":
+            # Gönderilmiş metin geri alınamaz; sadece satırı ve açık kod bloğunu kapat
+            closing = _closing(text)
+            if closing:
+                yield closing
+        self._finish(request.key, produced, outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        """Bütçe ve tasarruf raporu"""
+        requests = self.requests or 1
+        keys = {}
+        for key, samples in self._samples.items():
+            keys["/".join(key)] = {
+                "samples": len(samples),
+                f"p{self.target_percentile:g}_tokens": percentile(samples, self.target_percentile),
+                "budget": self.predict(key) or self.default_max_tokens,
+            }
+        return {
+            "enabled": settings.TOKEN_BUDGET_ENABLED,
+            "default_max_tokens": self.default_max_tokens,
+            "requests": self.requests,
+            "learned_budget_requests": self.learned,
+            "avg_budget_tokens": round(self.budget_tokens / requests, 1),
+            "avg_completion_tokens": round(self.completion_tokens / requests, 1),
+            "reserved_tokens_saved": self.reserved_tokens_saved,
+            "truncated": self.truncated,
+            "continuations": self.continuations,
+            "continuation_tokens": self.continuation_tokens,
+            "clipped": self.clipped,
+            "incomplete": self.incomplete,
+            "keys": keys,
+        }
+
+
+# Global token budgeter instance
+token_budgeter = TokenBudgeter(
+    default_max_tokens=settings.TOKEN_BUDGET_DEFAULT_MAX_TOKENS,
+    target_percentile=settings.TOKEN_BUDGET_PERCENTILE,
+    margin=settings.TOKEN_BUDGET_MARGIN,
+    min_samples=settings.TOKEN_BUDGET_MIN_SAMPLES,
+    window=settings.TOKEN_BUDGET_WINDOW,
+    min_tokens=settings.TOKEN_BUDGET_MIN_TOKENS,
+    max_continuations=settings.TOKEN_BUDGET_MAX_CONTINUATIONS
+)
+
+registry.callback_counter(
+    "ruleset_token_budget_reserved_tokens_saved_total",
+    "Öğrenilmiş bütçeyle varsayılan max_tokens'a göre daha az ayrılan çıktı token'ları",
+    lambda: token_budgeter.reserved_tokens_saved
+)
+registry.callback_counter(
+    "ruleset_token_budget_truncations_total", "Çıktı bütçesine takılıp kesilen üretimler", lambda: token_budgeter.truncated
+)
+registry.callback_counter(
+    "ruleset_token_budget_continuations_total", "Kesilen cevaplar için yapılan devam çağrıları",
+    lambda: token_budgeter.continuations
+)
@@ -0,0 +1,132 @@
+"""
+Kabul kontrolü (admission control) aşırı yük benchmark'ı
+
+Provider sabit kapasiteli simüle edilir (aynı anda `capacity` istek, her biri
+`service_time` saniye; fazlası provider içinde sıraya girer). Kapasitenin üstünde
+açık döngü (open-loop) yük /generate-ruleset'e uygulanır; kabul kontrolü kapalı ve
+açıkken kabul edilen isteklerin gecikmesi ve atılan istekler karşılaştırılır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.admission_benchmark --rate 80 --duration 5 --capacity 8
+"""
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Any
+import httpx
+import main as app_main
+from app.core.config import settings
+from app.services.admission import admission_controller
+from app.services.ai_provider import AIProvider
+from app.services.ai_service import ai_service
+from app.services.latency_stats import percentile
+
+STUB_RULESET = "# Project Ruleset\n\n## 1. Agent Role Definition\nYou are a senior developer.\n"
+
+
+class CapacityProvider(AIProvider):
+    """Aynı anda en fazla `capacity` isteği işleyen, fazlasını sıraya koyan provider"""
+
+    def __init__(self, capacity: int, service_time: float):
+        self.service_time = service_time
+        self._slots = asyncio.Semaphore(capacity)
+
+    async def generate_content(self, prompt: str) -> str:
+        async with self._slots:
+            await asyncio.sleep(self.service_time)
+        return STUB_RULESET
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        yield await self.generate_content(prompt)
+
+    async def check_health(self) -> Dict[str, Any]:
+        return {"available": True}
+
+    @property
+    def provider_name(self) -> str:
+        return "capacity"
+
+    @property
+    def model_name(self) -> str:
+        return "capacity"
+
+
+async def run_case(args: argparse.Namespace, admission: bool) -> dict:
+    settings.ADMISSION_ENABLED = admission
+    controller = admission_controller
+    controller.limit = float(args.initial_limit)
+    controller.min_limit = 2
+    controller.max_queue = args.max_queue
+    controller.queue_timeout = args.queue_timeout
+    controller.client_share = 1.0
+    ai_service.provider = ai_service._schedule(CapacityProvider(args.capacity, args.service_time))
+
+    accepted, statuses = [], {}
+    body = {"project_category": "backend", "project_type": "REST API"}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app_main.app), base_url="http://bench", timeout=None, limits=limits
+    ) as client:
+        async def one(index: int):
+            started = time.perf_counter()
+            response = await client.post(
+                "/generate-ruleset?cache=bypass", json={**body, "notes": f"request {index}"},
+                headers={"X-API-Key": f"client-{index % args.clients}"}
+            )
+            elapsed = time.perf_counter() - started
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                accepted.append(elapsed)
+
+        tasks = []
+        interval = 1 / args.rate
+        started = time.perf_counter()
+        for index in range(int(args.rate * args.duration)):
+            # Açık döngü: cevapları beklemeden sabit hızla yeni istek
+            delay = started + index * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(index)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "statuses": statuses,
+        "goodput": len(accepted) / elapsed,
+        "p50_ms": (percentile(accepted, 50) or 0) * 1000,
+        "p99_ms": (percentile(accepted, 99) or 0) * 1000,
+        "max_ms": max(accepted, default=0) * 1000,
+        "limit": controller.current_limit,
+    }
+
+
+async def main(args: argparse.Namespace):
+    settings.CACHE_ENABLED = False
+    settings.RULESET_DB_PATH = ""
+    capacity_rps = args.capacity / args.service_time
+    print(
+        f"Yük {args.rate:.0f} istek/s x {args.duration:.0f}s, provider kapasitesi {capacity_rps:.0f} istek/s "
+        f"({args.capacity} eşzamanlı x {args.service_time * 1000:.0f} ms), {args.clients} istemci\n"
+    )
+    print(f"{'kabul':<7} {'200':>5} {'429':>5} {'503':>5} {'istek/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'limit':>6}")
+    for admission in (False, True):
+        result = await run_case(args, admission)
+        statuses = result["statuses"]
+        print(
+            f"{'açık' if admission else 'kapalı':<7} {statuses.get(200, 0):>5} {statuses.get(429, 0):>5} "
+            f"{statuses.get(503, 0):>5} {result['goodput']:>8.1f} {result['p50_ms']:>8.0f} "
+            f"{result['p99_ms']:>8.0f} {result['max_ms']:>8.0f} {result['limit'] if admission else '-':>6}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kabul kontrolü aşırı yük benchmark'ı")
+    parser.add_argument("--rate", type=float, default=80, help="saniyedeki yeni istek sayısı")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--capacity", type=int, default=8, help="provider'ın eşzamanlı işleyebildiği istek")
+    parser.add_argument("--service-time", type=float, default=0.2, help="istek başına provider süresi (s)")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--initial-limit", type=int, default=32)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--queue-timeout", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""
+Ruleset paketi benchmark'ı: paket boyutu, soğuk açılış ve arama süresi
+
+Katalog çapraz çarpımından `--entries` kombinasyon fake provider ile (gecikmesiz)
+üretilip pakete yazılır. Sonra paketin açılışı (mmap + başlık), ilk isabet, sıcak
+isabet/ıska aramaları ve aynı isteğin provider üzerinden üretimi ölçülür.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.bundle_benchmark --entries 2000 --output-tokens 800
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from app.cli.pregenerate import combinations_from_catalog
+from app.services.fake_provider import FakeProvider
+from app.services.latency_stats import percentile
+from app.services.prompt_service import PromptService
+from app.services.ruleset_bundle import RulesetBundle, write_bundle
+
+
+def timed(repeats: int, function) -> dict:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return {"p50_us": percentile(samples, 50) * 1e6, "p99_us": percentile(samples, 99) * 1e6}
+
+
+async def main(args: argparse.Namespace):
+    combinations = [info for info, _ in combinations_from_catalog(args.entries)]
+    provider = FakeProvider(latency_mean=0, tokens_per_second=0, output_tokens=args.output_tokens)
+    records = []
+    for info in combinations:
+        markdown = await provider.generate_content(PromptService.generate_ruleset_prompt(info))
+        records.append((info, markdown, provider.provider_name))
+    raw_bytes = sum(len(markdown.encode("utf-8")) for _, markdown, _ in records)
+
+    path = os.path.join(tempfile.mkdtemp(), "rulesets.bundle")
+    started = time.perf_counter()
+    count = write_bundle(path, records)
+    write_seconds = time.perf_counter() - started
+    print(
+        f"paket: {count} ruleset, {os.path.getsize(path) / 1024:.0f} KiB "
+        f"(markdown toplamı {raw_bytes / 1024:.0f} KiB), yazma {write_seconds * 1000:.0f} ms\n"
+    )
+
+    hit = combinations[len(combinations) // 2]
+    miss = hit.model_copy(update={"notes": "custom requirement"})
+    open_samples, first_hit_samples = [], []
+    for _ in range(args.repeats):
+        bundle = RulesetBundle(path)
+        started = time.perf_counter()
+        bundle.load()
+        opened = time.perf_counter()
+        bundle.get(hit)
+        open_samples.append(opened - started)
+        first_hit_samples.append(time.perf_counter() - opened)
+        bundle.close()
+
+    bundle = RulesetBundle(path)
+    bundle.load()
+    steps = {
+        "açılış (mmap + başlık)": {
+            "p50_us": percentile(open_samples, 50) * 1e6, "p99_us": percentile(open_samples, 99) * 1e6
+        },
+        "ilk isabet": {
+            "p50_us": percentile(first_hit_samples, 50) * 1e6, "p99_us": percentile(first_hit_samples, 99) * 1e6
+        },
+        "isabet": timed(args.repeats, lambda: bundle.get(hit)),
+        "ıska": timed(args.repeats, lambda: bundle.get(miss)),
+    }
+    print(f"{'adım':<24} {'p50 µs':>10} {'p99 µs':>10}")
+    for name, result in steps.items():
+        print(f"{name:<24} {result['p50_us']:>10.1f} {result['p99_us']:>10.1f}")
+
+    provider = FakeProvider.from_settings()
+    samples = []
+    for _ in range(args.provider_repeats):
+        started = time.perf_counter()
+        await provider.generate_content(PromptService.generate_ruleset_prompt(hit))
+        samples.append(time.perf_counter() - started)
+    print(
+        f"\nkarşılaştırma, fake provider (FAKE_* ayarları) ile üretim: "
+        f"p50 {percentile(samples, 50) * 1000:.0f} ms, p99 {percentile(samples, 99) * 1000:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Önceden üretilmiş ruleset paketi benchmark'ı")
+    parser.add_argument("--entries", type=int, default=2000, help="paketteki kombinasyon sayısı")
+    parser.add_argument("--output-tokens", type=int, default=800, help="fake provider çıktı uzunluğu (kelime)")
+    parser.add_argument("--repeats", type=int, default=2000)
+    parser.add_argument("--provider-repeats", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
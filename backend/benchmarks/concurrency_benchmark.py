@@ -0,0 +1,103 @@
+"""
+Provider eşzamanlılık benchmark'ı
+
+N paralel üretimin, bloklayan ve bloklamayan provider'larda ne kadar
+sürdüğünü ve event loop'un ne kadar donduğunu ölçer.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.concurrency_benchmark --requests 20 --latency 0.5
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Any
+from app.services.ai_provider import AIProvider, run_in_threadpool
+
+
+class _SimulatedProvider(AIProvider):
+    """Sabit gecikmeli simüle provider"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def check_health(self) -> Dict[str, Any]:
+        return {"available": True}
+
+    @property
+    def provider_name(self) -> str:
+        return "simulated"
+
+    @property
+    def model_name(self) -> str:
+        return "simulated"
+
+
+class BlockingProvider(_SimulatedProvider):
+    """async def içinde senkron SDK çağrısı (eski davranış)"""
+
+    async def generate_content(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        return prompt
+
+
+class AsyncProvider(_SimulatedProvider):
+    """Gerçek async I/O"""
+
+    async def generate_content(self, prompt: str) -> str:
+        await asyncio.sleep(self.latency)
+        return prompt
+
+
+class ThreadpoolProvider(_SimulatedProvider):
+    """Senkron SDK çağrısı, thread havuzu üzerinden"""
+
+    async def generate_content(self, prompt: str) -> str:
+        await run_in_threadpool(time.sleep, self.latency)
+        return prompt
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Event loop'taki en büyük gecikmeyi ölç"""
+    max_lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started - interval)
+    return max_lag
+
+
+async def run_case(provider: AIProvider, requests: int) -> Dict[str, float]:
+    """N paralel üretimi çalıştır"""
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_measure_loop_lag(stop))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(provider.generate_content(f"prompt-{i}") for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    max_lag = await lag_task
+    return {"wall_seconds": elapsed, "max_loop_lag_seconds": max_lag}
+
+
+async def main(requests: int, latency: float):
+    print(f"{requests} paralel üretim, üretim başına {latency:.2f}s gecikme\n")
+    print(f"{'provider':<12} {'wall (s)':>10} {'x tek istek':>12} {'max loop lag (s)':>18}")
+
+    for name, provider in (
+        ("blocking", BlockingProvider(latency)),
+        ("threadpool", ThreadpoolProvider(latency)),
+        ("async", AsyncProvider(latency)),
+    ):
+        result = await run_case(provider, requests)
+        ratio = result["wall_seconds"] / latency
+        print(f"{name:<12} {result['wall_seconds']:>10.3f} {ratio:>12.2f} {result['max_loop_lag_seconds']:>18.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Provider eşzamanlılık benchmark'ı")
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency))
@@ -0,0 +1,56 @@
+"""
+Yerel dışa aktarma benchmark'ı: tek bir üretimden bütün formatların render süresi
+
+Fake provider ile kategori başına bir ruleset üretilir (tek provider çağrısı), sonra
+bölüm ayrıştırma, bölüm ağacı, her format ve zip arşivi ayrı ayrı ölçülür.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.export_benchmark --output-tokens 4000 --repeats 200
+"""
+import argparse
+import asyncio
+import time
+from app.models.schemas import ProjectInfo
+from app.services.export_service import EXPORT_FORMATS, RulesetDocument, render_exports, zip_exports
+from app.services.fake_provider import FakeProvider
+from app.services.latency_stats import percentile
+from app.services.prompt_service import PromptService
+from app.services.section_service import parse_sections
+
+
+def timed(repeats: int, function) -> dict:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return {"p50_ms": percentile(samples, 50) * 1000, "p95_ms": percentile(samples, 95) * 1000}
+
+
+async def main(args: argparse.Namespace):
+    provider = FakeProvider(latency_mean=0, tokens_per_second=0, output_tokens=args.output_tokens)
+    print(f"{'kategori':<10} {'adım':<12} {'p50 ms':>8} {'p95 ms':>8}")
+    for category in ("frontend", "backend", "fullstack"):
+        info = ProjectInfo(project_category=category, project_type="Web Application")
+        markdown = await provider.generate_content(PromptService.generate_ruleset_prompt(info))
+        titles = [title for title, _ in PromptService.get_sections(category)]
+        project_info = info.model_dump()
+        document = RulesetDocument.from_parsed(parse_sections(markdown, titles), project_info)
+
+        steps = {
+            "ayrıştırma": lambda: RulesetDocument.from_parsed(parse_sections(markdown, titles), project_info),
+            **{name: (lambda name=name: render_exports(document, [name])) for name in EXPORT_FORMATS},
+            "zip (hepsi)": lambda: zip_exports(render_exports(document)),
+        }
+        for name, function in steps.items():
+            result = timed(args.repeats, function)
+            print(f"{category:<10} {name:<12} {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f}")
+
+    print(f"\nprovider çağrısı: {provider.calls} (kategori başına bir üretim, dışa aktarmalar yerel)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ruleset dışa aktarma benchmark'ı")
+    parser.add_argument("--output-tokens", type=int, default=4000, help="fake provider çıktı uzunluğu (kelime)")
+    parser.add_argument("--repeats", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,125 @@
+"""
+Soğuk başlangıç import süresi profili
+
+Her ölçüm ayrı bir Python sürecinde yapılır (modül cache'i boş). Uygulama
+import süresi, seçili provider'ın ilk kullanımda oluşturulma süresi ve
+`-X importtime` çıktısından en pahalı modüller raporlanır. İlk kullanımda yüklenmesi
+gereken ağır modüllerden biri (LAZY_MODULES) uygulama import'unda yüklenirse ya da
+`--budget-ms` verilip medyan import süresi bütçeyi aşarsa çıkış kodu 1 olur
+(CI'da başlangıç süresi gerilemelerini yakalamak için).
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.import_time --runs 5
+    python -m benchmarks.import_time --entry api --provider openai --budget-ms 800
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "main": "import main",
+    # Vercel giriş noktası
+    "api": "import runpy; runpy.run_path(os.path.join(backend, '..', 'api', 'index.py'))",
+}
+
+# Sadece kullanıldıkları yolda import edilen ağır modüller (provider SDK'ları, semantik cache indeksi)
+LAZY_MODULES = ("numpy", "google.generativeai", "openai")
+
+_MEASURE = """
+import os, sys, time, json
+backend = {backend!r}
+sys.path.insert(0, backend)
+os.chdir(backend)
+started = time.perf_counter()
+{statement}
+imported = time.perf_counter()
+eager = [name for name in {lazy_modules!r} if name in sys.modules]
+from app.services.ai_service import ai_service
+ai_service.provider
+initialized = time.perf_counter()
+print(json.dumps({{"import": imported - started, "provider_init": initialized - imported, "eager": eager}}))
+"""
+
+
+def _environment(provider: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env["AI_PROVIDER"] = provider
+    env.pop("AI_PROVIDERS", None)
+    env.setdefault("GEMINI_API_KEY", "import-benchmark")
+    env.setdefault("OPENAI_API_KEY", "import-benchmark")
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def _code(entry: str) -> str:
+    return _MEASURE.format(backend=BACKEND_DIR, statement=ENTRY_POINTS[entry], lazy_modules=LAZY_MODULES)
+
+
+def measure(entry: str, provider: str) -> Dict[str, Any]:
+    """Taze bir süreçte uygulamayı import et; süreler ve erken yüklenen ağır modüller"""
+    code = _code(entry)
+    output = subprocess.run(
+        [sys.executable, "-c", code], env=_environment(provider),
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_modules(entry: str, provider: str, limit: int) -> List[Tuple[str, int]]:
+    """-X importtime çıktısından kendi süresi en yüksek modüller (mikrosaniye)"""
+    code = _code(entry)
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=_environment(provider),
+        capture_output=True, text=True, check=True
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us)))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soğuk başlangıç import süresi profili")
+    parser.add_argument("--entry", choices=tuple(ENTRY_POINTS), default="main")
+    parser.add_argument("--provider", default="gemini")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="listelenecek en pahalı modül sayısı")
+    parser.add_argument("--budget-ms", type=float, help="medyan import süresi bu değeri aşarsa başarısız ol")
+    args = parser.parse_args()
+
+    samples = [measure(args.entry, args.provider) for _ in range(args.runs)]
+    imports = [sample["import"] * 1000 for sample in samples]
+    inits = [sample["provider_init"] * 1000 for sample in samples]
+    median_import = statistics.median(imports)
+    eager = sorted({name for sample in samples for name in sample["eager"]})
+
+    print(f"Giriş: {args.entry}, provider: {args.provider}, {args.runs} ölçüm")
+    print(f"app import      medyan {median_import:8.1f} ms  (min {min(imports):.1f}, max {max(imports):.1f})")
+    print(f"provider init   medyan {statistics.median(inits):8.1f} ms  (ilk kullanımda / startup'ta)")
+    print(f"erken yüklenen  {', '.join(eager) if eager else 'yok'}  (beklenen: {', '.join(LAZY_MODULES)} ilk kullanımda)")
+    print(f"\nEn pahalı {args.top} modül (kendi süresi):")
+    for name, self_us in slowest_modules(args.entry, args.provider, args.top):
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if eager:
+        print(f"\nAğır modüller uygulama import'unda yüklendi: {', '.join(eager)}")
+        failed = True
+    if args.budget_ms is not None and median_import > args.budget_ms:
+        print(f"\nBütçe aşıldı: {median_import:.1f} ms > {args.budget_ms:.1f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
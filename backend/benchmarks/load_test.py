@@ -0,0 +1,282 @@
+"""
+API yük testi (FakeProvider ile, gerçek API maliyeti olmadan)
+
+/generate-ruleset, /health ve metadata uç noktalarını hedef RPS'te
+açık döngü (open-loop) olarak çağırır; uç nokta başına throughput,
+p50/p95/p99 ve sunucu event loop gecikmesini raporlar. Gecikmeler
+isteğin planlanan başlangıç zamanından ölçülür (coordinated omission yok).
+
+İki taşıma modu:
+    asgi     uygulama aynı süreçte, httpx ASGITransport üzerinden
+    uvicorn  uygulama ayrı thread'de gerçek bir uvicorn sunucusunda (HTTP + bağlantı
+             yönetimi dahil; istemci aynı süreçte olduğundan GIL'i paylaşır)
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.load_test --transport asgi --rps 200 --duration 10
+    python -m benchmarks.load_test --transport uvicorn --rps 100 --fake-latency 0.2 --fake-error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# uç nokta=ağırlık - ağırlıklar isteklerin dağılımını belirler
+DEFAULT_MIX = "generate=6,health=2,project-types=1,frameworks=1"
+
+ENDPOINTS = {
+    "generate": ("POST", "/generate-ruleset"),
+    "stream": ("POST", "/generate-ruleset/stream"),
+    "health": ("GET", "/health"),
+    "project-types": ("GET", "/project-types"),
+    "frameworks": ("GET", "/frameworks"),
+}
+
+
+def _configure_fake_provider(args: argparse.Namespace):
+    """Ayarlar import sırasında okunduğu için uygulamadan önce ortamı hazırla"""
+    os.environ["AI_PROVIDER"] = "fake"
+    os.environ.pop("AI_PROVIDERS", None)
+    os.environ["FAKE_LATENCY_DISTRIBUTION"] = args.fake_distribution
+    os.environ["FAKE_LATENCY_MEAN_SECONDS"] = str(args.fake_latency)
+    os.environ["FAKE_LATENCY_STDDEV_SECONDS"] = str(args.fake_stddev)
+    os.environ["FAKE_TOKENS_PER_SECOND"] = str(args.fake_tokens_per_second)
+    os.environ["FAKE_ERROR_RATE"] = str(args.fake_error_rate)
+    os.environ["FAKE_SEED"] = str(args.seed)
+
+
+class LoopLagMonitor:
+    """Event loop'un planlanan uyanma zamanından ne kadar geç kaldığını örnekler"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+def _project_pool(size: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """Cache isabet oranını belirleyen farklı ProjectInfo havuzu"""
+    from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+
+    pool = []
+    for _ in range(size):
+        backend = rng.choice(FRAMEWORKS["backend"])
+        pool.append({
+            "project_category": rng.choice(("frontend", "backend", "fullstack")),
+            "project_type": rng.choice(PROJECT_TYPES),
+            "frontend_framework": rng.choice(FRAMEWORKS["frontend"]),
+            "backend_framework": backend,
+            "backend_language": backend.split("/")[0],
+            "database_type": rng.choice(FRAMEWORKS["database"]),
+            "testing_requirement": rng.random() < 0.5,
+            "notes": f"load test project {rng.randrange(1_000_000)}",
+        })
+    return pool
+
+
+def _parse_mix(mix: str) -> List[Tuple[str, float]]:
+    weights = []
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise SystemExit(f"Bilinmeyen uç nokta: {name} (seçenekler: {', '.join(ENDPOINTS)})")
+        weights.append((name.strip(), float(weight or 1)))
+    return weights
+
+
+class _UvicornThread:
+    """Uygulamayı kendi event loop'u olan bir thread'de uvicorn ile çalıştır"""
+
+    def __init__(self, app, monitor: LoopLagMonitor):
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="on")
+        self.server = uvicorn.Server(config)
+        self.monitor = monitor
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        async def serve():
+            self.monitor.start()
+            await self.server.serve()
+
+        asyncio.run(serve())
+
+    def start(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+async def _fire(client, name: str, method: str, path: str, payload: Optional[Dict[str, Any]],
+                scheduled: float, results: Dict[str, List[Tuple[float, int]]]):
+    status = 0
+    try:
+        response = await client.request(method, path, json=payload)
+        status = response.status_code
+    except Exception:
+        status = -1
+    results[name].append((time.perf_counter() - scheduled, status))
+
+
+async def run_load(client, args: argparse.Namespace) -> Tuple[Dict[str, List[Tuple[float, int]]], float]:
+    """Hedef RPS'te istekleri planla ve hepsinin bitmesini bekle"""
+    rng = random.Random(args.seed)
+    pool = _project_pool(args.unique_projects, rng)
+    mix = _parse_mix(args.mix)
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    cache = "bypass" if args.bypass_cache else "default"
+
+    results: Dict[str, List[Tuple[float, int]]] = defaultdict(list)
+    tasks = []
+    total = int(args.rps * args.duration)
+    started = time.perf_counter()
+    for index in range(total):
+        scheduled = started + index / args.rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        name = rng.choices(names, weights)[0]
+        method, path = ENDPOINTS[name]
+        payload = None
+        if method == "POST":
+            path, payload = f"{path}?cache={cache}", rng.choice(pool)
+        tasks.append(asyncio.create_task(_fire(client, name, method, path, payload, scheduled, results)))
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - started
+
+
+def _summary(results: Dict[str, List[Tuple[float, int]]], elapsed: float, lag: List[float]) -> Dict[str, Any]:
+    from app.services.latency_stats import percentile
+
+    report: Dict[str, Any] = {"elapsed_seconds": round(elapsed, 3), "endpoints": {}}
+    everything = []
+    for name, samples in sorted(results.items()):
+        latencies = [latency for latency, _ in samples]
+        everything.extend(latencies)
+        report["endpoints"][name] = {
+            "requests": len(samples),
+            "errors": sum(1 for _, status in samples if not 200 <= status < 400),
+            "throughput_rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        }
+    report["total"] = {
+        "requests": len(everything),
+        "throughput_rps": round(len(everything) / elapsed, 1),
+        "p50_ms": round(percentile(everything, 50) * 1000, 2),
+        "p99_ms": round(percentile(everything, 99) * 1000, 2),
+    }
+    report["event_loop_lag"] = {
+        "p50_ms": round(percentile(lag, 50) * 1000, 2),
+        "p99_ms": round(percentile(lag, 99) * 1000, 2),
+        "max_ms": round(max(lag, default=0.0) * 1000, 2),
+    }
+    return report
+
+
+def _print_report(report: Dict[str, Any], args: argparse.Namespace):
+    print(f"\nTaşıma: {args.transport}, hedef {args.rps} RPS x {args.duration}s, süre {report['elapsed_seconds']}s")
+    print(f"{'uç nokta':<15} {'istek':>7} {'hata':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<15} {row['requests']:>7} {row['errors']:>6} {row['throughput_rps']:>8} "
+            f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
+    total, lag = report["total"], report["event_loop_lag"]
+    print(f"{'toplam':<15} {total['requests']:>7} {'':>6} {total['throughput_rps']:>8} {total['p50_ms']:>9} {'':>9} {total['p99_ms']:>9}")
+    print(f"\nEvent loop gecikmesi: p50={lag['p50_ms']}ms p99={lag['p99_ms']}ms max={lag['max_ms']}ms")
+
+
+async def _run_asgi(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from main import app
+
+    monitor = LoopLagMonitor()
+    await app.router.startup()
+    monitor.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+            results, elapsed = await run_load(client, args)
+    finally:
+        monitor.stop()
+        await app.router.shutdown()
+    return _summary(results, elapsed, monitor.samples)
+
+
+async def _run_uvicorn(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from main import app
+
+    monitor = LoopLagMonitor()
+    server = _UvicornThread(app, monitor)
+    server.start()
+    try:
+        limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{server.port}", limits=limits, timeout=args.timeout
+        ) as client:
+            results, elapsed = await run_load(client, args)
+    finally:
+        server.stop()
+    return _summary(results, elapsed, monitor.samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API yük testi (FakeProvider)")
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--rps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"uç nokta=ağırlık listesi (varsayılan: {DEFAULT_MIX})")
+    parser.add_argument("--unique-projects", type=int, default=50, help="farklı ProjectInfo sayısı (cache isabetini belirler)")
+    parser.add_argument("--bypass-cache", action="store_true", help="üretim isteklerinde cache'i atla")
+    parser.add_argument("--connections", type=int, default=100, help="uvicorn modunda HTTP bağlantı sayısı")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--fake-distribution", default="lognormal")
+    parser.add_argument("--fake-latency", type=float, default=0.2, help="ilk token'a kadar ortalama süre (s)")
+    parser.add_argument("--fake-stddev", type=float, default=0.1)
+    parser.add_argument("--fake-tokens-per-second", type=float, default=0, help="0: akış gecikmesi yok")
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="raporu JSON olarak bu dosyaya da yaz")
+    args = parser.parse_args()
+
+    _configure_fake_provider(args)
+    runner = _run_asgi if args.transport == "asgi" else _run_uvicorn
+    report = asyncio.run(runner(args))
+    _print_report(report, args)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
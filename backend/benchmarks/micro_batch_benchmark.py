@@ -0,0 +1,77 @@
+"""
+HuggingFaceProvider micro-batching throughput benchmark'ı (yerel TGI stub'ına karşı)
+
+Stub tek GPU gibi davranır (istekleri sırayla işler); aynı eşzamanlı yük
+micro-batching kapalı (batch=1) ve farklı toplu boyutlarla gönderilir.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.micro_batch_benchmark --requests 64 --concurrency 32
+"""
+import argparse
+import asyncio
+import time
+from app.core.config import settings
+from app.services.http_client import close_http_clients
+from app.services.huggingface_provider import HuggingFaceProvider
+from app.services.latency_stats import percentile
+from stubs.tgi_stub import start_stub_server
+
+
+async def run_case(batch_size: int, max_wait_ms: float, requests: int, concurrency: int) -> dict:
+    settings.HUGGINGFACE_BATCH_MAX_SIZE = batch_size
+    settings.HUGGINGFACE_BATCH_MAX_WAIT_MS = max_wait_ms
+    provider = HuggingFaceProvider()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(index: int):
+        async with semaphore:
+            started = time.perf_counter()
+            text = await provider.generate_content(f"prompt number {index}")
+            latencies.append(time.perf_counter() - started)
+            # Sonuç doğru çağırana dönmeli
+            assert text.endswith(f"prompt number {index} -->"), text[-40:]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "seconds": elapsed,
+        "throughput": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "avg_batch": provider.batcher.stats()["avg_batch_size"],
+    }
+
+
+async def main(args: argparse.Namespace):
+    server = start_stub_server(latency=args.latency, per_item_latency=args.per_item_latency)
+    settings.HUGGINGFACE_BASE_URL = server.base_url
+    settings.HTTP_MAX_CONNECTIONS = max(settings.HTTP_MAX_CONNECTIONS, args.concurrency)
+
+    print(
+        f"{args.requests} istek, eşzamanlılık {args.concurrency}, GPU süresi "
+        f"{args.latency}s + {args.per_item_latency}s/öğe, bekleme {args.max_wait_ms}ms\n"
+    )
+    print(f"{'batch':>6} {'süre (s)':>9} {'istek/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'ort. batch':>11}")
+    try:
+        for batch_size in args.batch_sizes:
+            result = await run_case(batch_size, args.max_wait_ms, args.requests, args.concurrency)
+            print(
+                f"{batch_size:>6} {result['seconds']:>9.2f} {result['throughput']:>8.1f} "
+                f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['avg_batch']:>11}"
+            )
+    finally:
+        await close_http_clients()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-batching throughput benchmark'ı")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.1, help="toplu istek başına sabit GPU süresi (s)")
+    parser.add_argument("--per-item-latency", type=float, default=0.01, help="toplu istekteki her ek öğe için (s)")
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,67 @@
+"""
+Prompt üretim maliyeti micro-benchmark'ı
+
+/frameworks ve /project-types seçeneklerinin tam çapraz çarpımı için
+prompt üretir; soğuk (memo boş) ve sıcak geçişleri ayrı raporlar.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.prompt_benchmark
+"""
+import argparse
+import itertools
+import time
+from typing import List
+from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+from app.models.schemas import ProjectInfo
+from app.services import prompt_service
+from app.services.prompt_service import PromptService, PROMPT_TEMPLATE_VERSION
+
+CATEGORIES = ("frontend", "backend", "fullstack")
+
+
+def build_cross_product() -> List[ProjectInfo]:
+    """Kategori x proje türü x frontend x backend x veritabanı"""
+    items = []
+    for category, project_type, frontend, backend, database in itertools.product(
+        CATEGORIES, PROJECT_TYPES, FRAMEWORKS["frontend"], FRAMEWORKS["backend"], FRAMEWORKS["database"]
+    ):
+        language = backend.split("/")[0] if "/" in backend else None
+        items.append(ProjectInfo(
+            project_category=category,
+            project_type=project_type,
+            frontend_framework=frontend,
+            backend_language=language,
+            backend_framework=backend,
+            database_type=database
+        ))
+    return items
+
+
+def run_pass(items: List[ProjectInfo]) -> float:
+    started = time.perf_counter()
+    for project_info in items:
+        PromptService.generate_ruleset_prompt(project_info)
+    return time.perf_counter() - started
+
+
+def main(passes: int):
+    items = build_cross_product()
+    print(f"Template sürümü: {PROMPT_TEMPLATE_VERSION}")
+    print(f"Kombinasyon sayısı: {len(items)}\n")
+    print(f"{'geçiş':<8} {'toplam (ms)':>12} {'prompt başına (µs)':>20}")
+
+    prompt_service._category_fragment.cache_clear()
+    for index in range(passes):
+        elapsed = run_pass(items)
+        label = "soğuk" if index == 0 else f"sıcak{index}"
+        print(f"{label:<8} {elapsed * 1000:>12.1f} {elapsed / len(items) * 1e6:>20.2f}")
+
+    info = prompt_service._category_fragment.cache_info()
+    print(f"\nFragment memo: {info.hits} hit, {info.misses} miss, {info.currsize} kayıt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prompt üretim benchmark'ı")
+    parser.add_argument("--passes", type=int, default=3)
+    args = parser.parse_args()
+    main(args.passes)
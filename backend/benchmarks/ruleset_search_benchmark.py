@@ -0,0 +1,118 @@
+"""
+Kalıcı ruleset deposu arama benchmark'ı (SQLite FTS5)
+
+Geçici bir veritabanına sentetik ruleset'ler yazar (toplu yazma yolu ile), sonra
+framework filtresi, tam metin arama, ikisi birlikte, sayfalama ve id ile getirme
+sorgularının gecikmesini ölçer.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.ruleset_search_benchmark --rows 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+from app.services.latency_stats import percentile
+from app.services.ruleset_repository import RulesetRepository
+from app.services.ruleset_store import make_ruleset_id
+from app.models.schemas import ProjectInfo
+
+_VOCABULARY = (
+    "validate inputs at boundaries", "prefer composition over inheritance", "keep functions small",
+    "use dependency injection", "write integration tests", "avoid global state", "log structured events",
+    "handle errors explicitly", "document public interfaces", "paginate list endpoints", "cache idempotent reads",
+    "use migrations for schema changes", "enforce linting in CI", "pin dependency versions", "review pull requests",
+    "prefer immutable data", "measure before optimizing", "stream large responses", "limit request payloads",
+    "rotate secrets regularly", "use feature flags", "keep components pure", "memoize expensive selectors",
+)
+
+
+def _synthetic_rows(count: int, seed: int):
+    rng = random.Random(seed)
+    for index in range(count):
+        backend = rng.choice(FRAMEWORKS["backend"])
+        info = {
+            "project_category": rng.choice(("frontend", "backend", "fullstack")),
+            "project_type": rng.choice(PROJECT_TYPES),
+            "frontend_framework": rng.choice(FRAMEWORKS["frontend"]),
+            "backend_framework": backend,
+            "backend_language": backend.split("/")[0],
+            "database_type": rng.choice(FRAMEWORKS["database"]),
+            "notes": f"project {index}",
+        }
+        rules = rng.sample(_VOCABULARY, 6)
+        markdown = (
+            f"# {info['project_type']} Ruleset\n\n## 1. Technology Stack\n"
+            f"{info['frontend_framework']} + {backend} + {info['database_type']}\n\n## 2. Rules\n"
+            + "\n".join(f"- {rule}" for rule in rules)
+        )
+        ruleset_id = make_ruleset_id(ProjectInfo(**info), "fake", markdown)
+        yield ruleset_id, info, markdown
+
+
+async def populate(repository: RulesetRepository, rows: int, seed: int) -> float:
+    started = time.perf_counter()
+    for index, (ruleset_id, info, markdown) in enumerate(_synthetic_rows(rows, seed)):
+        repository.add(ruleset_id, info, markdown, "fake", cache_status="miss", duration_ms=500.0)
+        if len(repository._pending) >= repository.batch_size:
+            await repository.flush()
+        if index and index % 100_000 == 0:
+            print(f"  {index} kayıt yazıldı ({time.perf_counter() - started:.0f}s)")
+    await repository.flush()
+    return time.perf_counter() - started
+
+
+async def timed(repeats: int, function) -> dict:
+    samples = []
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = await function()
+        samples.append(time.perf_counter() - started)
+    return {"p50_ms": percentile(samples, 50) * 1000, "p95_ms": percentile(samples, 95) * 1000, "result": result}
+
+
+async def main(args: argparse.Namespace):
+    path = args.path or os.path.join(tempfile.mkdtemp(), "rulesets.db")
+    repository = RulesetRepository(path, batch_size=5000, flush_interval=60, max_pending=10_000)
+
+    if not args.reuse:
+        print(f"{args.rows} sentetik ruleset yazılıyor: {path}")
+        elapsed = await populate(repository, args.rows, args.seed)
+        print(f"Yazma: {elapsed:.1f}s ({args.rows / elapsed:.0f} kayıt/s)\n")
+
+    rng = random.Random(args.seed + 1)
+    sample_id = next(_synthetic_rows(1, args.seed))[0]
+    _, first_cursor = await repository.search(framework="React", limit=20)
+
+    cases = {
+        "son kayıtlar": lambda: repository.search(limit=20),
+        "framework": lambda: repository.search(framework=rng.choice(FRAMEWORKS["frontend"]), limit=20),
+        "tam metin": lambda: repository.search(query="dependency injection", limit=20),
+        "eşleşmeyen metin": lambda: repository.search(query="graphql federation", limit=20),
+        "framework + metin": lambda: repository.search(
+            framework=rng.choice(FRAMEWORKS["backend"]), query="stream large", limit=20
+        ),
+        "2. sayfa": lambda: repository.search(framework="React", cursor=first_cursor, limit=20),
+        "id ile getir": lambda: repository.get(sample_id),
+    }
+
+    print(f"{'sorgu':<20} {'p50 ms':>8} {'p95 ms':>8} {'sonuç':>6}")
+    for name, function in cases.items():
+        result = await timed(args.repeats, function)
+        found = result["result"]
+        count = len(found[0]) if isinstance(found, tuple) else int(found is not None)
+        print(f"{name:<20} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {count:>6}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ruleset deposu arama benchmark'ı")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--path", help="veritabanı dosyası (varsayılan: geçici klasör)")
+    parser.add_argument("--reuse", action="store_true", help="--path'teki mevcut veritabanını yeniden kullan")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,102 @@
+"""
+Tek parça (monolithic) ve bölüm bölüm (sectioned) üretim karşılaştırması
+
+Simüle provider'ın süresi = ilk token gecikmesi + çıktı token'ı / decode hızı.
+Tek parça modda tüm ruleset tek completion'dır; bölüm modunda her bölüm
+yaklaşık 1/12 uzunluğunda ayrı bir completion'dır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.sectioned_benchmark --output-tokens 4000 --tokens-per-second 2000
+"""
+import argparse
+import asyncio
+import re
+import time
+from typing import Dict, Any
+from app.core.config import settings
+from app.models.schemas import ProjectInfo, CacheMode, GenerationMode
+from app.services.ai_provider import AIProvider
+from app.services.ai_service import ai_service
+from app.services.metrics import estimate_tokens
+from app.services.prompt_service import PromptService
+from app.services.ruleset_service import ruleset_service
+
+_HEADING_RE = re.compile(r"^- (## .+?)  \(", re.MULTILINE)
+
+
+class SimulatedDecodeProvider(AIProvider):
+    """Çıktı uzunluğuyla orantılı gecikmeli provider"""
+
+    def __init__(self, output_tokens: int, tokens_per_second: float, first_token_latency: float):
+        self.output_tokens = output_tokens
+        self.tokens_per_second = tokens_per_second
+        self.first_token_latency = first_token_latency
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    async def generate_content(self, prompt: str) -> str:
+        headings = _HEADING_RE.findall(prompt)
+        sections = len(PromptService.get_sections("backend"))
+        # Bölüm isteğinde çıktı, bölüm başına düşen payın biraz fazlası (bağımsız giriş cümleleri)
+        tokens = int(self.output_tokens / sections * 1.1) * len(headings) if headings else self.output_tokens
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(prompt)
+        self.completion_tokens += tokens
+        await asyncio.sleep(self.first_token_latency + tokens / self.tokens_per_second)
+        body = "lorem " * tokens
+        if headings:
+            return "".join(f"{heading}\n\n{body}\n\n" for heading in headings)
+        return f"# Ruleset\n\n{body}\n"
+
+    async def check_health(self) -> Dict[str, Any]:
+        return {"available": True}
+
+    @property
+    def provider_name(self) -> str:
+        return "simulated"
+
+    @property
+    def model_name(self) -> str:
+        return "simulated-decode"
+
+
+async def run_case(provider: SimulatedDecodeProvider, mode: GenerationMode) -> Dict[str, Any]:
+    project_info = ProjectInfo(project_category="backend", project_type="API/Microservice", backend_framework="Python/FastAPI")
+    provider.calls = provider.prompt_tokens = provider.completion_tokens = 0
+    started = time.perf_counter()
+    await ruleset_service.generate(project_info, cache_mode=CacheMode.BYPASS, mode=mode)
+    return {
+        "seconds": time.perf_counter() - started,
+        "calls": provider.calls,
+        "prompt_tokens": provider.prompt_tokens,
+        "completion_tokens": provider.completion_tokens,
+    }
+
+
+async def main(output_tokens: int, tokens_per_second: float, first_token_latency: float):
+    provider = SimulatedDecodeProvider(output_tokens, tokens_per_second, first_token_latency)
+    ai_service.provider = provider
+
+    print(f"Çıktı: {output_tokens} token, decode: {tokens_per_second:.0f} token/s, ilk token: {first_token_latency}s\n")
+    print(f"{'mod':<18} {'süre (s)':>9} {'çağrı':>6} {'prompt tok':>11} {'çıktı tok':>10}")
+
+    cases = [("monolithic", GenerationMode.MONOLITHIC, None)]
+    cases += [(f"sectioned x{limit}", GenerationMode.SECTIONED, limit) for limit in (1, 4, 6, 12)]
+    for label, mode, concurrency in cases:
+        if concurrency is not None:
+            settings.SECTION_CONCURRENCY = concurrency
+        result = await run_case(provider, mode)
+        print(
+            f"{label:<18} {result['seconds']:>9.2f} {result['calls']:>6} "
+            f"{result['prompt_tokens']:>11} {result['completion_tokens']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monolithic vs sectioned üretim benchmark'ı")
+    parser.add_argument("--output-tokens", type=int, default=4000)
+    parser.add_argument("--tokens-per-second", type=float, default=2000)
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    args = parser.parse_args()
+    asyncio.run(main(args.output_tokens, args.tokens_per_second, args.first_token_latency))
@@ -0,0 +1,128 @@
+"""
+Benzerlik indeksi benchmark'ı
+
+Katalogdan rastgele ProjectInfo'larla indeksi doldurur, ardından
+sadece serbest metin alanlarında (yazım, büyük/küçük harf, sıra) farklı
+ve bir stack alanı değişmiş sorgularla arama süresini ve isabet oranını ölçer.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.semantic_cache_benchmark --entries 100000
+"""
+import argparse
+import random
+import time
+from typing import List
+import numpy as np
+from app.core.catalog import PROJECT_TYPES, FRAMEWORKS
+from app.models.schemas import ProjectInfo
+from app.services.latency_stats import percentile
+from app.services.semantic_cache import SemanticIndex, encode, DIMENSIONS
+
+PROVIDER, MODEL = "bench", "bench-1"
+
+STYLING = ["tailwind", "scss", "css-modules", "styled-components", None]
+STATE = ["zustand", "redux-toolkit", "context", None]
+TESTING = ["jest", "vitest", "playwright", None]
+AUTH = ["jwt", "session", "oauth", None]
+ORM = ["prisma", "sqlalchemy", "typeorm", None]
+REQUIREMENTS = ["Tailwind", "Docker", "CI/CD", "i18n", "Dark mode", "Monorepo", "Storybook", "SSR"]
+NOTES = [
+    "Team of five developers, prefer functional style",
+    "Strict typing everywhere",
+    "Performance critical dashboard",
+    None,
+]
+
+
+def random_project(rng: random.Random) -> ProjectInfo:
+    backend = rng.choice(FRAMEWORKS["backend"])
+    return ProjectInfo(
+        project_category=rng.choice(("frontend", "backend", "fullstack")),
+        project_type=rng.choice(PROJECT_TYPES),
+        frontend_framework=rng.choice(FRAMEWORKS["frontend"]),
+        styling_approach=rng.choice(STYLING),
+        state_management=rng.choice(STATE),
+        testing_framework=rng.choice(TESTING),
+        backend_language=backend.split("/")[0],
+        backend_framework=backend,
+        database_type=rng.choice(FRAMEWORKS["database"]),
+        auth_method=rng.choice(AUTH),
+        orm_tool=rng.choice(ORM),
+        testing_requirement=rng.random() < 0.5,
+        additional_requirements=rng.sample(REQUIREMENTS, rng.randint(0, 3)),
+        notes=rng.choice(NOTES),
+    )
+
+
+def reword(project_info: ProjectInfo, rng: random.Random) -> ProjectInfo:
+    """Sadece önemsiz alanlarda farklı kopya"""
+    requirements = [item.lower() + (" css" if item == "Tailwind" else "") for item in project_info.additional_requirements]
+    rng.shuffle(requirements)
+    notes = f"  {project_info.notes.upper()}. " if project_info.notes else None
+    return project_info.model_copy(update={
+        "project_type": project_info.project_type.lower(),
+        "additional_requirements": requirements,
+        "notes": notes,
+    })
+
+
+def change_stack(project_info: ProjectInfo, rng: random.Random) -> ProjectInfo:
+    """Bir stack alanı farklı kopya (yeniden kullanılmamalı)"""
+    current = project_info.state_management
+    return project_info.model_copy(update={"state_management": rng.choice([s for s in STATE if s != current])})
+
+
+def measure(index: SemanticIndex, queries: List[ProjectInfo]):
+    latencies, matches = [], 0
+    for query in queries:
+        started = time.perf_counter()
+        match = index.lookup(query, PROVIDER, MODEL)
+        latencies.append(time.perf_counter() - started)
+        matches += match is not None
+    return latencies, matches
+
+
+def report(label: str, latencies: List[float], matches: int):
+    print(
+        f"{label:<22} p50={percentile(latencies, 50) * 1e3:.3f}ms "
+        f"p99={percentile(latencies, 99) * 1e3:.3f}ms  eşleşme={matches}/{len(latencies)}"
+    )
+
+
+def main(entries: int, queries: int, seed: int):
+    rng = random.Random(seed)
+    index = SemanticIndex(threshold=0.95, max_entries=entries)
+    stored = [random_project(rng) for _ in range(entries)]
+
+    started = time.perf_counter()
+    for position, project_info in enumerate(stored):
+        index.add(f"key-{position}", project_info, PROVIDER, MODEL)
+    elapsed = time.perf_counter() - started
+    stats = index.stats()
+    print(f"{entries} kayıt eklendi: {elapsed:.2f}s ({elapsed / entries * 1e6:.1f} µs/kayıt)")
+    print(f"Bölüm sayısı: {stats['partitions']}, en büyük bölüm: {stats['largest_partition']}\n")
+
+    samples = rng.sample(stored, min(queries, entries))
+    report("birebir", *measure(index, samples))
+    report("yeniden yazılmış", *measure(index, [reword(p, rng) for p in samples]))
+    report("stack alanı değişmiş", *measure(index, [change_stack(reword(p, rng), rng) for p in samples]))
+
+    # Karşılaştırma: bölümleme olmadan tüm matris üzerinde tek kosinüs taraması
+    matrix = np.stack([encode(p, index.vocabulary) for p in stored[:entries]]).astype(np.float32)
+    assert matrix.shape[1] == DIMENSIONS
+    vector = encode(samples[0], index.vocabulary)
+    latencies = []
+    for _ in range(50):
+        started = time.perf_counter()
+        int((matrix @ vector).argmax())
+        latencies.append(time.perf_counter() - started)
+    print(f"\nBölümlemesiz tam tarama ({entries}x{DIMENSIONS}): p50={percentile(latencies, 50) * 1e3:.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benzerlik indeksi benchmark'ı")
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.entries, args.queries, args.seed)
@@ -0,0 +1,133 @@
+"""
+Uyarlanabilir çıktı token bütçesi benchmark'ı
+
+Simüle edilmiş provider kategoriye göre farklı uzunlukta ruleset üretir; isteklerin
+bir kısmında model bütün bölümleri yazdıktan sonra durmadan devam eder (kaçak çıktı).
+Aynı istek dizisi bütçe kapalı (sabit max_tokens) ve açık çalıştırılır; gecikme,
+üretilen ve ayrılan (rezerve edilen) token'lar karşılaştırılır.
+
+Kullanım (backend klasöründen):
+    python -m benchmarks.token_budget_benchmark --requests 600 --runaway-rate 0.05
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import AsyncIterator, Dict, Any
+from app.models.schemas import ProjectInfo
+from app.services.ai_provider import AIProvider, generation_limits_scope, max_output_tokens, report_completion
+from app.services.latency_stats import percentile
+from app.services.prompt_service import PromptService
+from app.services.token_budget import TokenBudgeter, BudgetRequest
+
+# Kategori başına bölüm başına ortalama token (kelime) sayısı
+_SECTION_TOKENS = {"frontend": 70, "backend": 90, "fullstack": 120}
+
+
+class SimulatedProvider(AIProvider):
+    """Kelimeyi token sayan, max_tokens'ta kesen ve süreyi çıktı uzunluğuyla orantılı tutan provider"""
+
+    def __init__(self, tokens_per_second: float, runaway_rate: float, runaway_tokens: int, seed: int):
+        self.tokens_per_second = tokens_per_second
+        self.runaway_rate = runaway_rate
+        self.runaway_tokens = runaway_tokens
+        self._random = random.Random(seed)
+        self.category = "backend"
+
+    def _render(self) -> list:
+        words = ["# Project Ruleset\n\n"]
+        for index, (title, _) in enumerate(PromptService.get_sections(self.category), start=1):
+            words.append(f"## {index}. {title}\n")
+            count = max(5, int(self._random.gauss(_SECTION_TOKENS[self.category], 15)))
+            words.extend("rule " if (i + 1) % 12 else "rule\n" for i in range(count))
+            words.append("\n\n")
+        if self._random.random() < self.runaway_rate:
+            words.extend("again " if (i + 1) % 12 else "again\n" for i in range(self.runaway_tokens))
+        return words
+
+    async def generate_content(self, prompt: str) -> str:
+        words = self._render()
+        limit = max_output_tokens(len(words))
+        report_completion(len(words) > limit, min(len(words), limit))
+        words = words[:limit]
+        await asyncio.sleep(len(words) / self.tokens_per_second)
+        return "".join(words)
+
+    async def stream_content(self, prompt: str) -> AsyncIterator[str]:
+        yield await self.generate_content(prompt)
+
+    async def check_health(self) -> Dict[str, Any]:
+        return {"available": True}
+
+    @property
+    def provider_name(self) -> str:
+        return "simulated"
+
+    @property
+    def model_name(self) -> str:
+        return "simulated"
+
+
+async def run_case(args: argparse.Namespace, budgeted: bool) -> dict:
+    provider = SimulatedProvider(args.tokens_per_second, args.runaway_rate, args.runaway_tokens, args.seed)
+    budgeter = TokenBudgeter(default_max_tokens=args.default_max_tokens, min_samples=args.min_samples)
+    rng = random.Random(args.seed)
+    latencies, produced = [], 0
+
+    for _ in range(args.requests):
+        provider.category = rng.choice(tuple(_SECTION_TOKENS))
+        info = ProjectInfo(project_category=provider.category, project_type="Web Application")
+        started = time.perf_counter()
+        if budgeted:
+            text = await budgeter.generate(provider.generate_content, "prompt", BudgetRequest.for_ruleset(info, "simulated"))
+        else:
+            # Bütçe yok: her istek varsayılan max_tokens ile
+            with generation_limits_scope(args.default_max_tokens):
+                text = await provider.generate_content("prompt")
+        latencies.append(time.perf_counter() - started)
+        produced += len(text.split())
+
+    stats = budgeter.stats()
+    reserved = stats["avg_budget_tokens"] * args.requests if budgeted else args.default_max_tokens * args.requests
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "avg_tokens": produced / args.requests,
+        "avg_reserved": reserved / args.requests,
+        "stats": stats,
+    }
+
+
+async def main(args: argparse.Namespace):
+    print(
+        f"{args.requests} istek, {args.tokens_per_second:.0f} token/s, kaçak çıktı oranı {args.runaway_rate:.0%} "
+        f"(+{args.runaway_tokens} token), varsayılan max_tokens {args.default_max_tokens}\n"
+    )
+    print(f"{'bütçe':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'ort. token':>11} {'ort. rezerv':>12}")
+    for budgeted in (False, True):
+        result = await run_case(args, budgeted)
+        print(
+            f"{'açık' if budgeted else 'kapalı':<8} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+            f"{result['p99_ms']:>8.1f} {result['avg_tokens']:>11.1f} {result['avg_reserved']:>12.1f}"
+        )
+        if budgeted:
+            stats = result["stats"]
+            print(
+                f"\nkesilen: {stats['truncated']}, kırpılan (tamamlanmış): {stats['clipped']}, "
+                f"devam çağrısı: {stats['continuations']}, eksik kalan: {stats['incomplete']}"
+            )
+            for key, summary in stats["keys"].items():
+                print(f"  {key}: bütçe {summary['budget']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Çıktı token bütçesi benchmark'ı")
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--tokens-per-second", type=float, default=20000, help="simüle üretim hızı (token/s)")
+    parser.add_argument("--runaway-rate", type=float, default=0.05)
+    parser.add_argument("--runaway-tokens", type=int, default=3000)
+    parser.add_argument("--default-max-tokens", type=int, default=4000)
+    parser.add_argument("--min-samples", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(main(parser.parse_args()))
@@ -5,6 +5,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.routers.main import router
+from app.routers.responses import CompressionMiddleware
 
 # FastAPI uygulaması oluştur
 app = FastAPI(
@@ -22,6 +23,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Büyük JSON yanıtlarını gzip/brotli ile sıkıştır (SSE/NDJSON akışları hariç)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
 # Router'ları dahil et
 app.include_router(router)
 
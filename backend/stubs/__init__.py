@@ -0,0 +1 @@
+# Stubs package
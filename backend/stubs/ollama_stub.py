@@ -0,0 +1,131 @@
+"""
+Ollama HTTP API'sini taklit eden yerel stub sunucu
+
+OllamaProvider'ı gerçek bir Ollama kurulumu olmadan denemek için.
+
+Kullanım (backend klasöründen):
+    python -m stubs.ollama_stub --port 11435 --latency 0.5
+    OLLAMA_BASE_URL=http://127.0.0.1:11435 AI_PROVIDER=ollama python main.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+STUB_RULESET = """# Project Ruleset
+
+## 1. Agent Role Definition
+You are a senior developer working on this project.
+
+## 2. Technology Stack
+Use the technologies listed in the project description.
+"""
+
+
+class OllamaStubHandler(BaseHTTPRequestHandler):
+    """/api/tags ve /api/generate uç noktalarını cevaplar"""
+
+    protocol_version = "HTTP/1.1"
+    server: "OllamaStubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": f"{self.server.model}:latest"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests.append(request)
+
+        if request.get("model") not in (self.server.model, f"{self.server.model}:latest"):
+            self._send_json(404, {"error": f"model '{request.get('model')}' not found"})
+            return
+
+        # Prompt'suz istek: sadece modeli yükle
+        if not request.get("prompt"):
+            self.server.loads += 1
+            self._send_json(200, {"model": request["model"], "response": "", "done": True, "done_reason": "load"})
+            return
+
+        if not request.get("stream", True):
+            time.sleep(self.server.latency)
+            self._send_json(200, {"model": request["model"], "response": self.server.response_text, "done": True})
+            return
+
+        # Streaming: satır satır NDJSON, chunked transfer
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        words = self.server.response_text.split(" ")
+        delay = self.server.latency / max(1, len(words))
+        for index, word in enumerate(words):
+            time.sleep(delay)
+            piece = word if index == len(words) - 1 else word + " "
+            self._write_chunk({"model": request["model"], "response": piece, "done": False})
+        self._write_chunk({"model": request["model"], "response": "", "done": True})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, payload: dict):
+        data = (json.dumps(payload) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class OllamaStubServer(ThreadingHTTPServer):
+    """Gelen istekleri kaydeden stub sunucu"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], model: str = "llama3.2", latency: float = 0.0,
+                 response_text: str = STUB_RULESET):
+        super().__init__(address, OllamaStubHandler)
+        self.model = model
+        self.latency = latency
+        self.response_text = response_text
+        self.requests = []
+        self.loads = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(port: int = 0, **kwargs) -> OllamaStubServer:
+    """Stub sunucuyu arka plan thread'inde başlat (port=0: boş port)"""
+    server = OllamaStubServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ollama API stub sunucusu")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="llama3.2")
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = OllamaStubServer(("127.0.0.1", args.port), model=args.model, latency=args.latency)
+    print(f"Ollama stub: {server.base_url} (model: {args.model})")
+    server.serve_forever()
@@ -0,0 +1,168 @@
+"""
+Hugging Face text-generation-inference (TGI) API'sini taklit eden yerel stub sunucu
+
+Tek GPU'yu simüle eder: istekler sırayla işlenir ve bir toplu isteğin süresi
+`latency + per_item_latency * (öğe sayısı - 1)` olur. Böylece micro-batching'in
+yük altındaki throughput etkisi gerçek bir GPU olmadan ölçülebilir.
+
+Kullanım (backend klasöründen):
+    python -m stubs.tgi_stub --port 8081 --latency 0.5 --per-item-latency 0.05
+    HUGGINGFACE_BASE_URL=http://127.0.0.1:8081 AI_PROVIDER=huggingface python main.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+STUB_RULESET = """# Project Ruleset
+
+## 1. Agent Role Definition
+You are a senior developer working on this project.
+
+## 2. Technology Stack
+Use the technologies listed in the project description.
+"""
+
+
+class TGIStubHandler(BaseHTTPRequestHandler):
+    """/health, /info, /generate, /generate_stream ve toplu / uç noktalarını cevaplar"""
+
+    protocol_version = "HTTP/1.1"
+    server: "TGIStubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {})
+        elif self.path == "/info":
+            self._send_json(200, {"model_id": self.server.model, "max_batch_total_tokens": 32000})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        inputs = request.get("inputs")
+        parameters = request.get("parameters") or {}
+
+        if self.path == "/" and isinstance(inputs, list):
+            self.server.record(len(inputs))
+            self.server.compute(len(inputs))
+            self._send_json(200, [[self._generation(prompt, parameters)] for prompt in inputs])
+        elif self.path in ("/", "/generate") and isinstance(inputs, str):
+            self.server.record(1)
+            self.server.compute(1)
+            self._send_json(200, self._generation(inputs, parameters))
+        elif self.path == "/generate_stream" and isinstance(inputs, str):
+            self.server.record(1)
+            self._stream(inputs, parameters)
+        else:
+            self._send_json(422, {"error": "Input validation error: `inputs` must be a string or a list", "error_type": "validation"})
+
+    def _generation(self, prompt: str, parameters: dict) -> dict:
+        words, finish_reason = self.server.respond_words(prompt, parameters.get("max_new_tokens"))
+        result = {"generated_text": " ".join(words)}
+        if parameters.get("details"):
+            result["details"] = {"finish_reason": finish_reason, "generated_tokens": len(words)}
+        return result
+
+    def _stream(self, prompt: str, parameters: dict):
+        """SSE: her token için bir `data:` satırı, chunked transfer; son satırda details"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        words, finish_reason = self.server.respond_words(prompt, parameters.get("max_new_tokens"))
+        delay = self.server.latency / max(1, len(words))
+        for index, word in enumerate(words):
+            time.sleep(delay)
+            last = index == len(words) - 1
+            payload = {
+                "token": {"id": index, "text": word if last else word + " ", "logprob": 0.0, "special": False},
+                "generated_text": None,
+                "details": {"finish_reason": finish_reason, "generated_tokens": len(words)} if last else None
+            }
+            self._write_chunk(f"data:{json.dumps(payload)}\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class TGIStubServer(ThreadingHTTPServer):
+    """Toplu istek boyutlarını kaydeden, tek GPU'yu simüle eden stub sunucu"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], model: str = "stub/tgi-model", latency: float = 0.0,
+                 per_item_latency: float = 0.0, response_text: str = STUB_RULESET):
+        super().__init__(address, TGIStubHandler)
+        self.model = model
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.response_text = response_text
+        self.batch_sizes: List[int] = []
+        self._gpu = threading.Lock()
+        self._lock = threading.Lock()
+
+    def record(self, size: int):
+        with self._lock:
+            self.batch_sizes.append(size)
+
+    def compute(self, size: int):
+        """GPU aynı anda tek bir (toplu) istek işler"""
+        with self._gpu:
+            time.sleep(self.latency + self.per_item_latency * (size - 1))
+
+    def respond(self, prompt: str) -> str:
+        # Sonucun doğru çağırana döndüğü doğrulanabilsin diye prompt'un sonunu yansıt
+        return f"{self.response_text}\n<!-- {prompt[-32:]} -->"
+
+    def respond_words(self, prompt: str, max_new_tokens: int = None) -> Tuple[List[str], str]:
+        """Kelime = token; max_new_tokens aşılırsa kesilir ("length")"""
+        words = self.respond(prompt).split(" ")
+        if max_new_tokens and len(words) > max_new_tokens:
+            return words[:max_new_tokens], "length"
+        return words, "eos_token"
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(port: int = 0, **kwargs) -> TGIStubServer:
+    """Stub sunucuyu arka plan thread'inde başlat (port=0: boş port)"""
+    server = TGIStubServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hugging Face TGI API stub sunucusu")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--model", default="stub/tgi-model")
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--per-item-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = TGIStubServer(
+        ("127.0.0.1", args.port), model=args.model, latency=args.latency, per_item_latency=args.per_item_latency
+    )
+    print(f"TGI stub: {server.base_url} (model: {args.model})")
+    server.serve_forever()